@@ -0,0 +1,142 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from phyton import PricingEngine, register_feeds
+from price_collector import PriceCollector, load_feeds
+from sample_catalogs import raw_comp1_data, raw_comp2_data
+
+# ==========================================
+# Benchmark: competitor collector against a local stub server
+# ==========================================
+# Serves the sample competitor catalogs as N feeds from a local http.server (with
+# ETags, and one feed answering 503 twice before it recovers), then runs two sweeps:
+# the first fetches everything and retries, the second should be all 304s. Besides
+# ClubKonnect and AimToGet every feed is a reseller that isn't registered in code
+# and declares its adapter in the feeds file, with its own column names. Two more
+# resellers misbehave: one is always down (left out), one goes down after its first
+# answer (served from the cache in the second sweep); neither may stop the sweep.
+#
+# Checks that each reseller's prices reach df_priced, and that, since they all quote
+# the sample catalogs, the final prices are the ones the embedded data gives.
+#
+# Usage: python bench_collector.py --feeds 23
+
+
+def renamed(csv_text, names):
+    header, _, body = csv_text.strip().partition('\n')
+    return ','.join(names.get(col, col) for col in header.split(',')) + '\n' + body + '\n'
+
+
+def stub_catalogs(n):
+    # Feed name -> (CSV body, feeds-file entry minus the url)
+    catalogs = {'ClubKonnect': (raw_comp1_data.strip() + '\n', {}),
+                'AimToGet': (raw_comp2_data.strip() + '\n', {})}
+    for i in range(n - len(catalogs)):
+        name = f"Reseller{i:02d}"
+        if i % 2:
+            body = renamed(raw_comp1_data, {'Plan Name': 'Description', 'Price': 'Amount'})
+            spec = {'adapter': 'free_text', 'text_col': 'Description', 'price_col': 'Amount'}
+        else:
+            body = renamed(raw_comp2_data, {'Plan Size': 'Size', 'Validity_Desc': 'Duration', 'Price': 'Amount'})
+            spec = {'adapter': 'structured', 'size_col': 'Size', 'validity_col': 'Duration', 'price_col': 'Amount'}
+        catalogs[name] = (body, spec)
+    return catalogs
+
+
+def stub_server(bodies, flaky, failures=2, down=None, drops=None):
+    # /<name>.csv with an ETag; `flaky` answers 503 for its first `failures` requests,
+    # `down` always answers 503 and `drops` does after its first answer
+    etags = {name: '"' + hashlib.sha256(body.encode()).hexdigest()[:16] + '"' for name, body in bodies.items()}
+    failed = {'count': 0}
+    answered = set()
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            name = self.path.strip('/').removesuffix('.csv')
+            if name not in bodies:
+                return self.send_error(404)
+            if name == flaky and failed['count'] < failures:
+                failed['count'] += 1
+                return self.send_error(503)
+            if name == down or (name == drops and name in answered):
+                return self.send_error(503)
+            answered.add(name)
+            if self.headers.get('If-None-Match') == etags[name]:
+                self.send_response(304)
+                self.send_header('ETag', etags[name])
+                return self.end_headers()
+            data = bodies[name].encode('utf-8')
+            self.send_response(200)
+            self.send_header('ETag', etags[name])
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the competitor collector against a local stub server.")
+    parser.add_argument('--feeds', type=int, default=23, help="Number of feeds to serve (at least 2)")
+    args = parser.parse_args(argv)
+
+    catalogs = stub_catalogs(max(args.feeds, 4))
+    down, drops = list(catalogs)[-2:]
+    server = stub_server({name: body for name, (body, _) in catalogs.items()}, flaky='AimToGet', down=down,
+                         drops=drops)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            feeds_path = os.path.join(tmp, 'feeds.json')
+            with open(feeds_path, 'w') as f:
+                json.dump([{'name': name, 'url': f"{base}/{name}.csv", **spec}
+                           for name, (_, spec) in catalogs.items()], f)
+            feeds = register_feeds(load_feeds(feeds_path))
+
+            collector = PriceCollector(cache_dir=os.path.join(tmp, 'cache'), backoff=0.01)
+            sweeps = []
+            for sweep in (1, 2):
+                before = dict(collector.stats)
+                start = time.perf_counter()
+                collected = asyncio.run(collector.collect(feeds))
+                elapsed = time.perf_counter() - start
+                stats = {key: collector.stats[key] - before[key] for key in collector.stats}
+                sweeps.append((stats, dict(collector.failures), set(collected)))
+                print(f"sweep {sweep}: {elapsed * 1000:7.1f} ms  {stats}")
+    finally:
+        server.shutdown()
+
+    engine = PricingEngine()
+    engine.run(competitors=collected)
+    reference = PricingEngine(competitors={name: engine.competitors[name] for name in ['ClubKonnect', 'AimToGet']})
+    reference.run()
+    unread = [source.column for name, source in engine.competitors.items()
+              if name in collected and engine.df_priced[source.column].isna().all()]
+    same = engine.final_frame().to_csv() == reference.final_frame().to_csv()
+    (first, first_failed, first_collected), (second, second_failed, second_collected) = sweeps
+    # The feed that's down retries to the end each sweep
+    ok = (not unread and same and first['fetched'] == len(feeds) - 1 and first['retries'] == 2 + collector.retries
+          and set(first_failed) == {down} and down not in first_collected
+          and second['not_modified'] == len(feeds) - 2 and second['stale'] == 1
+          and set(second_failed) == {down, drops} and second_collected == set(catalogs) - {down})
+    print(f"{len(feeds)} feeds, {len(engine.comp_columns)} competitor columns; "
+          f"feeds with no prices in df_priced: {unread or 'none'}; final prices match the embedded data: {same}")
+    print(f"failures in the last sweep: {second_failed}")
+    print("✅ collector check passed" if ok else "❌ collector check failed")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
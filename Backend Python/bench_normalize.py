@@ -0,0 +1,65 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from phyton import (clean_price, normalize_size, normalize_validity,
+                    clean_price_vec, normalize_size_vec, normalize_validity_vec)
+
+# ==========================================
+# Benchmark: per-row .apply vs vectorized normalizers
+# ==========================================
+# Usage: python bench_normalize.py --rows 1000000
+
+SIZE_LABELS = ['110MB', '230 MB', '500 MB', '750 MB', '1.0 GB', '1.024 GB', '1.5GB', '2.0 GB',
+               '2.5 GB', '3.072 GB', '10.0 GB', '75.0 GB', '800.0 GB', '1TB (1000GB)', '1.5 TB']
+VALIDITY_LABELS = ['SME (30 DAYS)', 'CG (30 Days)', 'GIFTING (7 Days)', 'AWOOF (1 DAY)',
+                   'AWOOF DATA (2 DAYS)', 'Monthly (CG)', 'Weekly', 'Daily Plan', '24 Hours',
+                   '14 days (Direct Data)', 'GIFTING YEARLY PLAN', '90 DAYS VALIDITY']
+
+
+def make_catalog(rows, seed=42):
+    rng = np.random.default_rng(seed)
+    amounts = rng.integers(50, 150_000, rows)
+    # Mix quoted "1,470" style strings with plain numbers like the supplier dumps
+    prices = [f"{a:,}" if a >= 1000 else str(a) for a in amounts]
+    return pd.DataFrame({
+        'Plan Size': rng.choice(SIZE_LABELS, rows),
+        'Validity_Type': rng.choice(VALIDITY_LABELS, rows),
+        'Price': prices,
+    })
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the size/validity/price normalizers.")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    df = make_catalog(args.rows)
+    cases = [
+        ('normalize_size', 'Plan Size', normalize_size, normalize_size_vec),
+        ('normalize_validity', 'Validity_Type', normalize_validity, normalize_validity_vec),
+        ('clean_price', 'Price', clean_price, clean_price_vec),
+    ]
+
+    print(f"{args.rows:,} rows")
+    total_apply = total_vec = 0.0
+    for name, column, scalar_fn, vec_fn in cases:
+        expected, t_apply = timed(lambda: df[column].apply(scalar_fn))
+        result, t_vec = timed(lambda: vec_fn(df[column]))
+        assert (expected.to_numpy() == result.to_numpy()).all(), f"{name} results differ"
+        total_apply += t_apply
+        total_vec += t_vec
+        print(f"{name:<20} apply {t_apply:8.3f}s   vectorized {t_vec:8.3f}s   {t_apply / t_vec:6.1f}x")
+    print(f"{'total':<20} apply {total_apply:8.3f}s   vectorized {total_vec:8.3f}s   {total_apply / total_vec:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
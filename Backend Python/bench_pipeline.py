@@ -0,0 +1,107 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from phyton import PricingEngine
+from synthetic_catalog import write_catalogs
+
+# ==========================================
+# Benchmark: every pipeline stage on synthetic catalogs
+# ==========================================
+# Times each stage, then re-runs it under tracemalloc for its peak memory, and
+# writes everything to a JSON file tagged with the git commit so runs can be
+# diffed between commits.
+#
+# Usage: python bench_pipeline.py --rows 10000 100000 1000000 --out bench_results.json
+
+
+def _rows_in_catalogs(engine):
+    return len(engine.df_cost) + len(engine.df_def) + sum(len(frames[0]) for frames in engine.df_comps.values())
+
+STAGES = [
+    # name, run(engine, paths, out_dir), rows_out(engine)
+    ('parse', lambda e, p, d: e.load(p['cost'], p['default'], p['comp1'], p['comp2']), _rows_in_catalogs),
+    ('normalize', lambda e, p, d: e.normalize(), _rows_in_catalogs),
+    ('aggregate', lambda e, p, d: e.aggregate(), lambda e: len(e.df_cost_agg) + len(e.df_comp_long)),
+    ('merge', lambda e, p, d: e.merge(), lambda e: len(e.df_master)),
+    ('price', lambda e, p, d: e.price(), lambda e: int((e.df_priced['Status'] == 'Active').sum())),
+    ('export', lambda e, p, d: e.export(d), lambda e: len(e.final_frame())),
+]
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run_stages(paths, out_dir, memory):
+    engine = PricingEngine()
+    results = []
+    rows_in = None
+    for name, run, rows_out in STAGES:
+        if memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        run(engine, paths, out_dir)
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if memory else None
+        if memory:
+            tracemalloc.stop()
+        out = rows_out(engine)
+        results.append({'stage': name, 'seconds': seconds, 'peak_bytes': peak, 'rows_in': rows_in, 'rows_out': out})
+        rows_in = out
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time and memory-profile each pricing stage.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000],
+                        help="Rows per synthetic catalog (e.g. 10000 100000 1000000 10000000)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc pass")
+    parser.add_argument('--out', default="bench_results.json")
+    args = parser.parse_args(argv)
+
+    report = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'results': [],
+    }
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = write_catalogs(rows, os.path.join(tmp, 'in'), args.seed)
+            out_dir = os.path.join(tmp, 'out')
+            os.makedirs(out_dir)
+            timings = run_stages(paths, out_dir, memory=False)
+            # tracemalloc slows Python-heavy stages down, so memory gets its own pass
+            peaks = None if args.no_memory else run_stages(paths, out_dir, memory=True)
+
+        print(f"\n{rows:,} rows per catalog")
+        for i, result in enumerate(timings):
+            if peaks:
+                result['peak_bytes'] = peaks[i]['peak_bytes']
+            result['rows'] = rows
+            report['results'].append(result)
+            peak = f"{result['peak_bytes'] / 2 ** 20:9.1f} MB" if result['peak_bytes'] is not None else ""
+            print(f"  {result['stage']:<10} {result['seconds']:9.3f}s {peak}   -> {result['rows_out']:,} rows")
+
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📄 Results saved to: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from price_index import PriceIndex, write_index
+from pricing_constants import JSON_DB_FILE
+
+# ==========================================
+# Benchmark: binary price index vs JSON load + dict lookup
+# ==========================================
+# For each catalog size, times what a cold consumer pays before its first answer
+# (json.load + building a dict, against opening the mmap'd index) and the
+# per-lookup cost once warm.
+#
+# Usage: python bench_price_index.py --plans 10000 100000 1000000
+
+NETWORKS = [(1, 'MTN'), (2, 'GLO'), (3, 'AIRTEL'), (4, '9MOBILE')]
+VALIDITIES = [('SME (30 DAYS)', 30), ('GIFTING (7 DAYS)', 7), ('AWOOF (1 DAY)', 1), ('CG (30 DAYS)', 30)]
+
+
+def synthetic_plans(n, seed=0):
+    rng = random.Random(seed)
+    plans = []
+    for i in range(n):
+        network_id, network = NETWORKS[i % len(NETWORKS)]
+        validity, days = rng.choice(VALIDITIES)
+        amount = rng.randint(100, 20000)
+        plans.append({"network_id": network_id, "plan_id": str(1000 + i), "network_name": network,
+                      "plan_type": "ALL", "plan_name": f"{rng.choice([1.0, 2.0, 5.0, 10.0])} GBGB - {validity}",
+                      "amount": amount, "cost_price": float(amount - 5), "validity": validity,
+                      "validity_days": days, "status": "Active"})
+    return plans
+
+
+def best_of(runs, fn):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the binary price index with JSON load + dict lookup.")
+    parser.add_argument('--plans', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--lookups', type=int, default=10_000)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    for n in args.plans:
+        plans = synthetic_plans(n)
+        keys = [plan['plan_id'] for plan in random.Random(1).choices(plans, k=args.lookups)]
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = os.path.join(tmp, JSON_DB_FILE)
+            index_path = os.path.join(tmp, 'plans.idx')
+            with open(json_path, 'w') as f:
+                json.dump([{k: v for k, v in plan.items() if k not in ('validity_days', 'status')} for plan in plans], f)
+            write_index(plans, index_path)
+
+            def json_first():
+                with open(json_path) as f:
+                    by_id = {plan['plan_id']: plan for plan in json.load(f)}
+                return by_id[keys[0]]
+
+            def index_first():
+                with PriceIndex(index_path) as index:
+                    return index.get(keys[0])
+
+            with open(json_path) as f:
+                by_id = {plan['plan_id']: plan for plan in json.load(f)}
+            index = PriceIndex(index_path)
+            json_lookup = best_of(args.runs, lambda: [by_id[k] for k in keys]) / len(keys)
+            index_lookup = best_of(args.runs, lambda: [index.get(k) for k in keys]) / len(keys)
+            index.close()
+
+            print(f"\n{n:,} plans  (JSON {os.path.getsize(json_path) / 2 ** 20:.1f} MB, "
+                  f"index {os.path.getsize(index_path) / 2 ** 20:.1f} MB)")
+            print(f"  first answer   JSON {best_of(args.runs, json_first) * 1e3:9.2f} ms   "
+                  f"index {best_of(args.runs, index_first) * 1e3:9.3f} ms")
+            print(f"  warm lookup    dict {json_lookup * 1e6:9.2f} µs   index {index_lookup * 1e6:9.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
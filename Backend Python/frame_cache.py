@@ -0,0 +1,228 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# Content-addressed cache of normalized frames
+# ==========================================
+# Each entry is a directory named after a hash of what went into it (the raw input
+# bytes, which catalog it is, the normalizer version), holding one .npy file per
+# column plus a meta.json with the dtypes:
+#
+#   .frame_cache/3f9c.../meta.json
+#   .frame_cache/3f9c.../0.npy  0.mask.npy  1.npy ...
+#
+# Reads memory-map the .npy files, so a hit costs a few page faults rather than a
+# CSV parse. The cache is kept under max_bytes by evicting the least recently used
+# entries (a hit touches meta.json, and eviction goes oldest mtime first).
+# Input files are hashed once per (size, mtime), the way git's index avoids
+# rereading files that haven't been touched.
+#
+#   cache = FrameCache(".frame_cache")
+#   key = cache.key('cost', 1, digest)
+#   df = cache.get(key)
+#   if df is None:
+#       df = cache.put(key, build())
+#
+# Column layouts:
+#   category          codes in <i>.npy, categories in meta.json
+#   nullable integer  values in <i>.npy, NA mask in <i>.mask.npy
+#   plain NumPy       <i>.npy as is
+#   anything else     factorized like a category and rebuilt with its dtype
+
+CACHE_DIR = ".frame_cache"
+CACHE_BYTES = 512 * 1024 * 1024
+META_FILE = "meta.json"
+# Digests of input files by (size, mtime), so an unchanged file isn't hashed again
+DIGESTS_FILE = "file_digests.json"
+FORMAT_VERSION = 1
+
+
+def digest(*parts):
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        data = part if isinstance(part, bytes) else str(part).encode('utf-8')
+        h.update(len(data).to_bytes(8, 'little'))
+        h.update(data)
+    return h.hexdigest()
+
+
+def file_digest(path, block=1 << 20):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(block), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def frame_digest(df):
+    # Values, index and dtypes of a DataFrame handed in directly
+    hashed = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    return digest(hashed.tobytes(), list(df.columns), [str(dtype) for dtype in df.dtypes])
+
+
+# Nullable arrays stored as values + mask, rebuilt with their dtype's array type
+MASKED_ARRAYS = (pd.arrays.IntegerArray, pd.arrays.FloatingArray, pd.arrays.BooleanArray)
+
+
+def _labels_meta(values):
+    return [None if pd.isna(value) else str(value) for value in values]
+
+
+def write_frame(df, path):
+    # Written to a dot directory and renamed into place, readers never see half an entry
+    tmp = os.path.join(os.path.dirname(path), '.' + os.path.basename(path) + f'.{os.getpid()}')
+    shutil.rmtree(tmp, ignore_errors=True)  # left over from a crashed run
+    os.makedirs(tmp)
+    columns = []
+    for i, (name, series) in enumerate(df.items()):
+        dtype = series.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            np.save(os.path.join(tmp, f"{i}.npy"), series.cat.codes.to_numpy())
+            meta = {'layout': 'category', 'categories': _labels_meta(dtype.categories),
+                    'categories_dtype': str(dtype.categories.dtype), 'ordered': bool(dtype.ordered)}
+        elif isinstance(series.array, MASKED_ARRAYS):
+            # Int64 / Float64 / boolean: the values (NA filled with 0) plus the NA mask
+            np.save(os.path.join(tmp, f"{i}.npy"), series.to_numpy(dtype=dtype.numpy_dtype, na_value=0))
+            np.save(os.path.join(tmp, f"{i}.mask.npy"), series.isna().to_numpy())
+            meta = {'layout': 'masked'}
+        elif isinstance(dtype, np.dtype) and dtype.kind in 'biuf':
+            np.save(os.path.join(tmp, f"{i}.npy"), series.to_numpy())
+            meta = {'layout': 'numpy'}
+        else:
+            codes, uniques = pd.factorize(series, use_na_sentinel=True)
+            np.save(os.path.join(tmp, f"{i}.npy"), codes)
+            meta = {'layout': 'labels', 'labels': _labels_meta(uniques)}
+        columns.append({'name': name, 'dtype': str(dtype), **meta})
+    with open(os.path.join(tmp, META_FILE), 'w') as f:
+        json.dump({'version': FORMAT_VERSION, 'rows': len(df), 'columns': columns}, f)
+    try:
+        os.replace(tmp, path)
+    except OSError:
+        # Someone else stored the same entry first; theirs is just as good
+        shutil.rmtree(tmp, ignore_errors=True)
+    return path
+
+
+def read_frame(path, mmap=True):
+    with open(os.path.join(path, META_FILE)) as f:
+        meta = json.load(f)
+    if meta.get('version') != FORMAT_VERSION:
+        return None
+    mode = 'r' if mmap else None
+    data = {}
+    for i, col in enumerate(meta['columns']):
+        values = np.load(os.path.join(path, f"{i}.npy"), mmap_mode=mode)
+        layout = col['layout']
+        if layout == 'category':
+            categories = pd.Index(col['categories'], dtype=col['categories_dtype'])
+            data[col['name']] = pd.Categorical.from_codes(values, categories=categories, ordered=col['ordered'])
+        elif layout == 'masked':
+            mask = np.load(os.path.join(path, f"{i}.mask.npy"), mmap_mode=mode)
+            data[col['name']] = pd.api.types.pandas_dtype(col['dtype']).construct_array_type()(values, mask)
+        elif layout == 'numpy':
+            data[col['name']] = values
+        else:
+            labels = np.array(col['labels'] + [None], dtype=object)
+            data[col['name']] = pd.array(labels[np.asarray(values)], dtype=col['dtype'])
+    return pd.DataFrame(data, index=pd.RangeIndex(meta['rows']), copy=False)
+
+
+def _entry_bytes(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+class FrameCache:
+    def __init__(self, root=CACHE_DIR, max_bytes=CACHE_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(*parts):
+        return digest(FORMAT_VERSION, *parts)
+
+    def _path(self, key):
+        return os.path.join(self.root, key)
+
+    def file_digest(self, path):
+        # file_digest(), remembered per (size, mtime) of the file
+        memo_path = os.path.join(self.root, DIGESTS_FILE)
+        try:
+            with open(memo_path) as f:
+                memo = json.load(f)
+        except (FileNotFoundError, ValueError):
+            memo = {}
+        st = os.stat(path)
+        name = os.path.abspath(path)
+        stamp = [st.st_size, st.st_mtime_ns]
+        if name in memo and memo[name][:2] == stamp:
+            return memo[name][2]
+        memo[name] = stamp + [file_digest(path)]
+        os.makedirs(self.root, exist_ok=True)
+        tmp = f"{memo_path}.{os.getpid()}"
+        with open(tmp, 'w') as f:
+            json.dump(memo, f)
+        os.replace(tmp, memo_path)
+        return memo[name][2]
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            df = read_frame(path)
+        except (FileNotFoundError, ValueError, KeyError):
+            df = None
+        if df is None:
+            self.misses += 1
+            return None
+        # Touch the entry, eviction goes by last use
+        os.utime(os.path.join(path, META_FILE))
+        self.hits += 1
+        return df
+
+    def put(self, key, df):
+        os.makedirs(self.root, exist_ok=True)
+        df = df.reset_index(drop=True)
+        if not os.path.isdir(self._path(key)):
+            write_frame(df, self._path(key))
+        self.evict(keep=key)
+        return df
+
+    def entries(self):
+        # (last used, bytes, key), oldest first
+        if not os.path.isdir(self.root):
+            return []
+        found = []
+        for entry in os.scandir(self.root):
+            meta = os.path.join(entry.path, META_FILE)
+            if entry.is_dir() and not entry.name.startswith('.') and os.path.exists(meta):
+                found.append((os.stat(meta).st_mtime_ns, _entry_bytes(entry.path), entry.name))
+        return sorted(found)
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, keep=None):
+        """Drop least recently used entries until the cache fits in max_bytes.
+        Returns the number of entries removed."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self._path(key), ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+        self.hits = self.misses = 0
@@ -1,458 +1,51 @@
 import pandas as pd
+import numpy as np
 import re
 import io
+import os
 import sys
 import json
+import argparse
+import gzip
+import hashlib
+import itertools
+import math
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial, wraps
+
+from frame_cache import CACHE_BYTES, CACHE_DIR, FrameCache, digest, file_digest, frame_digest
+from price_history import HISTORY_DIR, PriceHistory
+from price_index import write_index
+from run_report import RunReport
+
+try:
+    import brotli  # optional, only used for the precompressed .br shards
+except ImportError:
+    brotli = None
 
 # ==========================================
 # 1. CONFIGURATION
 # ==========================================
-UNDERCUT_AMOUNT = 5  # How much to beat the competitor by (₦)
+# Settings, output columns and file names shared with quote_engine.py (see pricing_constants.py)
+from pricing_constants import (
+    UNDERCUT_AMOUNT, KOBO, DEFAULT_SUPPLIER, FAILOVER_DEPTH, STATUS_LABELS, FINAL_COLUMNS, CSV_FILE, JSON_FILE,
+    CSV_DB_FILE, JSON_DB_FILE, NDJSON_DB_FILE, DELTA_FILE, SHARD_DIR, MANIFEST_FILE, INDEX_FILE,
+    FAILOVER_FILE, map_network_to_id,
+)
 
 # ==========================================
 # 2. INPUT DATA
 # ==========================================
-
-# --- API PROVIDER COST PRICE ---
-raw_cost_data = """
-Network,ID,Plan Size,Price,Validity_Type
-MTN,342,500 MB,350,DATA SHARE (30 DAYS)
-MTN,378,500 MB,350,SME (30 DAYS)
-MTN,414,500 MB,350,CG (30 DAYS)
-MTN,288,500 MB,450,SME 2 (30 DAYS)
-MTN,385,750 MB,441,GIFTING (3 DAYS)
-MTN,415,1.0 GB,410,SME (7 DAYS)
-MTN,416,1.0 GB,410,DATA SHARE (7 DAYS)
-MTN,417,1.0 GB,410,GIFT (7 DAYS)
-MTN,418,1.0 GB,410,CG (7 DAYS)
-MTN,362,1.0 GB,490,AWOOF (1 DAY)
-MTN,213,1.0 GB,510,CG (30 DAYS)
-MTN,343,1.0 GB,510,DATA SHARE (30 DAYS)
-MTN,403,1.0 GB,510,SME (30 DAYS)
-MTN,404,1.0 GB,510,GIFT (30 DAYS)
-MTN,289,1.0 GB,860,SME 2 (30 DAYS)
-MTN,382,1.2 GB,735,XTRA SPECIAL (7 DAYS)
-MTN,363,1.5 GB,588,AWOOF (2 DAYS)
-MTN,365,2.0 GB,882,AWOOF (2 DAYS)
-MTN,214,2.0 GB,950,CG (30 DAYS)
-MTN,344,2.0 GB,950,DATA SHARE (30 DAYS)
-MTN,402,2.0 GB,950,SME (30 DAYS)
-MTN,376,2.0 GB,"1,470",GIFTING (30 DAYS)
-MTN,290,2.0 GB,"1,720",SME 2 (30 DAYS)
-MTN,386,2.5 GB,735,GIFTING (1 DAY)
-MTN,379,2.7 GB,"1,960",GIFTING (30 DAYS)
-MTN,44,3.0 GB,"1,400",SME (30 DAYS)
-MTN,215,3.0 GB,"1,400",CG (30 DAYS)
-MTN,345,3.0 GB,"1,400",DATA SHARE (30 DAYS)
-MTN,387,3.0 GB,"1,470",3GB+1500 Talk time (30 DAYS)
-MTN,291,3.0 GB,"2,580",SME 2 (30 DAYS)
-MTN,340,3.2 GB,980,AWOOF DATA (2 DAYS)
-MTN,427,3.5 GB,980,1 DAY VALIDITY
-MTN,384,3.5 GB,"2,450",GIFTING (30 DAYS)
-MTN,428,4.0 GB,"1,176",2 DAYS VALIDITY
-MTN,8,5.0 GB,"1,900",SME (30 DAYS)
-MTN,216,5.0 GB,"1,900",CG (30 DAYS)
-MTN,346,5.0 GB,"1,900",DATA SHARE (30 DAYS)
-MTN,292,5.0 GB,"4,300",SME 2 (30 DAYS)
-MTN,429,5.5 GB,"1,470",2 DAYS VALIDITY
-MTN,381,6.0 GB,"2,450",GIFTING (7 DAYS)
-MTN,223,10.0 GB,"4,410",SME+10min airtime (30 DAYS)
-MTN,366,10.0 GB,"4,410",GIFTING (30 DAYS)
-MTN,293,10.0 GB,"8,600",SME 2 (30 DAYS)
-MTN,341,11.0 GB,"3,430",AWOOF DATA (7 DAYS)
-MTN,375,12.5 GB,"5,390",GIFTING (30 DAYS)
-MTN,383,14.5 GB,"4,900",XTRA SPECIAL (30 DAYS)
-MTN,368,16.5 GB,"6,370",GIFTING (30 DAYS)
-MTN,390,20.0 GB,"4,900",SME (7 DAYS)
-MTN,426,20.0 GB,"7,350",GIFT (30 DAYS)
-MTN,430,34.0 GB,"9,800",30 DAYS VALIDITY
-MTN,371,36.0 GB,"10,780",GIFTING (30 DAYS)
-MTN,372,75.0 GB,"17,640",GIFTING (30 DAYS)
-MTN,373,165.0 GB,"34,300",GIFTING (30 DAYS)
-MTN,380,250.0 GB,"53,900",GIFTING (30 DAYS)
-MTN,413,800.0 GB,"122,500",GIFTING YEARLY PLAN
-GLO,267,200 MB,100,CG (30 DAYS)
-GLO,268,500 MB,205,CG (30 DAYS)
-GLO,357,750 MB,195,AWOOF GIFT (1 DAY)
-GLO,269,1.024 GB,420,CG (30 DAYS)
-GLO,358,1.5 GB,291,AWOOF GIFT (1 DAY)
-GLO,270,2.0 GB,840,CG (30 DAYS)
-GLO,359,2.5 GB,485,AWOOF GIFT (2 DAYS)
-GLO,271,3.072 GB,"1,260",CG (30 DAYS)
-GLO,273,5.12 GB,"2,150",CG (30 DAYS)
-GLO,196,6.15 GB,"1,940",GIFTING (30 DAYS)
-GLO,360,9.8 GB,"1,940",AWOOF GIFT (7 DAYS)
-GLO,272,10.8 GB,"4,200",CG (30 DAYS)
-GLO,198,11.0 GB,"2,910",GIFTING (30 DAYS)
-GLO,199,14.5 GB,"3,880",GIFTING (30 DAYS)
-GLO,369,18.5 GB,"4,850",GIFTING (30 DAYS)
-GLO,202,28.0 GB,"7,760",GIFTING (30 DAYS)
-GLO,203,38.0 GB,"9,700",GIFTING (30 DAYS)
-GLO,263,107.0 GB,"19,400",GIFTING (30 DAYS)
-AIRTEL,391,150 MB,60,AWOOF (1 DAY)
-AIRTEL,392,300 MB,98,AWOOF (2 DAYS)
-AIRTEL,393,600 MB,196,AWOOF (2 DAYS)
-AIRTEL,394,1.0 GB,294,AWOOF (3 DAYS)
-AIRTEL,405,1.0 GB,790,GIFT (7 DAYS)
-AIRTEL,395,2.0 GB,"1,470",GIFT (30 DAYS)
-AIRTEL,421,3.0 GB,"1,960",GIFT (30 DAYS)
-AIRTEL,422,4.0 GB,"2,460",GIFT (30 DAYS)
-AIRTEL,397,8.0 GB,"2,950",GIFT (30 DAYS)
-AIRTEL,398,10.0 GB,"2,940",AWOOF (30 DAYS)
-AIRTEL,399,13.0 GB,"4,980",GIFT (30 DAYS)
-AIRTEL,423,18.0 GB,"5,870",GIFT (30 DAYS)
-AIRTEL,424,25.0 GB,"7,820",GIFT (30 DAYS)
-AIRTEL,400,35.0 GB,"9,800",GIFT (30 DAYS)
-AIRTEL,401,60.0 GB,"14,900",GIFT (30 DAYS)
-AIRTEL,425,100.0 GB,"19,500",GIFT (30 DAYS)
-9MOBILE,276,100 MB,50,30 DAYS
-9MOBILE,337,500 MB,180,CG (30 DAYS)
-9MOBILE,182,500 MB,450,GIFTING (7 Days)
-9MOBILE,277,1.0 GB,350,CG (30 DAYS)
-9MOBILE,278,1.5 GB,525,CG (30 DAYS)
-9MOBILE,183,1.5 GB,850,GIFTING (30 Days)
-9MOBILE,279,2.0 GB,700,CG (30 DAYS)
-9MOBILE,184,2.0 GB,"1,020",GIFTING (30 Days)
-9MOBILE,280,3.0 GB,"1,050",CG (30 DAYS)
-9MOBILE,185,3.0 GB,"1,275",GIFTING (30 Days)
-9MOBILE,281,4.0 GB,"1,400",CG (30 DAYS)
-9MOBILE,283,4.5 GB,"1,575",CG (30 DAYS)
-9MOBILE,186,4.5 GB,"1,700",GIFTING (30 Days)
-9MOBILE,282,5.0 GB,"1,750",CG (30 DAYS)
-9MOBILE,187,11.0 GB,"3,400",GIFTING (30 Days)
-9MOBILE,284,11.0 GB,"3,850",CG (30 DAYS)
-9MOBILE,188,15.0 GB,"4,250",GIFTING (30 Days)
-9MOBILE,338,20.0 GB,"7,000",CG (30 DAYS)
-9MOBILE,189,40.0 GB,"8,500",GIFTING (30 Days)
-9MOBILE,190,75.0 GB,"12,750",GIFTING (30 Days)
-"""
-
-# --- API PROVIDER DEFAULT SELLING ---
-raw_default_data = """
-Network,Plan Size,Price,Validity_Type
-MTN,500 MB,310,DATA SHARE (30 Days)
-MTN,500 MB,310,SME (30 Days)
-MTN,500 MB,310,CG (30 Days)
-MTN,500 MB,425,Gifting (30 Days)
-MTN,750 MB,437,Gifting (3 Days)
-MTN,1.0 GB,409,CG (30 Days)
-MTN,1.0 GB,409,SME (7 Days)
-MTN,1.0 GB,409,Gift (7 Days)
-MTN,1.0 GB,485,Awoof (1 Day)
-MTN,1.0 GB,500,DATA SHARE (30 Days)
-MTN,1.0 GB,500,SME (30 Days)
-MTN,1.0 GB,500,CG (30 Days)
-MTN,1.0 GB,500,Gift (30 Days)
-MTN,1.0 GB,850,Gifting (30 Days)
-MTN,1.2 GB,728,Xtra Special (7 Days)
-MTN,1.5 GB,582,Awoof (2 Days)
-MTN,2.0 GB,900,Awoof (2 Days)
-MTN,2.0 GB,900,DATA SHARE (30 Days)
-MTN,2.0 GB,900,SME (30 Days)
-MTN,2.0 GB,"1,455",Gifting (30 Days)
-MTN,2.0 GB,"1,700",Standard (30 Days)
-MTN,2.5 GB,730,Gifting (1 Day)
-MTN,2.5 GB,873,Awoof (2 Days)
-MTN,2.7 GB,"1,940",Gifting (30 Days)
-MTN,3.0 GB,"1,300",SME (30 Days)
-MTN,3.0 GB,"1,300",DATA SHARE (30 Days)
-MTN,3.0 GB,"1,300",CG (30 Days)
-MTN,3.0 GB,"1,455",3GB + 1500 Talk Time (30 Days)
-MTN,3.0 GB,"2,550",Standard (30 Days)
-MTN,3.2 GB,970,Awoof (2 Days)
-MTN,3.5 GB,970,1 Day Validity
-MTN,3.5 GB,"2,425",Gifting (30 Days)
-MTN,4.0 GB,"1,164",2 Days Validity
-MTN,5.0 GB,"1,800",SME (30 Days)
-MTN,5.0 GB,"1,800",DATA SHARE (30 Days)
-MTN,5.0 GB,"1,800",CG (30 Days)
-MTN,5.0 GB,"4,250",Standard (30 Days)
-MTN,5.5 GB,"1,455",2 Days Validity
-MTN,6.0 GB,"2,425",Gifting (7 Days)
-MTN,10.0 GB,"4,365",Gifting (30 Days)
-MTN,10.0 GB,"4,365",SME + 10min Airtime (30 Days)
-MTN,10.0 GB,"8,500",Standard (30 Days)
-MTN,11.0 GB,"3,395",Awoof (7 Days)
-MTN,12.5 GB,"5,335",Gifting (30 Days)
-MTN,14.5 GB,"4,850",Xtra Special (30 Days)
-MTN,16.5 GB,"6,305",Gifting (30 Days)
-MTN,20.0 GB,"4,850",SME (7 Days)
-MTN,20.0 GB,"7,275",Gift (30 Days)
-MTN,34.0 GB,"9,700",30 Days Validity
-MTN,36.0 GB,"10,670",Gifting (30 Days)
-MTN,75.0 GB,"17,460",Gifting (30 Days)
-MTN,165.0 GB,"33,950",Gifting (30 Days)
-MTN,250.0 GB,"53,350",Gifting (30 Days)
-MTN,800.0 GB,"121,250",Gifting Yearly Plan
-GLO,200 MB,90,CG (30 Days)
-GLO,500 MB,198,CG (30 Days)
-GLO,750 MB,190,Awoof Gift (1 Day)
-GLO,1.024 GB,400,CG (30 Days)
-GLO,1.5 GB,285,Awoof Gift (1 Day)
-GLO,2.0 GB,800,CG (30 Days)
-GLO,2.5 GB,475,Awoof Gift (2 Days)
-GLO,3.072 GB,"1,200",CG (30 Days)
-GLO,5.12 GB,"2,000",CG (30 Days)
-GLO,6.15 GB,"1,880",Gifting (30 Days)
-GLO,9.8 GB,"1,880",Awoof Gift (7 Days)
-GLO,10.8 GB,"4,000",CG (30 Days)
-GLO,11.0 GB,"2,820",Gifting (30 Days)
-GLO,14.5 GB,"3,760",Gifting (30 Days)
-GLO,18.5 GB,"4,700",Gifting (30 Days)
-GLO,28.0 GB,"7,520",Gifting (30 Days)
-GLO,38.0 GB,"9,400",Gifting (30 Days)
-GLO,107.0 GB,"18,800",Gifting (30 Days)
-AIRTEL,150 MB,55,Awoof (1 Day)
-AIRTEL,300 MB,98,Awoof (2 Days)
-AIRTEL,600 MB,195,Awoof (2 Days)
-AIRTEL,1.0 GB,288,Awoof (3 Days)
-AIRTEL,1.0 GB,768,Gift (7 Days)
-AIRTEL,2.0 GB,"1,440",Gift (30 Days)
-AIRTEL,3.0 GB,"1,920",Gift (30 Days)
-AIRTEL,4.0 GB,"2,400",Gift (30 Days)
-AIRTEL,8.0 GB,"2,880",Gift (30 Days)
-AIRTEL,10.0 GB,"2,880",Awoof (30 Days)
-AIRTEL,13.0 GB,"4,800",Gift (30 Days)
-AIRTEL,18.0 GB,"5,760",Gift (30 Days)
-AIRTEL,25.0 GB,"7,680",Gift (30 Days)
-AIRTEL,35.0 GB,"9,700",Gift (30 Days)
-AIRTEL,60.0 GB,"14,850",Gift (30 Days)
-AIRTEL,100.0 GB,"19,200",Gift (30 Days)
-9MOBILE,100 MB,50,30 Days
-9MOBILE,500 MB,150,30 Days
-9MOBILE,500 MB,450,Gifting (7 Days)
-9MOBILE,1.0 GB,300,CG (30 Days)
-9MOBILE,1.5 GB,450,CG (30 Days)
-9MOBILE,1.5 GB,850,Gifting (30 Days)
-9MOBILE,2.0 GB,600,CG (30 Days)
-9MOBILE,2.0 GB,"1,020",Gifting (30 Days)
-9MOBILE,3.0 GB,900,CG (30 Days)
-9MOBILE,3.0 GB,"1,275",Gifting (30 Days)
-9MOBILE,4.0 GB,"1,200",CG (30 Days)
-9MOBILE,4.5 GB,"1,350",CG (30 Days)
-9MOBILE,4.5 GB,"1,700",Gifting (30 Days)
-9MOBILE,5.0 GB,"1,500",CG (30 Days)
-9MOBILE,11.0 GB,"3,300",CG (30 Days)
-9MOBILE,11.0 GB,"3,400",Gifting (30 Days)
-9MOBILE,15.0 GB,"4,250",Gifting (30 Days)
-9MOBILE,20.0 GB,"6,000",Gifting (30 Days)
-9MOBILE,40.0 GB,"8,500",Gifting (30 Days)
-9MOBILE,75.0 GB,"12,750",Gifting (30 Days)
-"""
-
-# --- COMPETITOR 1 (ClubKonnect) ---
-raw_comp1_data = """
-Network,Plan Name,Price
-MTN,110MB Daily Plan - 1 day (Awoof Data),97
-MTN,230MB Daily Plan - 1 day (Awoof Data),194
-MTN,500 MB - 7 days (SME),404
-MTN,500MB Daily Plan - 1 day (Awoof Data),340
-MTN,500MB Weekly Plan - 7 days (Direct Data),485
-MTN,1 GB - 7 days (SME),567
-MTN,1GB Daily Plan + 1.5mins. - 1 day (Awoof Data),485
-MTN,1GB Weekly Plan - 7 days (Direct Data),776
-MTN,1.5GB Weekly Plan - 7 days (Direct Data),970
-MTN,2 GB - 7 days (SME),"1,134"
-MTN,2GB+2mins Monthly Plan - 30 days (Direct Data),"1,455"
-MTN,2.5GB Daily Plan - 1 day (Awoof Data),728
-MTN,2.5GB 2-Day Plan - 2 days (Awoof Data),873
-MTN,2.7GB+2mins Monthly Plan - 30 days (Direct Data),"1,940"
-MTN,3 GB - 7 days (SME),"1,680"
-MTN,3.2GB 2-Day Plan - 2 days (Awoof Data),970
-MTN,3.5GB Weekly Plan - 7 days (Direct Data),"1,455"
-MTN,3.5GB+5mins Monthly Plan - 30 days (Direct Data),"2,425"
-MTN,5 GB - 7 days (SME),"2,540"
-MTN,6GB Weekly Plan - 7 days (Direct Data),"2,425"
-MTN,7GB Monthly Plan - 30 days (Direct Data),"3,395"
-MTN,10GB+10mins Monthly Plan - 30 days (Direct Data),"4,365"
-MTN,11GB Weekly Bundle - 7 days (Direct Data),"3,395"
-MTN,12.5GB Monthly Plan - 30 days (Direct Data),"5,335"
-MTN,16.5GB+10mins Monthly Plan - 30 days (Direct Data),"6,305"
-MTN,20GB Monthly Plan - 30 days (Direct Data),"7,275"
-MTN,20GB Weekly Plan - 7 days (Direct Data),"4,850"
-MTN,25GB Monthly Plan - 30 days (Direct Data),"8,730"
-MTN,36GB Monthly Plan - 30 days (Direct Data),"10,670"
-MTN,75GB Monthly Plan - 30 days (Direct Data),"17,460"
-MTN,150GB 2-Month Plan - 60 days (Direct Data),"38,800"
-MTN,165GB Monthly Plan - 30 days (Direct Data),"33,950"
-MTN,480GB 3-Month Plan - 90 days (Direct Data),"87,300"
-GLO,125MB - 1 day (Awoof Data),95
-GLO,200 MB - 14 days (SME),94
-GLO,260MB - 2 day (Awoof Data),191
-GLO,500 MB - 7 days (SME),235
-GLO,875MB - Weekend Plan [Sun] (Awoof Data),191
-GLO,1 GB - 3 days (SME),282
-GLO,1 GB - 7 days (SME),329
-GLO,1 GB - 14 days Night Plan (SME),329
-GLO,1 GB - 30 days (SME),470
-GLO,1.5GB - 14 days (Direct Data),477
-GLO,2 GB - 30 days (SME),940
-GLO,2GB - 1 day (Awoof Data),477
-GLO,2.5GB - Weekend Plan - [Sat & Sun] (Awoof Data),477
-GLO,2.6GB - 30 days (Direct Data),955
-GLO,3 GB - 3 days (SME),846
-GLO,3 GB - 7 days (SME),987
-GLO,3 GB - 14 days Night Plan (SME),987
-GLO,3 GB - 30 days (SME),"1,410"
-GLO,5 GB - 3 days (SME),"1,410"
-GLO,5 GB - 7 days (SME),"1,645"
-GLO,5 GB - 14 days Night Plan (SME),"1,645"
-GLO,5 GB - 30 days (SME),"2,350"
-GLO,5GB - 30 days (Direct Data),"1,432"
-GLO,6GB - 7 days (Direct Data),"1,432"
-GLO,6.15GB - 30 days (Direct Data),"1,910"
-GLO,7.5GB - 30 days (Direct Data),"2,387"
-GLO,10 GB - 14 days Night Plan (SME),"3,290"
-GLO,10 GB - 30 days (SME),"4,700"
-GLO,10GB - 30 days (Direct Data),"2,865"
-GLO,12.5GB - 30 days (Direct Data),"3,820"
-GLO,16GB - 30 days (Direct Data),"4,775"
-GLO,28GB - 30 days (Direct Data),"7,640"
-GLO,38GB - 30 days (Direct Data),"9,550"
-GLO,64GB - 30 days (Direct Data),"14,325"
-GLO,107GB - 30 days (Direct Data),"19,100"
-GLO,165GB - 30 days (Direct Data),"28,650"
-GLO,220GB - 30 days (Direct Data),"38,200"
-GLO,320GB - 30 days (Direct Data),"47,750"
-GLO,380GB - 30 days (Direct Data),"57,300"
-GLO,475GB - 30 days (Direct Data),"71,625"
-GLO,1TB (1000GB) - 365 days (Direct Data),"143,250"
-9MOBILE,50 MB - 30 days (SME),23
-9MOBILE,100 MB - 30 days (SME),46
-9MOBILE,100MB - 1 day (Awoof Data),93
-9MOBILE,180MB - 1 days (Awoof Data),140
-9MOBILE,250MB - 1 days (Awooof Data),186
-9MOBILE,300 MB - 30 days (SME),138
-9MOBILE,450MB - 1 day (Awoof Data),326
-9MOBILE,500 MB - 30 days (SME),225
-9MOBILE,650MB - 3 days (Awoof Data),465
-9MOBILE,650MB - 14 days (Direct Data),558
-9MOBILE,1 GB - 30 days (SME),450
-9MOBILE,1.1GB - 30 days (Direct Data),930
-9MOBILE,1.4GB - 30 days (Direct Data),"1,116"
-9MOBILE,1.75GB - 7 days (Direct Data),"1,395"
-9MOBILE,2 GB - 30 days (SME),900
-9MOBILE,2.44GB - 30 days (Direct Data),"1,860"
-9MOBILE,3 GB - 30 days (SME),"1,350"
-9MOBILE,3.17GB - 30 days (Direct Data),"2,325"
-9MOBILE,3.91GB - 30 days (Direct Data),"2,790"
-9MOBILE,4 GB - 30 days (SME),"1,800"
-9MOBILE,5 GB - 30 days (SME),"2,250"
-9MOBILE,5.10GB - 30 days (Direct Data),"3,720"
-9MOBILE,6.5GB - 30 days (Direct Data),"4,650"
-9MOBILE,10 GB - 30 days (SME),"4,500"
-9MOBILE,15 GB - 30 days (SME),"6,750"
-9MOBILE,16GB - 30 days (Direct Data),"11,160"
-9MOBILE,20 GB - 30 days (SME),"9,000"
-9MOBILE,24.3GB - 30 days (Direct Data),"17,205"
-9MOBILE,25 GB - 30 days (SME),"11,250"
-9MOBILE,26.5GB - 30 days (Direct Data),"18,600"
-9MOBILE,39GB - 60 days (Direct Data),"27,900"
-9MOBILE,78GB - 90 days (Direct Data),"55,800"
-9MOBILE,190GB - 180 days (Direct Data),"139,500"
-AIRTEL,500MB - 7 days (Direct Data),485
-AIRTEL,1GB - 1 day (Awoof Data),485
-AIRTEL,1GB - 7 days (Direct Data),776
-AIRTEL,1.5GB - 2 days (Awoof Data),582
-AIRTEL,1.5GB - 7 days (Direct Data),970
-AIRTEL,2GB - 2 days (Awoof Data),727
-AIRTEL,2GB - 30 days (Direct Data),"1,455"
-AIRTEL,3GB - 2 days (Awoof Data),970
-AIRTEL,3GB - 30 days (Direct Data),"1,940"
-AIRTEL,3.5GB - 7 days (Direct Data),"1,455"
-AIRTEL,4GB - 30 days (Direct Data),"2,425"
-AIRTEL,5GB - 2 days (Awoof Data),"1,455"
-AIRTEL,6GB - 7 days (Direct Data),"2,425"
-AIRTEL,8GB - 30 days (Direct Data),"2,910"
-AIRTEL,10GB - 7 days (Direct Data),"2,910"
-AIRTEL,10GB - 30 days (Direct Data),"3,880"
-AIRTEL,13GB - 30 days (Direct Data),"4,850"
-AIRTEL,18GB - 7 days (Direct Data),"4,850"
-AIRTEL,18GB - 30 days (Direct Data),"5,820"
-AIRTEL,25GB - 30 days (Direct Data),"7,760"
-AIRTEL,35GB - 30 days (Direct Data),"9,700"
-AIRTEL,60GB - 30 days (Direct Data),"14,550"
-AIRTEL,100GB - 30 days (Direct Data),"19,400"
-AIRTEL,160GB - 30 days (Direct Data),"29,100"
-AIRTEL,210GB - 30 days (Direct Data),"38,800"
-AIRTEL,300GB - 90 days (Direct Data),"48,500"
-AIRTEL,350GB - 90 days (Direct Data),"58,200"
-"""
-
-# --- COMPETITOR 2 (AimToGet) ---
-raw_comp2_data = """
-Network,Plan Size,Price,Validity_Desc
-GLO,1.0 GB,430,Monthly (CG)
-GLO,2.0 GB,860,Monthly (CG)
-GLO,3.0 GB,"1,290",Monthly (CG)
-GLO,10.0 GB,"1,940",7 Days (Special)
-GLO,5.0 GB,"2,150",Monthly (CG)
-GLO,10.0 GB,"4,300",Monthly (CG)
-GLO,28.0 GB,"7,600",Monthly (incl 2GB nite)
-GLO,38.0 GB,"9,500",Monthly (incl 2GB nite)
-GLO,64.0 GB,"12,750",Monthly (incl 4GB nite)
-GLO,107.0 GB,"19,000",Monthly (incl 2GB nite)
-MTN,1.0 GB,249,1 Day (Smart)
-MTN,500 MB,339,1 Day / 24 Hours
-MTN,2.0 GB,380,7 Days (TikTok Only)
-MTN,500 MB,399,7/14 Days (SME Plus)
-MTN,1.2 GB,435,Monthly (All Socials)
-MTN,750 MB,440,3 Days (+ Free 1hr YT/IG/TT)
-MTN,1.0 GB,485,1 Day / 24 Hours (+ 1.5 Mins)
-MTN,500 MB,485,Weekly (Special)
-MTN,1.0 GB,499,7/14 Days (SME Plus)
-MTN,2.5 GB,549,1 Day (Smart)
-MTN,1.5 GB,588,2 Days (Special)
-MTN,2.5 GB,735,1 Day (Special)
-MTN,1.0 GB,784,7 Days (+1GB YT Music + Night)
-MTN,2.5 GB,870,2 Days (Special)
-MTN,3.2 GB,980,2 Days (Special)
-MTN,2.0 GB,997,7/14 Days (SME Plus)
-MTN,1.8 GB,"1,455",Monthly (+ 1500 Talktime)
-MTN,3.0 GB,"1,494",Monthly (SME Plus)
-MTN,5.0 GB,"2,000",Monthly (SME Plus)
-MTN,20.0 GB,"5,000",7 Days (Special)
-MTN,12.5 GB,"5,390",Monthly (Direct)
-MTN,16.5 GB,"6,200",Monthly (+ 10mins Direct)
-MTN,20.0 GB,"7,100",Monthly (Special)
-MTN,36.0 GB,"10,400",Monthly (Direct)
-MTN,75.0 GB,"17,640",Monthly (Direct)
-MTN,165.0 GB,"33,250",Monthly (Direct)
-MTN,250.0 GB,"53,350",2 Months (Direct)
-MTN,800.0 GB,"120,000",Yearly
-AIRTEL,75 MB,75,1 Day (SME)
-AIRTEL,150 MB,80,1 Day (SME)
-AIRTEL,300 MB,125,2 Days (SME)
-AIRTEL,600 MB,250,2 Days (SME)
-AIRTEL,1.5 GB,415,1 Day (SME)
-AIRTEL,500 MB,480,7 Days (Special)
-AIRTEL,1.5 GB,480,Weekly (Social Plan)
-AIRTEL,3.0 GB,760,2 Days (SME)
-AIRTEL,5.0 GB,"1,600",2 Days (SME)
-AIRTEL,8.0 GB,"2,880",Monthly (Special)
-AIRTEL,10.0 GB,"3,065",Monthly (SME)
-AIRTEL,13.0 GB,"4,750",Monthly (Direct)
-AIRTEL,25.0 GB,"7,600",Monthly (Direct)
-AIRTEL,35.0 GB,"9,200",Monthly (Direct)
-AIRTEL,60.0 GB,"14,300",Monthly (Direct)
-AIRTEL,100.0 GB,"19,000",Monthly (Special)
-9MOBILE,500 MB,250,Monthly (Corporate Gifting)
-9MOBILE,1.0 GB,499,Monthly (Corporate Gifting)
-9MOBILE,1.5 GB,749,Monthly (Corporate Gifting)
-9MOBILE,2.0 GB,998,Monthly (Corporate Gifting)
-9MOBILE,3.0 GB,"1,497",Monthly (Corporate Gifting)
-9MOBILE,4.5 GB,"1,900",Monthly (Special)
-9MOBILE,5.0 GB,"2,495",Monthly (Corporate Gifting)
-9MOBILE,11.0 GB,"4,900",Monthly (Special)
-9MOBILE,10.0 GB,"4,990",Monthly (Corporate Gifting)
-9MOBILE,15.0 GB,"7,485",Monthly (Corporate Gifting)
-9MOBILE,40.0 GB,"19,960",Monthly (Corporate Gifting)
-"""
+# Embedded sample catalogs (see sample_catalogs.py)
+from sample_catalogs import raw_comp1_data, raw_comp2_data, raw_cost_data, raw_default_data
 
 # ==========================================
 # 3. HELPER FUNCTIONS
 # ==========================================
 
+SLOT_KEYS = ['Network', 'Norm_Size', 'Norm_Valid']
+
 def clean_price(price_str):
     if not isinstance(price_str, str): return float(price_str)
     # Remove quotes, commas, Naira symbol, spaces
@@ -496,187 +89,1470 @@ def normalize_validity(val_str):
     
     return 30 # Default fallback
 
+# --- VECTORIZED VERSIONS ---
+# Same results as the per-row helpers above, but computed over whole columns.
+# Catalogs repeat the same few labels ("1.0 GB", "SME (30 DAYS)") over and over,
+# so each column is factorized first and the string work only runs once per
+# distinct label; the answers are then broadcast back with a NumPy take.
+
+# Multipliers per unit code (0 = GB/default, 1 = MB, 2 = TB). All powers of two,
+# so multiplying is bit-for-bit the same as the `/ 1024` and `* 1024` above.
+UNIT_FACTORS = np.array([1.0, 1 / 1024, 1024.0])
+
+def _labels(series):
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    return codes, pd.Series([str(v) for v in uniques], dtype=object)
+
+def _broadcast(values, codes, index):
+    return pd.Series(np.asarray(values)[codes], index=index)
+
+def _round3(values):
+    # np.round and Python's round() only disagree on near-ties, fix those up one by one
+    out = np.round(values, 3)
+    scaled = values * 1000
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie):
+        out[i] = round(float(values[i]), 3)
+    return out
+
+def _size_from_labels(labels):
+    stripped = labels.str.upper().str.replace(r'[^\d\.MGTB]', '', regex=True)
+    val = pd.to_numeric(stripped.str.extract(r'([\d\.]+)', expand=False), errors='coerce')
+    unit = np.select([stripped.str.contains('MB', regex=False, na=False),
+                      stripped.str.contains('TB', regex=False, na=False)], [1, 2], 0)
+    sizes = _round3(val.to_numpy(dtype=float) * UNIT_FACTORS[unit])
+    return np.where(np.isnan(sizes), 0.0, sizes)
+
+def normalize_size_vec(series):
+    codes, labels = _labels(series)
+    return _broadcast(_size_from_labels(labels), codes, series.index)
+
+def _validity_from_labels(labels):
+    # (days, matched): matched is False where nothing was recognised and 30 is a guess
+    upper = labels.str.upper()
+    days = pd.to_numeric(upper.str.extract(r'(\d+)\s*DAY', expand=False), errors='coerce')
+    conditions = [upper.str.contains('MONTH|30 DAY', na=False).to_numpy(dtype=bool),
+                  upper.str.contains('WEEK|7 DAY', na=False).to_numpy(dtype=bool),
+                  upper.str.contains('1 DAY|DAILY|24 HOUR', na=False).to_numpy(dtype=bool),
+                  days.notna().to_numpy()]
+    valid = np.select(conditions, [30, 7, 1, days.fillna(0).to_numpy(dtype=np.int64)],
+                      30)  # Default fallback
+    return valid, np.logical_or.reduce(conditions)
+
+def normalize_validity_vec(series):
+    codes, labels = _labels(series)
+    return _broadcast(_validity_from_labels(labels)[0], codes, series.index)
+
+def validity_fallback_vec(series):
+    # True where normalize_validity fell back to 30 days
+    codes, labels = _labels(series)
+    return _broadcast(~_validity_from_labels(labels)[1], codes, series.index)
+
+def clean_price_vec(series):
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(float)
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    uniques = pd.Series(uniques, dtype=object)
+    is_str = uniques.map(lambda v: isinstance(v, str)).to_numpy(dtype=bool)
+    prices = np.full(len(uniques), np.nan)
+    prices[~is_str] = uniques[~is_str].astype(float)
+    cleaned = uniques[is_str].str.replace(r'[",₦\s]', '', regex=True)
+    parsed = np.array(pd.to_numeric(cleaned, errors="coerce"), dtype=float)
+    # Let float() have the final word on anything to_numeric refused ("1_000", "inf"...)
+    for i in np.flatnonzero(np.isnan(parsed)):
+        parsed[i] = clean_price(cleaned.iloc[i])
+    prices[is_str] = parsed
+    return _broadcast(prices, codes, series.index)
+
+def extract_comp1_details_vec(df, text_col='Plan Name'):
+    names = df[text_col]
+    codes, labels = _labels(names)
+    size_text = labels.str.extract(r'([\d\.]+\s*(?:MB|GB|TB))', flags=re.IGNORECASE, expand=False)
+    sizes = _size_from_labels(size_text.fillna(''))
+    valid = normalize_validity_vec(labels).to_numpy()
+    return _broadcast(sizes, codes, df.index), _broadcast(valid, codes, df.index)
+
+# --- COMPACT DTYPES ---
+# Inside the engine every money column is whole kobo in a nullable Int64 (NA = no price),
+# so undercuts and margins are exact integer sums. Sizes are float32 GB, validities
+# int16 days, and the label columns are read as categoricals. Naira floats only come
+# back at the export edge (see PricingEngine.final_frame).
+SIZE_DTYPE = np.float32
+VALID_DTYPE = np.int16
+# Read as categoricals wherever they appear in a catalog (absent columns are ignored)
+LABEL_DTYPES = {col: 'category' for col in ['Network', 'Plan Size', 'Plan Name', 'Price', 'Validity_Type', 'Validity_Desc']}
+# Bigger than any price, stands in for "no competitor" when taking the minimum
+NO_PRICE = np.iinfo(np.int64).max
+
+def to_kobo(naira):
+    # Naira floats (NaN = missing) -> Int64 kobo, rounded to the nearest kobo
+    naira = np.asarray(naira, dtype=float)
+    missing = ~np.isfinite(naira)
+    kobo = np.rint(np.where(missing, 0.0, naira) * KOBO).astype(np.int64)
+    return pd.arrays.IntegerArray(kobo, missing)
+
+def from_kobo(kobo):
+    # Int64 kobo -> naira floats with NaN, for the exported files
+    return pd.array(kobo, dtype='Int64').to_numpy(dtype=float, na_value=np.nan) / KOBO
+
+def _kobo(values):
+    # (int64 kobo, missing mask) for the pricing kernel
+    values = pd.array(values, dtype='Int64')
+    return values.to_numpy(dtype=np.int64, na_value=0), values.isna()
+
+def compact_sizes(sizes):
+    return np.asarray(sizes, dtype=float).astype(SIZE_DTYPE)
+
+def compact_days(valid):
+    return np.minimum(np.asarray(valid, dtype=np.int64), np.iinfo(VALID_DTYPE).max).astype(VALID_DTYPE)
+
+# --- COMPETITOR SOURCES ---
+# Each competitor is an adapter that turns its raw catalog into observation rows:
+# Network, Norm_Size, Norm_Valid, Comp_Price. All sources are stacked into one long
+# table and reduced with a single groupby, so adding a reseller doesn't add a merge.
+CompetitorSource = namedtuple('CompetitorSource', ['name', 'column', 'normalize', 'raw_data'])
+
+COMPETITOR_SOURCES = {}
+
+def register_competitor(source):
+    COMPETITOR_SOURCES[source.name] = source
+    return source
+
+def _observations(df, sizes, valid, prices, fallback=None):
+    # `prices` in naira, as parsed; stored as kobo like every other money column.
+    # `fallback` marks rows whose validity was guessed (see validate()).
+    obs = pd.DataFrame({'Network': df['Network'], 'Norm_Size': compact_sizes(sizes), 'Norm_Valid': compact_days(valid),
+                        'Comp_Price': to_kobo(prices)}, index=df.index)
+    if fallback is not None:
+        obs['Valid_Fallback'] = np.asarray(fallback, dtype=bool)
+    return obs
+
+# The parsers are module-level functions bound with partial() (not closures) so
+# sources can be pickled and shipped to worker processes.
+def normalize_free_text(df, text_col='Plan Name', price_col='Price'):
+    sizes, valid = extract_comp1_details_vec(df, text_col)
+    return _observations(df, sizes, valid, clean_price_vec(df[price_col]), validity_fallback_vec(df[text_col]))
+
+def normalize_structured(df, size_col='Plan Size', validity_col='Validity_Desc', price_col='Price'):
+    return _observations(df, normalize_size_vec(df[size_col]), normalize_validity_vec(df[validity_col]),
+                         clean_price_vec(df[price_col]), validity_fallback_vec(df[validity_col]))
+
+def free_text_source(name, column, raw_data=None, text_col='Plan Name', price_col='Price'):
+    # Size and validity are parsed out of a free-text plan name (ClubKonnect style)
+    return CompetitorSource(name, column, partial(normalize_free_text, text_col=text_col, price_col=price_col), raw_data)
+
+def structured_source(name, column, raw_data=None, size_col='Plan Size', validity_col='Validity_Desc', price_col='Price'):
+    # Size and validity come in their own columns (AimToGet style)
+    return CompetitorSource(name, column, partial(normalize_structured, size_col=size_col,
+                                                  validity_col=validity_col, price_col=price_col), raw_data)
+
+def competitor_inputs(sources, comp1=None, comp2=None, competitors=None):
+    # Source name -> input; comp1/comp2 are shorthands for the two built-in sources.
+    # A name that isn't one of `sources` is a typo or an unregistered feed, not something to skip.
+    unknown = sorted(set(competitors or {}) - set(sources))
+    if unknown:
+        raise ValueError(f"unknown competitor source(s) {unknown}, registered: {sorted(sources)}")
+    inputs = {'ClubKonnect': comp1, 'AimToGet': comp2}
+    inputs.update(competitors or {})
+    return inputs
+
+# Adapters a competitor feed can declare (see price_collector.py)
+FEED_ADAPTERS = {'free_text': free_text_source, 'structured': structured_source}
+
+def register_feeds(feeds):
+    # Register a competitor source for every feed (price_collector.CompetitorFeed) that
+    # declares an adapter. A feed that doesn't and isn't a registered source is an error.
+    for feed in feeds:
+        if feed.adapter is not None:
+            spec = dict(feed.adapter)
+            register_competitor(FEED_ADAPTERS[spec.pop('kind')](feed.name, spec.pop('column'), **spec))
+    unknown = sorted(feed.name for feed in feeds if feed.name not in COMPETITOR_SOURCES)
+    if unknown:
+        raise ValueError(f"feeds {unknown} have no adapter and aren't registered competitor sources "
+                         f"({sorted(COMPETITOR_SOURCES)})")
+    return feeds
+
 def parse_csv_string(csv_str):
-    return pd.read_csv(io.StringIO(csv_str.strip()))
+    return pd.read_csv(io.StringIO(csv_str.strip()), dtype=LABEL_DTYPES)
 
-# ==========================================
-# 4. PROCESSING LOGIC
-# ==========================================
+def read_source(source, default_csv, chunksize=None):
+    # Accepts a DataFrame, a file-like buffer, a raw CSV string or a file path.
+    # None falls back to the embedded sample data above.
+    # With a chunksize, an iterator of DataFrames is returned instead (streaming mode).
+    if isinstance(source, pd.DataFrame):
+        if chunksize:
+            return (source.iloc[i:i + chunksize].copy() for i in range(0, len(source), chunksize))
+        return source.copy()
+    if source is None:
+        source = io.StringIO(default_csv.strip())
+    elif isinstance(source, str) and '\n' in source:
+        source = io.StringIO(source.strip())
+    return pd.read_csv(source, chunksize=chunksize, dtype=LABEL_DTYPES)
+
+# --- SUPPLIERS ---
+# Cost catalogs from several wholesale APIs, stacked into one frame with a 'Supplier' column
+# (DEFAULT_SUPPLIER is the one `cost` names, FAILOVER_DEPTH the alternates kept per slot).
+
+def supplier_catalog(suppliers):
+    # `suppliers` maps a supplier name to anything read_source() takes (None = embedded sample)
+    return tag_suppliers({name: read_source(source, raw_cost_data) for name, source in suppliers.items()})
+
+def tag_suppliers(catalogs):
+    # Supplier name -> cost frame, stacked into one frame with a Supplier category in
+    # listing order, which is also the tie-break between suppliers
+    names = list(catalogs)
+    frames = []
+    for i, df in enumerate(catalogs.values()):
+        if 'Supplier' not in df:
+            # Frames handed back in by run_parallel() are already tagged
+            df['Supplier'] = pd.Categorical.from_codes(np.full(len(df), i), categories=names)
+        frames.append(df)
+    if len(frames) == 1:
+        return frames[0]
+    df = pd.concat(frames, ignore_index=True)
+    # Categoricals with different categories concat to object, re-encode them
+    for col in LABEL_DTYPES:
+        if col in df and df[col].dtype == object:
+            df[col] = df[col].astype('category')
+    return df
+
+def catalog_offers(df_cost):
+    # One cost catalog's cheapest plan per slot (first listed on a tie): all that
+    # cheapest_suppliers() looks at from it
+    price = pd.Series(df_cost['Clean_Price'].to_numpy(dtype=float, na_value=np.inf), index=df_cost.index)
+    best = price.groupby([df_cost[k] for k in SLOT_KEYS], observed=True).idxmin()
+    return df_cost.loc[best.to_numpy()]
+
+def cheapest_suppliers(df_cost, depth=FAILOVER_DEPTH):
+    # Cheapest plan per slot, plus up to `depth` alternates from other suppliers ranked by cost.
+    # There's no sort over the supplier rows: idxmin picks each supplier's cheapest plan per slot
+    # (the first one listed on a tie, so any split that keeps row order picks the same plan)
+    # and only those offers, at most slots x suppliers, get ranked.
+    price = pd.Series(df_cost['Clean_Price'].to_numpy(dtype=float, na_value=np.inf), index=df_cost.index)
+    best = price.groupby([df_cost[k] for k in SLOT_KEYS + ['Supplier']], observed=True).idxmin()
+    offers = df_cost.loc[best.to_numpy()].reset_index(drop=True)
+
+    # Offers come out slot by slot (groupby sorts its keys), rank them within each slot
+    slot = offers.groupby(SLOT_KEYS, observed=True, sort=False).ngroup().to_numpy()
+    order = np.lexsort((offers['Supplier'].cat.codes.to_numpy(), price.loc[best.to_numpy()].to_numpy(), slot))
+    offers = offers.iloc[order].reset_index(drop=True)
+    slot = slot[order]
+    starts = np.flatnonzero(np.r_[True, slot[1:] != slot[:-1]])
+    rank = np.arange(len(slot)) - np.repeat(starts, np.diff(np.r_[starts, len(slot)]))
+
+    columns = SLOT_KEYS + [col for col in df_cost.columns if col not in SLOT_KEYS]
+    cheapest = offers.loc[rank == 0, columns].reset_index(drop=True)
+    alternates = (rank > 0) & (rank <= depth)
+    failover = offers.loc[alternates, SLOT_KEYS + ['Supplier', 'ID', 'Clean_Price']].reset_index(drop=True)
+    failover.insert(len(SLOT_KEYS), 'Failover_Rank', rank[alternates].astype(np.int8))
+    return cheapest, failover
+
+def fold_slot_min(frames, price_col, keys=SLOT_KEYS):
+    # Fold (chunks of) a normalized catalog into a running per-slot minimum.
+    # Only the running minimum is kept, so memory follows the number of slots, not rows.
+    running = None
+    for frame in frames:
+        chunk_min = frame.groupby(keys, observed=True)[price_col].min()
+        if running is None:
+            running = chunk_min
+        else:
+            running = pd.concat([running, chunk_min]).groupby(level=keys, observed=True).min()
+    if running is None:
+        return pd.DataFrame(columns=keys + [price_col])
+    return running.reset_index()
+
+def competitor_long(sources, stream=False):
+    # Stack every source's observations into one long table and reduce it with a
+    # single groupby to the min price per (slot, competitor).
+    # When streaming, the chunks are folded into the running minimum instead.
+    names = list(sources)
+    def tagged(name, frames):
+        for frame in frames:
+            frame['Competitor'] = pd.Categorical.from_codes(np.full(len(frame), names.index(name)), names)
+            yield frame
+    observations = itertools.chain.from_iterable(tagged(name, frames) for name, frames in sources.items())
+    if not stream:
+        observations = list(observations)
+        observations = [pd.concat(observations, ignore_index=True)] if observations else []
+    return fold_slot_min(observations, 'Comp_Price', SLOT_KEYS + ['Competitor'])
+
+def pivot_competitors(long, names):
+    # One price column per competitor
+    wide = long.pivot(index=SLOT_KEYS, columns='Competitor', values='Comp_Price')
+    wide = wide.reindex(columns=names)
+    wide.columns.name = None
+    return wide.reset_index()
+
+def match_nearest_sizes(slots, long, names, tolerance):
+    # Nearest-size lookup per (Network, Norm_Valid, Competitor): GLO "1.024 GB" meets "1 GB",
+    # "2.6GB" meets "2.5 GB". Matching runs on log(size) so `tolerance` is relative
+    # (0.05 = sizes within 5% of each other). merge_asof does a sorted search per slot
+    # instead of a cross join. Unparsed sizes (0.0) never match.
+    slots = slots[SLOT_KEYS].drop_duplicates()
+    left = slots[slots['Norm_Size'] > 0].merge(pd.DataFrame({'Competitor': names}), how='cross')
+    left['Log_Size'] = np.log(left['Norm_Size'].to_numpy(dtype=float))
+    right = long[long['Norm_Size'] > 0].rename(columns={'Norm_Size': 'Comp_Size'})
+    right = right.assign(Competitor=right['Competitor'].astype(str),
+                         Log_Size=np.log(right['Comp_Size'].to_numpy(dtype=float)))
+    matched = pd.merge_asof(left.sort_values('Log_Size'), right.sort_values('Log_Size'), on='Log_Size',
+                            by=['Network', 'Norm_Valid', 'Competitor'], direction='nearest',
+                            tolerance=float(np.log1p(tolerance)))
+    matched['Match_Distance'] = (matched['Comp_Size'] - matched['Norm_Size']).abs()
+    wide = pivot_competitors(matched, names)
+    # Report how far off the closest competitor match was (in GB), NaN if nothing matched
+    distance = matched.groupby(SLOT_KEYS)['Match_Distance'].min().reset_index()
+    return pd.merge(wide, distance, on=SLOT_KEYS, how='left')
+
+# --- CATALOG VALIDATION ---
+# Unit prices (log ₦/GB) of the cost, default and competitor rows are pooled per
+# (Network, Norm_Valid) and each row gets a robust z-score against its group's median
+# and MAD. Rows are flagged for:
+#   unit_price_outlier   |z| above the threshold (groups of ANOMALY_MIN_ROWS or more)
+#   unparsed_size        normalize_size gave 0.0
+#   validity_fallback    normalize_validity didn't recognise the label and guessed 30 days
+# Flagged competitor rows are quarantined, so a typo can't drag a slot's lowest price down.
+ANOMALY_Z = 3.5
+ANOMALY_MIN_ROWS = 5
+# Floor on the MAD (in log ₦/GB, about 5%), so a group that all sells at one unit price
+# doesn't flag every small difference
+ANOMALY_MIN_SPREAD = 0.05
+ANOMALY_FLAGS = ['unit_price_outlier', 'unparsed_size', 'validity_fallback']
+ANOMALY_FILE = "anomalies.csv"
+ANOMALY_COLUMNS = ['Catalog', 'Row', 'Network', 'Norm_Size', 'Norm_Valid', 'Price', 'Unit_Price', 'Robust_Z', 'Flags',
+                   'Quarantined']
+
+def catalog_keys(frame, price_col, networks):
+    # (group id, log ₦/GB) per row; the group id packs the network (numbered in `networks`,
+    # which grows as new names turn up) and the validity. Unpriced or unsized rows get NaN.
+    codes, labels = _labels(frame['Network'])
+    ids = np.array([networks.setdefault(label.upper(), len(networks)) for label in labels], dtype=np.int64)
+    group = ids[codes] * 65536 + frame['Norm_Valid'].to_numpy(dtype=np.int64)
+    price = pd.array(frame[price_col], dtype='Int64').to_numpy(dtype=float, na_value=np.nan) / KOBO
+    size = frame['Norm_Size'].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        unit = np.log(price / size)
+    return group, np.where((price > 0) & (size > 0), unit, np.nan)
+
+def unit_price_stats(groups, units):
+    # Median, MAD and row count of the unit price per group, groups in sorted order
+    ok = np.isfinite(units)
+    codes, group_ids = pd.factorize(groups[ok], sort=True)
+    units = pd.Series(units[ok])
+    median = units.groupby(codes).median().to_numpy()
+    mad = (units - median[codes]).abs().groupby(codes).median().to_numpy()
+    return pd.DataFrame({'median': median, 'mad': mad, 'rows': np.bincount(codes, minlength=len(group_ids))},
+                        index=pd.Index(group_ids, dtype=np.int64, name='group'))
+
+def anomaly_flags(groups, units, frame, stats, z=ANOMALY_Z):
+    # (bit flags in ANOMALY_FLAGS order, robust z) per row
+    i = np.clip(np.searchsorted(stats.index.to_numpy(), groups), 0, max(0, len(stats) - 1))
+    found = (stats.index.to_numpy()[i] == groups) if len(stats) else np.zeros(len(groups), dtype=bool)
+    median, mad, rows = (stats[col].to_numpy()[i] for col in ['median', 'mad', 'rows'])
+    with np.errstate(invalid='ignore'):
+        robust_z = np.where(found, 0.6745 * (units - median) / np.maximum(mad, ANOMALY_MIN_SPREAD), np.nan)
+        outlier = found & (rows >= ANOMALY_MIN_ROWS) & (np.abs(robust_z) > z)
+    flags = outlier.astype(np.int8)
+    flags |= (frame['Norm_Size'].to_numpy() == 0).astype(np.int8) << 1
+    if 'Valid_Fallback' in frame:
+        flags |= frame['Valid_Fallback'].to_numpy(dtype=bool).astype(np.int8) << 2
+    elif 'Validity_Type' in frame:
+        flags |= validity_fallback_vec(frame['Validity_Type']).to_numpy(dtype=bool).astype(np.int8) << 2
+    return flags, robust_z
+
+def anomaly_rows(catalog, frame, price_col, units, flags, robust_z, quarantined):
+    # The flagged rows of one catalog, for the anomalies report
+    hit = flags != 0
+    names = np.array(['|'.join(name for bit, name in enumerate(ANOMALY_FLAGS) if code >> bit & 1)
+                      for code in range(1 << len(ANOMALY_FLAGS))], dtype=object)
+    return pd.DataFrame({
+        'Catalog': [catalog] * int(hit.sum()),
+        'Row': frame.index[hit],
+        'Network': frame['Network'].to_numpy()[hit],
+        'Norm_Size': frame['Norm_Size'].to_numpy()[hit],
+        'Norm_Valid': frame['Norm_Valid'].to_numpy()[hit],
+        'Price': from_kobo(frame[price_col].array[hit]),
+        'Unit_Price': np.exp(units[hit]).round(2),
+        'Robust_Z': robust_z[hit].round(2),
+        'Flags': names[flags[hit]],
+        'Quarantined': quarantined,
+    })
+
+# --- COLUMNAR PRICING KERNEL ---
+# The pricing rules, run over whole arrays at once in integer kobo (prices come in
+# and go out as Int64, see COMPACT DTYPES). Cost and Default are swapped when Cost is
+# the higher one, so the lower price is always treated as Cost.
+STATUS_DTYPE = pd.CategoricalDtype(STATUS_LABELS)
+
+def swap_prices_vec(cost, default):
+    cost, cost_na = _kobo(cost)
+    default, default_na = _kobo(default)
+    # A missing price never swaps, so a missing Default keeps Cost as is
+    swap = ~cost_na & ~default_na & (cost > default)
+    return (pd.arrays.IntegerArray(np.where(swap, default, cost), cost_na),
+            pd.arrays.IntegerArray(np.where(swap, cost, default), default_na))  # [Low, High]
+
+def lowest_competitor(comps, n):
+    # Min over the competitor columns in kobo; missing competitors count as NO_PRICE
+    min_comp = np.full(n, NO_PRICE)
+    for comp in comps:
+        values, missing = _kobo(comp)
+        min_comp = np.minimum(min_comp, np.where(missing, NO_PRICE, values))
+    return min_comp, min_comp != NO_PRICE
+
+def price_kernel(cost, default, comps, undercut=None, policy=None):
+    # `undercut` is in naira like UNDERCUT_AMOUNT; everything else is kobo.
+    # `policy` optionally sets the undercut and profit floor per slot (see rule_policy).
+    if undercut is None:
+        undercut = UNDERCUT_AMOUNT
+    undercut = int(round(undercut * KOBO))
+    cost, cost_na = _kobo(cost)
+    default, default_na = _kobo(default)
 
-# -- A. PARSE COST DATA --
-df_cost = parse_csv_string(raw_cost_data)
-df_cost['Norm_Size'] = df_cost['Plan Size'].apply(normalize_size)
-df_cost['Norm_Valid'] = df_cost['Validity_Type'].apply(normalize_validity)
-df_cost['Clean_Price'] = df_cost['Price'].apply(clean_price)
-
-# Group by Network, Size, Validity -> Select Lowest Cost Plan
-df_master = df_cost.sort_values('Clean_Price').groupby(['Network', 'Norm_Size', 'Norm_Valid']).first().reset_index()
-
-# -- B. PARSE DEFAULT SELLING --
-df_def = parse_csv_string(raw_default_data)
-df_def['Norm_Size'] = df_def['Plan Size'].apply(normalize_size)
-df_def['Norm_Valid'] = df_def['Validity_Type'].apply(normalize_validity)
-df_def['Def_Price'] = df_def['Price'].apply(clean_price)
-
-# Merge Default Price
-df_master = pd.merge(df_master, df_def[['Network', 'Norm_Size', 'Norm_Valid', 'Def_Price']], 
-                     on=['Network', 'Norm_Size', 'Norm_Valid'], how='left')
-
-# --- FIX: SWAP PRICES IF COST > DEFAULT ---
-# This ensures the Lowest Price is ALWAYS treated as Cost, and Higher as Default/Selling
-def swap_prices(row):
-    p1 = row['Clean_Price'] # Currently loaded as Cost
-    p2 = row['Def_Price']   # Currently loaded as Default
-    
-    # If Default is missing, keep Cost as is
-    if pd.isnull(p2): return pd.Series([p1, p2])
-    
-    # If Cost > Default, SWAP THEM
-    if p1 > p2:
-        return pd.Series([p2, p1]) # Return [Low, High]
-    else:
-        return pd.Series([p1, p2]) # Return [Low, High]
-
-# Apply the swap logic
-df_master[['Clean_Price', 'Def_Price']] = df_master.apply(swap_prices, axis=1)
-
-# -- C. PARSE COMPETITOR 1 --
-df_comp1 = parse_csv_string(raw_comp1_data)
-def extract_comp1_details(row):
-    text = row['Plan Name']
-    # Extract Size (rough regex)
-    size_match = re.search(r'([\d\.]+\s*(MB|GB|TB))', text, re.IGNORECASE)
-    size = normalize_size(size_match.group(1)) if size_match else 0
-    # Extract Validity
-    valid = normalize_validity(text)
-    return pd.Series([size, valid])
-
-df_comp1[['Norm_Size', 'Norm_Valid']] = df_comp1.apply(extract_comp1_details, axis=1)
-df_comp1['Comp1_Price'] = df_comp1['Price'].apply(clean_price)
-# Get min price per slot
-df_comp1_agg = df_comp1.groupby(['Network', 'Norm_Size', 'Norm_Valid'])['Comp1_Price'].min().reset_index()
-
-# -- D. PARSE COMPETITOR 2 --
-df_comp2 = parse_csv_string(raw_comp2_data)
-df_comp2['Norm_Size'] = df_comp2['Plan Size'].apply(normalize_size)
-df_comp2['Norm_Valid'] = df_comp2['Validity_Desc'].apply(normalize_validity)
-df_comp2['Comp2_Price'] = df_comp2['Price'].apply(clean_price)
-# Get min price per slot
-df_comp2_agg = df_comp2.groupby(['Network', 'Norm_Size', 'Norm_Valid'])['Comp2_Price'].min().reset_index()
-
-# -- E. MERGE COMPETITORS --
-df_master = pd.merge(df_master, df_comp1_agg, on=['Network', 'Norm_Size', 'Norm_Valid'], how='left')
-df_master = pd.merge(df_master, df_comp2_agg, on=['Network', 'Norm_Size', 'Norm_Valid'], how='left')
-
-# -- F. CALCULATE FINAL PRICE --
-def calculate_final(row):
-    cost = row['Clean_Price'] # Now guaranteed to be the Lower price
-    default = row['Def_Price'] # Now guaranteed to be the Higher price
-    c1 = row['Comp1_Price']
-    c2 = row['Comp2_Price']
-    
     # 1. Determine lowest competitor price
-    comps = [p for p in [c1, c2] if pd.notnull(p)]
-    
-    if not comps:
-        # No competitor -> Use Default
-        final = default if pd.notnull(default) else cost * 1.2 # Fallback margin if no default
-    else:
-        min_comp = min(comps)
-        # Undercut
-        final = min_comp - UNDERCUT_AMOUNT
-    
+    min_comp, has_comp = lowest_competitor(comps, len(cost))
+    floor = cost
+    if policy is not None:
+        comp = np.where(has_comp, min_comp, 0)
+        undercut = policy['undercut'] + np.rint(comp * policy['undercut_pct']).astype(np.int64)
+        floor = cost + policy['min_margin'] + np.rint(cost * policy['min_margin_pct']).astype(np.int64)
+
+    # Undercut, else Default, else fallback margin (cost * 1.2, to the nearest kobo)
+    final = np.where(has_comp, min_comp - undercut, np.where(default_na, (cost * 6 + 2) // 5, default))
+    final_na = ~has_comp & default_na & cost_na
+
     # 2. Profit Protection
-    if final < cost:
-        final = cost
-        
+    final = np.where(~cost_na & (final < floor), floor, final)
+
     # 3. Exclusion Flag (if even at cost we are higher than competitor)
-    status = "Active"
-    if comps:
-        min_comp = min(comps)
-        if final > min_comp:
-            status = "Excluded (Too High)"
-            
-    return pd.Series([final, status, min(comps) if comps else None])
+    status = np.where(final_na, 2, has_comp & (final > min_comp)).astype(np.int8)  # index into STATUS_LABELS
+    return (pd.arrays.IntegerArray(final, final_na), status,
+            pd.arrays.IntegerArray(np.where(has_comp, min_comp, 0), ~has_comp))
+
+def calculate_final_vec(df, comp_columns, undercut=None, policy=None):
+    final, status, min_comp = price_kernel(df['Clean_Price'].array, df['Def_Price'].array,
+                                           [df[c].array for c in comp_columns], undercut, policy)
+    status = pd.Categorical.from_codes(status, dtype=STATUS_DTYPE)
+    return pd.DataFrame({'Final Selling Price': final, 'Status': status, 'Lowest Competitor': min_comp}, index=df.index)
 
-df_master[['Final Selling Price', 'Status', 'Lowest Competitor']] = df_master.apply(calculate_final, axis=1)
+register_competitor(free_text_source('ClubKonnect', 'Comp1_Price', raw_comp1_data))
+register_competitor(structured_source('AimToGet', 'Comp2_Price', raw_comp2_data))
 
 # ==========================================
-# 5. FINAL OUTPUT (CSV & GENERAL JSON)
+# 4. PRICING ENGINE
 # ==========================================
-output_columns = ['Network', 'ID', 'Plan Size', 'Validity_Type', 'Clean_Price', 'Def_Price', 'Lowest Competitor', 'Final Selling Price', 'Status']
 
-# 1. Sort and Select Columns
-df_final = df_master.sort_values(['Network', 'Norm_Valid', 'Clean_Price'])[output_columns]
+OUTPUT_COLUMNS = ['Network', 'ID', 'Plan Size', 'Validity_Type', 'Clean_Price', 'Def_Price', 'Lowest Competitor', 'Final Selling Price', 'Status']
+# Renamed to FINAL_COLUMNS on export; the output file names are in pricing_constants.py
+
+# Per-slot inputs that decide a price (plus one column per competitor), and the outputs we keep from the last run
+SNAPSHOT_INPUTS = ['ID', 'Plan Size', 'Validity_Type', 'Clean_Price', 'Def_Price']
+SNAPSHOT_OUTPUTS = ['Final Selling Price', 'Status', 'Lowest Competitor']
+# Snapshots written before prices moved to kobo can't be compared against, they're ignored
+SNAPSHOT_MONEY = 'kobo'
+# Money columns of OUTPUT_COLUMNS, turned back into naira by final_frame()
+MONEY_COLUMNS = ['Clean_Price', 'Def_Price', 'Lowest Competitor', 'Final Selling Price']
+
+
+def _slot_rows(df):
+    # A slot can appear more than once when the default catalog lists it twice,
+    # so number the repeats to get a unique row key
+    keyed = df.copy(deep=False)
+    keyed['Slot_Row'] = df.groupby(SLOT_KEYS, sort=False, observed=True).cumcount().to_numpy()
+    return keyed
+
+def changed_slots(current, previous, comp_columns):
+    # True for every row of `current` that is new or whose inputs moved since `previous`
+    keys = SLOT_KEYS + ['Slot_Row']
+    inputs = SNAPSHOT_INPUTS + comp_columns
+    previous = _slot_rows(previous).reindex(columns=keys + inputs)  # a competitor may be new since last run
+    merged = pd.merge(_slot_rows(current)[keys + inputs], previous,
+                      on=keys, how='left', suffixes=('', '_prev'), indicator=True)
+    changed = np.array(merged['_merge'] == 'left_only')
+    for col in inputs:
+        # Labels are compared as plain values, the two runs' categories needn't match
+        now, before = merged[col].astype(object), merged[col + '_prev'].astype(object)
+        changed |= ~((now == before) | (now.isna() & before.isna())).to_numpy(dtype=bool)
+    return changed, merged
+
+def save_snapshot(df_priced, path, undercut, comp_columns, rules=()):
+    snapshot = df_priced[SLOT_KEYS + SNAPSHOT_INPUTS + comp_columns + SNAPSHOT_OUTPUTS].copy()
+    snapshot['Status'] = snapshot['Status'].astype(str)
+    snapshot.attrs['undercut'] = undercut
+    snapshot.attrs['rules'] = rules_spec(rules)
+    snapshot.attrs['money'] = SNAPSHOT_MONEY
+    snapshot.to_pickle(path)
+    return path
+
+def load_snapshot(path):
+    if not os.path.exists(path):
+        return None
+    snapshot = pd.read_pickle(path)
+    if snapshot.attrs.get('money') != SNAPSHOT_MONEY:
+        return None
+    return snapshot
+
+def plan_delta(previous_payload, payload):
+    # Inserted / updated / deactivated plans keyed by plan_id, ready for a small upsert.
+    # Repeated plan_ids keep their last row, same as uploading the full file would.
+    before = {plan['plan_id']: plan for plan in previous_payload}
+    after = {plan['plan_id']: plan for plan in payload}
+    return {
+        "inserted": [plan for plan_id, plan in after.items() if plan_id not in before],
+        "updated": [plan for plan_id, plan in after.items() if plan_id in before and before[plan_id] != plan],
+        "deactivated": [plan_id for plan_id in before if plan_id not in after],
+    }
+
+def _write_bytes(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+# --- SUPABASE PAYLOAD ---
+# Built column by column from the final frame. Rows only become dicts a chunk at a
+# time while they are written out, so the full list of dicts is never in memory.
+EXPORT_CHUNK = 10_000
+
+def payload_frame(df_final):
+    # Each distinct network name goes through map_network_to_id once
+    codes, networks = pd.factorize(df_final['Network'].astype(str))
+    network_ids = np.array([map_network_to_id(name) for name in networks], dtype=np.int64)
+    validity = df_final['Type_Validity'].astype(str)
+    return pd.DataFrame({
+        "network_id": network_ids[codes],
+        "plan_id": df_final['Plan_ID'].astype(str),
+        "network_name": df_final['Network'].astype(str),
+        "plan_type": "ALL",
+        "plan_name": df_final['Size'].astype(str) + "GB - " + validity,
+        # Whole naira, rounded up so a kobo remainder never drops the price below cost
+        "amount": pd.array(np.ceil(df_final['Final_Price'].to_numpy(dtype=float)), dtype='Int64'),
+        "cost_price": df_final['Cost_Price'].astype(float),
+        "validity": validity,
+    }, index=df_final.index).reset_index(drop=True)
+
+def iter_plans(payload, chunksize=EXPORT_CHUNK):
+    for start in range(0, len(payload), chunksize):
+        yield from payload.iloc[start:start + chunksize].to_dict('records')
+
+def json_safe(v):
+    # Plain Python value for json.dumps; a missing value (NaN/NA/None) becomes null
+    if isinstance(v, np.generic):
+        v = v.item()
+    return None if v is None or v is pd.NA or (isinstance(v, float) and math.isnan(v)) else v
+
+def _json_tokens(series):
+    # JSON text of every value, missing ones as null; each distinct value is encoded once
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    encoded = [json.dumps(json_safe(v), allow_nan=False) for v in uniques]
+    return np.asarray(encoded, dtype=object)[codes]
+
+def _json_rows(payload, template):
+    # Render each plan straight from the column tokens, no dict per row
+    for start in range(0, len(payload), EXPORT_CHUNK):
+        chunk = payload.iloc[start:start + EXPORT_CHUNK]
+        yield from (template % row for row in zip(*(_json_tokens(chunk[col]) for col in chunk.columns)))
+
+def _json_template(columns, indent):
+    # The layout json.dumps(plan, indent=2) (or compact, for NDJSON) produces
+    keys = [json.dumps(col).replace('%', '%%') for col in columns]
+    if indent:
+        return '  {\n' + ',\n'.join(f'    {key}: %s' for key in keys) + '\n  }'
+    return '{' + ','.join(f'{key}:%s' for key in keys) + '}'
+
+def write_plans_json(payload, path):
+    # Same bytes as json.dump(list_of_plans, f, indent=2), streamed a chunk at a time
+    with open(path, 'w') as f:
+        f.write('[')
+        sep = '\n'
+        for row in _json_rows(payload, _json_template(payload.columns, indent=True)):
+            f.write(sep + row)
+            sep = ',\n'
+        f.write(']' if sep == '\n' else '\n]')
+    return path
+
+def write_plans_ndjson(payload, path):
+    # One compact JSON object per line
+    with open(path, 'w') as f:
+        for row in _json_rows(payload, _json_template(payload.columns, indent=False)):
+            f.write(row + '\n')
+    return path
+
+def write_shards(db_payload, out_dir):
+    # One minified JSON file per network_id, with gzip (and brotli, if installed)
+    # copies next to it, plus a manifest of sizes, content hashes and ETags so the app
+    # only downloads the selected network and can revalidate its cached copy.
+    shard_dir = os.path.join(out_dir, SHARD_DIR)
+    os.makedirs(shard_dir, exist_ok=True)
+    by_network = {}
+    for plan in db_payload:
+        by_network.setdefault(plan['network_id'], []).append(plan)
+
+    manifest = {}
+    for network_id, plans in sorted(by_network.items()):
+        name = f"network_{network_id}.json"
+        plans = [{key: json_safe(value) for key, value in plan.items()} for plan in plans]
+        body = json.dumps(plans, separators=(',', ':'), allow_nan=False).encode('utf-8')
+        digest = hashlib.sha256(body).hexdigest()
+        entry = {
+            "network_name": plans[0]['network_name'],
+            "plans": len(plans),
+            "file": name,
+            "bytes": _write_bytes(os.path.join(shard_dir, name), body),
+            "sha256": digest,
+            "etag": f'"{digest[:16]}"',
+            # mtime=0 keeps the gzip bytes stable when the content is
+            "gzip": {"file": name + ".gz",
+                     "bytes": _write_bytes(os.path.join(shard_dir, name + ".gz"), gzip.compress(body, 9, mtime=0))},
+        }
+        if brotli is not None:
+            entry["br"] = {"file": name + ".br",
+                           "bytes": _write_bytes(os.path.join(shard_dir, name + ".br"), brotli.compress(body))}
+        manifest[str(network_id)] = entry
 
-# 2. Rename Columns 
-# (Changed to snake_case for better JSON/API compatibility)
-df_final.columns = ['Network', 'Plan_ID', 'Size', 'Type_Validity', 'Cost_Price', 'Default_Price', 'Competitor_Price', 'Final_Price', 'Status']
+    path = os.path.join(shard_dir, MANIFEST_FILE)
+    with open(path, 'w') as f:
+        json.dump({"shards": manifest}, f, indent=2)
+    return path, manifest
 
-# 3. Filter Active Plans
-df_final = df_final[df_final['Status'] == 'Active']
 
-# --- SAVE AS CSV ---
-csv_file = "naija_prices_fixed.csv"
-df_final.to_csv(csv_file, index=False)
+# --- WHAT-IF SCENARIOS ---
+# Price every slot under many policies at once: parameters are laid out as
+# (scenarios x slots) arrays and the pricing rules are broadcast over them, so a
+# grid of a few hundred policies costs about as much as one pricing run.
+#   undercut        ₦ below the lowest competitor (UNDERCUT_AMOUNT today)
+#   undercut_pct    extra undercut as a fraction of the lowest competitor price
+#   min_margin      ₦ floor above cost (0 = plain profit protection)
+#   min_margin_pct  floor above cost as a fraction of cost
+#   overrides       {"MTN": {"undercut": 10}, ...} per-network parameter overrides
+SCENARIO_PARAMS = ['undercut', 'undercut_pct', 'min_margin', 'min_margin_pct']
+Scenario = namedtuple('Scenario', ['name'] + SCENARIO_PARAMS + ['overrides'],
+                      defaults=[UNDERCUT_AMOUNT, 0.0, 0.0, 0.0, None])
+SCENARIO_FILE = "scenarios.csv"
+# Slot x scenario cells per block, keeps the temporary arrays to a few tens of MB
+SCENARIO_BLOCK = 1 << 20
 
-# --- SAVE AS GENERAL JSON ---
-json_file = "naija_prices_fixed.json"
-# orient='records' creates a list of dictionaries: [{}, {}, {}]
-df_final.to_json(json_file, orient='records', indent=4)
+def scenario_grid(undercut=(UNDERCUT_AMOUNT,), undercut_pct=(0.0,), min_margin=(0.0,), min_margin_pct=(0.0,),
+                  overrides=(None,)):
+    # Every combination of the given values
+    scenarios = []
+    for values in itertools.product(undercut, undercut_pct, min_margin, min_margin_pct, overrides):
+        name = ', '.join(f"{param}={value:g}" for param, value in zip(SCENARIO_PARAMS, values))
+        if values[-1]:
+            name += ', overrides=' + '/'.join(sorted(values[-1]))
+        scenarios.append(Scenario(name, *values))
+    return scenarios
 
-# 5. PRINT SUMMARY TO TERMINAL
-print("-" * 30)
-print(f"✅ Success!")
-print(f"📄 CSV saved to: {csv_file}")
-print(f"📄 General JSON saved to: {json_file}")
-print("-" * 30)
+def load_scenarios(path):
+    # Either a list [{"name": "aggressive", "undercut": 20, ...}, ...]
+    # or a grid {"undercut": [0, 5, 10], "min_margin_pct": [0, 0.05]}
+    with open(path) as f:
+        spec = json.load(f)
+    if isinstance(spec, dict):
+        return scenario_grid(**spec)
+    return [Scenario(**item) for item in spec]
 
-# Optional: Print first 2 JSON objects to terminal for verification
-json_preview = df_final.head(2).to_json(orient='records', indent=4)
-print("JSON Preview:")
-print(json_preview)
+def _scenario_params(scenarios, networks):
+    # One (scenarios x networks) table per parameter, money in kobo
+    params = {}
+    for param in SCENARIO_PARAMS:
+        table = np.empty((len(scenarios), len(networks)))
+        for i, scenario in enumerate(scenarios):
+            overrides = scenario.overrides or {}
+            table[i] = [overrides.get(net, {}).get(param, getattr(scenario, param)) for net in networks]
+        params[param] = table
+    for param in ['undercut', 'min_margin']:
+        params[param] = np.rint(params[param] * KOBO).astype(np.int64)
+    return params
+
+def evaluate_scenarios(df_master, comp_columns, scenarios, volumes=None):
+    # Per scenario: active / excluded plan counts (unpriced slots are neither), average margin over cost (₦ and %),
+    # and projected revenue and profit. `volumes` is the expected units sold per slot
+    # (default: one of each active plan).
+    cost, cost_na = _kobo(df_master['Clean_Price'].array)
+    default, default_na = _kobo(df_master['Def_Price'].array)
+    min_comp, has_comp = lowest_competitor([df_master[c].array for c in comp_columns], len(cost))
+    min_comp = np.where(has_comp, min_comp, 0)
+    # Without a competitor a slot sells at Default (or the cost markup) whatever the policy
+    fallback = np.where(has_comp, 0, np.where(default_na, (cost * 6 + 2) // 5, default))
+    unpriced = ~has_comp & default_na & cost_na
+    volumes = np.ones(len(cost)) if volumes is None else np.asarray(volumes, dtype=float)
+    codes, networks = pd.factorize(df_master['Network'].astype(str))
+    params = _scenario_params(scenarios, list(networks))
+
+    # Rows that price the same under every policy are evaluated once, weighted by how many there are
+    rows = pd.DataFrame({'network': codes, 'cost': cost, 'cost_na': cost_na, 'comp': min_comp, 'has_comp': has_comp,
+                         'fallback': fallback, 'unpriced': unpriced, 'n': 1, 'volume': volumes})
+    rows = rows.groupby(list(rows.columns[:-2]), sort=False).sum().reset_index()
+    codes, cost, cost_na, min_comp, has_comp, fallback, unpriced, n, volumes = (
+        rows[col].to_numpy() for col in rows.columns)
+    n = n.astype(float)
+
+    totals = {key: np.zeros(len(scenarios)) for key in ['active', 'excluded', 'margined', 'margin', 'margin_pct', 'revenue', 'profit']}
+    step = max(1, SCENARIO_BLOCK // max(1, len(scenarios)))
+    for start in range(0, len(cost), step):
+        block = slice(start, start + step)
+        p = {param: table[:, codes[block]] for param, table in params.items()}
+        c, c_na, comp, has = cost[block], cost_na[block], min_comp[block], has_comp[block]
+
+        # Same rules as price_kernel, with per-scenario undercut and profit floor
+        cut = p['undercut'] + np.rint(comp * p['undercut_pct']).astype(np.int64)
+        final = np.where(has, comp - cut, fallback[block])
+        floor = c + p['min_margin'] + np.rint(c * p['min_margin_pct']).astype(np.int64)
+        final = np.where(~c_na & (final < floor), floor, final)
+        excluded = has & (final > comp)
+
+        sold = ~excluded & ~unpriced[block]
+        margined = sold & ~c_na & (c > 0)
+        margin = np.where(margined, final - c, 0)
+        w, k = volumes[block], n[block]
+        totals['active'] += sold @ k
+        totals['excluded'] += excluded @ k
+        totals['margined'] += margined @ k
+        totals['margin'] += margin @ k
+        totals['margin_pct'] += (margin / np.where(c > 0, c, 1)) @ k
+        totals['revenue'] += np.where(sold, final, 0) @ w
+        totals['profit'] += margin @ w
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return pd.DataFrame({
+            'active': totals['active'].astype(np.int64),
+            'excluded': totals['excluded'].astype(np.int64),
+            'avg_margin': totals['margin'] / totals['margined'] / KOBO,
+            'avg_margin_pct': totals['margin_pct'] / totals['margined'] * 100,
+            'revenue': totals['revenue'] / KOBO,
+            'profit': totals['profit'] / KOBO,
+        }, index=pd.Index([scenario.name for scenario in scenarios], name='scenario'))
+
+
+# --- PRICING RULES ---
+# Policy exceptions by slot, read from a JSON list and applied in order:
+#
+#   [{"name": "awoof", "match": {"keywords": ["AWOOF"]}, "undercut_pct": 0.02},
+#    {"name": "9mobile floor", "match": {"network": "9MOBILE"}, "min_margin_pct": 0.03},
+#    {"name": "gifting yearly", "match": {"keywords": ["GIFTING"], "days": {"min": 365}}, "undercut": 0}]
+#
+# match fields (all given must hold, a list means any of):
+#   network   network name(s)
+#   days      validity in days: a value, a list or {"min": .., "max": ..}
+#   size_gb   plan size in GB, same forms as days
+#   keywords  words to look for in Validity_Type (SME, GIFTING, AWOOF, ...), case-insensitive
+# A rule sets any of the SCENARIO_PARAMS; per parameter the first matching rule wins and
+# slots no rule sets keep the engine's undercut and plain profit protection.
+# Each rule is one boolean mask over the slots and each parameter one np.select, so
+# hundreds of rules stay a handful of array operations.
+RULE_FIELDS = ['network', 'days', 'size_gb', 'keywords']
+Rule = namedtuple('Rule', ['name', 'match'] + SCENARIO_PARAMS, defaults=[None] * len(SCENARIO_PARAMS))
+
+def load_rules(path):
+    with open(path) as f:
+        rules = [Rule(**item) for item in json.load(f)]
+    for rule in rules:
+        unknown = set(rule.match) - set(RULE_FIELDS)
+        if unknown:
+            raise ValueError(f"rule {rule.name!r}: unknown match field(s) {sorted(unknown)}, expected {RULE_FIELDS}")
+    return rules
+
+def rules_spec(rules):
+    # Plain dicts, for comparing the rules a snapshot was priced with
+    return [dict(rule._asdict()) for rule in rules or ()]
+
+def _range_mask(values, spec):
+    if isinstance(spec, dict):
+        mask = np.ones(len(values), dtype=bool)
+        if spec.get('min') is not None:
+            mask &= values >= spec['min']
+        if spec.get('max') is not None:
+            mask &= values <= spec['max']
+        return mask
+    return np.isin(values, np.atleast_1d(spec))
+
+def rule_masks(rules, slots):
+    # One boolean mask per rule. Label tests run once per distinct label and are
+    # broadcast back through the factorized codes.
+    network_codes, networks = _labels(slots['Network'])
+    networks = networks.str.upper()
+    type_codes, types = _labels(slots['Validity_Type'])
+    types = types.str.upper()
+    sizes = np.round(slots['Norm_Size'].to_numpy(dtype=float), 3)
+    days = slots['Norm_Valid'].to_numpy()
+
+    masks = []
+    for rule in rules:
+        mask = np.ones(len(slots), dtype=bool)
+        match = rule.match
+        if 'network' in match:
+            wanted = [str(name).upper() for name in np.atleast_1d(match['network'])]
+            mask &= networks.isin(wanted).to_numpy()[network_codes]
+        if 'keywords' in match:
+            pattern = '|'.join(re.escape(str(word).upper()) for word in np.atleast_1d(match['keywords']))
+            mask &= types.str.contains(pattern, regex=True).to_numpy(dtype=bool)[type_codes]
+        if 'days' in match:
+            mask &= _range_mask(days, match['days'])
+        if 'size_gb' in match:
+            mask &= _range_mask(sizes, match['size_gb'])
+        masks.append(mask)
+    return masks
+
+def rule_policy(rules, slots, undercut=None):
+    # Per-slot undercut / profit floor for price_kernel, money in kobo
+    if undercut is None:
+        undercut = UNDERCUT_AMOUNT
+    masks = rule_masks(rules, slots)
+    base = {'undercut': undercut, 'undercut_pct': 0.0, 'min_margin': 0.0, 'min_margin_pct': 0.0}
+    policy = {}
+    for param in SCENARIO_PARAMS:
+        branches = [(mask, getattr(rule, param)) for mask, rule in zip(masks, rules) if getattr(rule, param) is not None]
+        if branches:
+            policy[param] = np.select([mask for mask, _ in branches], [float(value) for _, value in branches],
+                                      base[param])
+        else:
+            policy[param] = np.full(len(slots), float(base[param]))
+    for param in ['undercut', 'min_margin']:
+        policy[param] = np.rint(policy[param] * KOBO).astype(np.int64)
+    return policy
+
+
+# --- FRAME CACHE ---
+# load_cached() keeps each catalog, parsed, normalized and cut down to what aggregate()
+# needs, in a FrameCache under a hash of its raw content. Bump NORMALIZE_VERSION whenever
+# a parser or normalizer changes what it produces, so older entries stop matching.
+NORMALIZE_VERSION = 1
+
+def normalize_catalog(df, price_col):
+    # Slot keys and kobo price of a cost or default catalog (added in place)
+    df['Norm_Size'] = compact_sizes(normalize_size_vec(df['Plan Size']))
+    df['Norm_Valid'] = compact_days(normalize_validity_vec(df['Validity_Type']))
+    df[price_col] = to_kobo(clean_price_vec(df['Price']))
+    return df
+
+def source_digest(source, default_csv, hash_file=file_digest):
+    # Content hash of an input as read_source() would see it, and the input to read from
+    # (a file-like source is consumed here and handed back as a buffer)
+    if isinstance(source, pd.DataFrame):
+        return frame_digest(source), source
+    if source is None:
+        return digest(default_csv), source
+    if isinstance(source, str) and '\n' in source:
+        return digest(source), source
+    if isinstance(source, (str, os.PathLike)):
+        return hash_file(source), source
+    data = source.read()
+    return digest(data), io.StringIO(data) if isinstance(data, str) else io.BytesIO(data)
+
+def _normalizer_id(normalize):
+    # Competitor parsers are partials of module-level functions, see COMPETITOR SOURCES
+    func = getattr(normalize, 'func', normalize)
+    keywords = sorted(getattr(normalize, 'keywords', {}).items())
+    return f"{getattr(func, '__qualname__', repr(func))}{keywords}"
+
+
+# --- PARALLEL EXECUTION ---
+# Every groupby and merge key starts with Network, so partitions never interact.
+
+def _slot_hash(df, keys):
+    # Same slot -> same hash whatever frame (and dtype) it came from
+    keys = pd.DataFrame({'Network': df['Network'].astype(str).astype(object),
+                         'Norm_Size': df['Norm_Size'].astype(float),
+                         'Norm_Valid': df['Norm_Valid'].astype(np.int64)})[keys]
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+def _split(df, part_ids, n_parts):
+    return [df[part_ids == i] for i in range(n_parts)]
+
+def _price_partition(settings, cost, default, comps, normalized):
+    # Worker side: run the remaining stages for one partition
+    engine = PricingEngine(**settings)
+    if normalized:
+        engine.df_cost, engine.df_def, engine.df_comps = cost, default, comps
+    else:
+        engine.load(cost, default, competitors={name: frames[0] for name, frames in comps.items()}).normalize().validate()
+    engine.aggregate().merge()
+    return engine.price(), engine.df_failover, engine.anomalies
+
+
+# --- INSTRUMENTATION ---
+
+def _loaded_rows(engine):
+    # None while the competitor catalogs are still unread chunk iterators
+    if engine.df_cost is None or engine.chunksize:
+        return None
+    return len(engine.df_cost) + len(engine.df_def) + sum(len(f) for frames in engine.df_comps.values() for f in frames)
+
+def _priced_rows(engine):
+    return None if engine.df_priced is None else len(engine.df_priced)
+
+def slot_outcomes(df_priced):
+    # Why slots did or didn't go live
+    codes = df_priced['Status'].cat.codes.to_numpy()
+    no_comp = df_priced['Lowest Competitor'].isna().to_numpy()
+    return {
+        'active': (codes == 0).sum(),
+        'excluded_too_high': (codes == 1).sum(),
+        'unpriced': (codes == 2).sum(),
+        'no_competitor_match': no_comp.sum(),
+        'cost_markup_fallback': (no_comp & df_priced['Def_Price'].isna().to_numpy() & (codes != 2)).sum(),
+    }
+
+def _stage(name, rows_in=None, rows_out=None):
+    # Record wall time, memory and row counts of an engine stage in engine.report
+    def wrap(method):
+        @wraps(method)
+        def run(self, *args, **kwargs):
+            with self.report.stage(name) as record:
+                record['rows_in'] = rows_in(self) if rows_in else None
+                result = method(self, *args, **kwargs)
+                record['rows_out'] = rows_out(self) if rows_out else None
+            return result
+        return run
+    return wrap
+
+
+class PricingEngine:
+    """Repricing pipeline split into explicit stages.
+
+    load -> normalize -> aggregate -> merge -> price -> export
+
+    Nothing runs on construction. A long-lived worker can run the stages up
+    to merge() once and then call price() as often as it likes; price() only
+    reads the merged slot table and never touches the disk.
+    """
+
+    def __init__(self, undercut=UNDERCUT_AMOUNT, chunksize=None, competitors=None, size_tolerance=None, report=None,
+                 rules=None, anomaly_z=None):
+        self.undercut = undercut
+        # Ordered pricing rules (see PRICING RULES), None = one undercut for every slot
+        self.rules = list(rules or [])
+        # Robust z-score threshold for validate() (None = don't validate the catalogs)
+        self.anomaly_z = anomaly_z
+        self.anomalies = []
+        # Per-stage timings, row counts and slot outcomes (see run_report.py)
+        self.report = report if report is not None else RunReport()
+        # Relative size gap allowed when matching competitor plans (None = exact sizes only)
+        self.size_tolerance = size_tolerance
+        # Rows per chunk when streaming the competitor catalogs (None = load them whole)
+        self.chunksize = chunksize
+        # Competitor adapters to price against (default: everything registered)
+        self.competitors = dict(competitors if competitors is not None else COMPETITOR_SOURCES)
+        self.comp_columns = [source.column for source in self.competitors.values()]
+        self.df_cost = None
+        self.df_failover = None
+        self.df_def = None
+        self.df_comps = {}
+        self.df_master = None
+        self.df_priced = None
+
+    # -- STAGE 1: LOAD --
+    @_stage('load', rows_out=_loaded_rows)
+    def load(self, cost=None, default=None, comp1=None, comp2=None, competitors=None, suppliers=None):
+        # `competitors` maps a source name to its input; comp1/comp2 are shorthands
+        # for the two built-in sources. Sources without input or raw_data are skipped.
+        # `suppliers` maps a supplier name to its cost catalog; `cost` is the DEFAULT_SUPPLIER
+        # one, used when given or when there are no other suppliers.
+        inputs = competitor_inputs(self.competitors, comp1, comp2, competitors)
+        suppliers = dict(suppliers or {})
+        if cost is not None or not suppliers:
+            suppliers = {DEFAULT_SUPPLIER: cost, **suppliers}
+        self.df_cost = supplier_catalog(suppliers)
+        self.df_def = read_source(default, raw_default_data)
+        self.df_comps = {}
+        for name, source in self.competitors.items():
+            if inputs.get(name) is None and source.raw_data is None:
+                continue
+            frames = read_source(inputs.get(name), source.raw_data, self.chunksize)
+            self.df_comps[name] = frames if self.chunksize else [frames]
+        return self
+
+    # -- STAGE 2: NORMALIZE --
+    @_stage('normalize', _loaded_rows, _loaded_rows)
+    def normalize(self):
+        normalize_catalog(self.df_cost, 'Clean_Price')
+        normalize_catalog(self.df_def, 'Def_Price')
+
+        # In streaming mode the competitor catalogs are chunk iterators, so map() keeps this lazy
+        for name, frames in self.df_comps.items():
+            normalized = map(self.competitors[name].normalize, frames)
+            self.df_comps[name] = normalized if self.chunksize else list(normalized)
+        return self
+
+    # -- STAGES 1-2 THROUGH THE FRAME CACHE --
+    @_stage('load', rows_out=_loaded_rows)
+    def load_cached(self, cache, cost=None, default=None, comp1=None, comp2=None, competitors=None, suppliers=None):
+        # Same inputs as load(), but each catalog comes out of `cache` (a FrameCache) when its
+        # content was seen before, and only the others are parsed and normalized. The cached
+        # frames are already cut down to what aggregate() needs: a cost catalog's cheapest plan
+        # per slot, the Default rows' slot and price, a competitor's lowest price per slot.
+        # Carry on with aggregate().
+        if self.anomaly_z is not None:
+            raise ValueError("validate() needs every catalog row, it can't run on cached frames")
+        inputs = competitor_inputs(self.competitors, comp1, comp2, competitors)
+        suppliers = dict(suppliers or {})
+        if cost is not None or not suppliers:
+            suppliers = {DEFAULT_SUPPLIER: cost, **suppliers}
+
+        def cached(kind, source, default_csv, build):
+            content, source = source_digest(source, default_csv, cache.file_digest)
+            key = cache.key(NORMALIZE_VERSION, kind, content)
+            df = cache.get(key)
+            return df if df is not None else cache.put(key, build(source))
+
+        self.df_cost = tag_suppliers({
+            name: cached('cost', source, raw_cost_data,
+                         lambda src: catalog_offers(normalize_catalog(read_source(src, raw_cost_data), 'Clean_Price')))
+            for name, source in suppliers.items()})
+        self.df_def = cached('default', default, raw_default_data,
+                             lambda src: normalize_catalog(read_source(src, raw_default_data),
+                                                           'Def_Price')[SLOT_KEYS + ['Def_Price']])
+        self.df_comps = {}
+        for name, source in self.competitors.items():
+            if inputs.get(name) is None and source.raw_data is None:
+                continue
+            def build(src, source=source):
+                frames = read_source(src, source.raw_data, self.chunksize)
+                return fold_slot_min(map(source.normalize, frames if self.chunksize else [frames]), 'Comp_Price')
+            self.df_comps[name] = [cached(_normalizer_id(source.normalize), inputs.get(name), source.raw_data, build)]
+        return self
+
+    # -- STAGE 2b: VALIDATE --
+    @_stage('validate', _loaded_rows, _loaded_rows)
+    def validate(self, z=None):
+        # Flag suspicious rows of every catalog into self.anomalies (see CATALOG VALIDATION) and
+        # quarantine the flagged competitor rows. Does nothing without a threshold, here or as
+        # anomaly_z.
+        z = self.anomaly_z if z is None else z
+        if z is None:
+            return self
+        if self.chunksize:
+            raise ValueError("validate() needs whole catalogs to compare against, it can't be combined with chunksize")
+        networks = {}
+        catalogs = [('cost', self.df_cost, 'Clean_Price'), ('default', self.df_def, 'Def_Price')]
+        catalogs += [(name, frames[0], 'Comp_Price') for name, frames in self.df_comps.items()]
+        keys = [catalog_keys(frame, price_col, networks) for _, frame, price_col in catalogs]
+        stats = unit_price_stats(np.concatenate([groups for groups, _ in keys]),
+                                 np.concatenate([units for _, units in keys]))
+        self.anomalies = []
+        for (name, frame, price_col), frame_keys in zip(catalogs, keys):
+            checked = self._check(name, frame, price_col, frame_keys, stats, z, quarantine=name in self.df_comps)
+            if name in self.df_comps:
+                self.df_comps[name] = [checked]
+        return self
+
+    def _check(self, name, frame, price_col, keys, stats, z, quarantine):
+        flags, robust_z = anomaly_flags(*keys, frame, stats, z)
+        if flags.any():
+            self.anomalies.append(anomaly_rows(name, frame, price_col, keys[1], flags, robust_z, quarantine))
+        return frame[flags == 0] if quarantine else frame
+
+    def anomaly_frame(self):
+        if not self.anomalies:
+            return pd.DataFrame(columns=ANOMALY_COLUMNS)
+        df = pd.concat(self.anomalies, ignore_index=True)
+        df['Catalog'] = pd.Categorical(df['Catalog'], categories=['cost', 'default'] + list(self.competitors))
+        return df.sort_values(['Catalog', 'Row'], kind='stable', ignore_index=True)
+
+    # -- STAGE 3: AGGREGATE --
+    @_stage('aggregate', _loaded_rows, lambda e: len(e.df_cost_agg) + len(e.df_comp_long))
+    def aggregate(self):
+        # Group by Network, Size, Validity -> Select Lowest Cost Plan (across suppliers)
+        self.df_cost_agg, self.df_failover = cheapest_suppliers(self.df_cost)
+        # Min price per slot per competitor, in one pass over all sources
+        self.df_comp_long = competitor_long(self.df_comps, stream=bool(self.chunksize))
+        if self.chunksize:
+            # The chunk iterators are spent, don't hold on to them
+            self.df_comps = {}
+        return self
+
+    # -- STAGE 4: MERGE --
+    @_stage('merge', lambda e: len(e.df_cost_agg), lambda e: len(e.df_master))
+    def merge(self):
+        # Merge Default Price
+        df_master = pd.merge(self.df_cost_agg, self.df_def[SLOT_KEYS + ['Def_Price']], on=SLOT_KEYS, how='left')
+        # Apply the swap logic
+        df_master['Clean_Price'], df_master['Def_Price'] = swap_prices_vec(df_master['Clean_Price'], df_master['Def_Price'])
+        # Merge Competitors (exact sizes, or nearest size within size_tolerance)
+        names = list(self.competitors)
+        if self.size_tolerance:
+            comp_agg = match_nearest_sizes(df_master, self.df_comp_long, names, self.size_tolerance)
+        else:
+            comp_agg = pivot_competitors(self.df_comp_long, names)
+            comp_agg['Match_Distance'] = np.where(comp_agg[names].notna().any(axis=1), 0.0, np.nan)
+        self.df_comp_agg = comp_agg.rename(columns={name: s.column for name, s in self.competitors.items()})
+        df_master = pd.merge(df_master, self.df_comp_agg, on=SLOT_KEYS, how='left')
+        self.df_master = df_master
+        return self
+
+    # -- STAGE 5: PRICE --
+    @_stage('price', lambda e: None if e.df_master is None else len(e.df_master), _priced_rows)
+    def price(self, undercut=None):
+        if self.df_master is None:
+            raise RuntimeError("price() needs merge() to have run first")
+        if undercut is None:
+            undercut = self.undercut
+        df = pd.concat([self.df_master, calculate_final_vec(self.df_master, self.comp_columns, undercut,
+                                                            self.policy(self.df_master, undercut))], axis=1)
+        self.df_priced = df
+        self._record_outcomes()
+        return df
+
+    # -- STAGE 5b: INCREMENTAL PRICE --
+    @_stage('reprice', lambda e: len(e.df_master), _priced_rows)
+    def reprice(self, snapshot, undercut=None):
+        # Recompute only the slots whose cost, default or competitor inputs changed since
+        # `snapshot` (see save_snapshot); everything else keeps last run's outputs.
+        # Returns the priced frame and a boolean mask of the recomputed rows.
+        # Only the pricing kernel is skipped: load, normalize and merge have run in full by
+        # now (with a FrameCache, unchanged catalogs at least aren't parsed again), so the
+        # saving is mostly downstream, in the small delta that gets written and uploaded.
+        if undercut is None:
+            undercut = self.undercut
+        if (snapshot is None or snapshot.attrs.get('undercut') != undercut
+                or snapshot.attrs.get('rules', []) != rules_spec(self.rules)):
+            df = self.price(undercut)
+            return df, np.ones(len(df), dtype=bool)
+
+        df = self.df_master.copy(deep=False)
+        changed, merged = changed_slots(df, snapshot, self.comp_columns)
+        keys = SLOT_KEYS + ['Slot_Row']
+        previous = pd.merge(merged[keys], _slot_rows(snapshot)[keys + SNAPSHOT_OUTPUTS], on=keys, how='left')
+
+        final = pd.array(previous['Final Selling Price'], dtype='Int64').copy()
+        status = pd.Categorical(previous['Status'], categories=STATUS_LABELS).codes.astype(np.int8)
+        min_comp = pd.array(previous['Lowest Competitor'], dtype='Int64').copy()
+        if changed.any():
+            sub = df[changed]
+            final[changed], status[changed], min_comp[changed] = price_kernel(
+                sub['Clean_Price'].array, sub['Def_Price'].array,
+                [sub[c].array for c in self.comp_columns], undercut, self.policy(sub, undercut))
+
+        df['Final Selling Price'] = final
+        df['Status'] = pd.Categorical.from_codes(status, dtype=STATUS_DTYPE)
+        df['Lowest Competitor'] = min_comp
+        self.df_priced = df
+        self._record_outcomes()
+        return df, changed
+
+    def policy(self, slots, undercut=None):
+        # Per-slot rule parameters for price_kernel, None when there are no rules
+        if not self.rules:
+            return None
+        return rule_policy(self.rules, slots, self.undercut if undercut is None else undercut)
+
+    # -- WHAT-IF: many policies over the merged slots, df_priced is left alone --
+    @_stage('what_if', lambda e: None if e.df_master is None else len(e.df_master))
+    def what_if(self, scenarios, volumes=None):
+        if self.df_master is None:
+            raise RuntimeError("what_if() needs merge() to have run first")
+        return evaluate_scenarios(self.df_master, self.comp_columns, scenarios, volumes)
+
+    def _record_outcomes(self):
+        for name, value in slot_outcomes(self.df_priced).items():
+            self.report.count(name, value)
+
+    def final_frame(self, df_priced=None, active_only=True):
+        if df_priced is None:
+            df_priced = self.df_priced
+        # Sort, select, rename and keep only Active plans
+        df_final = df_priced.sort_values(['Network', 'Norm_Valid', 'Clean_Price'])[OUTPUT_COLUMNS]
+        # Export edge: kobo back to naira
+        df_final = df_final.assign(**{col: from_kobo(df_final[col]) for col in MONEY_COLUMNS})
+        df_final.columns = FINAL_COLUMNS
+        if not active_only:
+            return df_final
+        return df_final[df_final['Status'] == 'Active']
+
+    def payload_frame(self, df_final=None):
+        return payload_frame(self.final_frame() if df_final is None else df_final)
+
+    def db_payload(self, df_final=None):
+        # The payload as a list of dicts, for callers that need it all at once
+        return self.payload_frame(df_final).to_dict('records')
+
+    # -- STAGE 6: EXPORT --
+    @_stage('export', _priced_rows, lambda e: e.report.counters.get('active'))
+    def export(self, out_dir=".", ndjson=False):
+        df_final = self.final_frame()
+        paths = {
+            'csv': os.path.join(out_dir, CSV_FILE),
+            'json': os.path.join(out_dir, JSON_FILE),
+            'csv_db': os.path.join(out_dir, CSV_DB_FILE),
+            'json_db': os.path.join(out_dir, JSON_DB_FILE),
+        }
+        df_final.to_csv(paths['csv'], index=False)
+        # orient='records' creates a list of dictionaries: [{}, {}, {}]
+        df_final.to_json(paths['json'], orient='records', indent=4)
+
+        payload = payload_frame(df_final)
+        payload.to_csv(paths['csv_db'], index=False, chunksize=EXPORT_CHUNK)
+        # Output JSON to file (Keep this as backup)
+        write_plans_json(payload, paths['json_db'])
+        if ndjson:
+            paths['ndjson_db'] = os.path.join(out_dir, NDJSON_DB_FILE)
+            write_plans_ndjson(payload, paths['ndjson_db'])
+        if self.df_failover is not None and len(self.df_failover):
+            paths['failover'] = self.export_failover(out_dir)
+        if self.anomalies:
+            paths['anomalies'] = os.path.join(out_dir, ANOMALY_FILE)
+            self.anomaly_frame().to_csv(paths['anomalies'], index=False)
+        return paths
+
+    def export_failover(self, out_dir="."):
+        # Alternate supplier plans per slot, best first, with their cost in naira
+        df = self.df_failover.assign(Clean_Price=from_kobo(self.df_failover['Clean_Price']))
+        path = os.path.join(out_dir, FAILOVER_FILE)
+        df.rename(columns={'Clean_Price': 'Cost'}).to_csv(path, index=False)
+        return path
+
+    def record_history(self, root=HISTORY_DIR, when=None):
+        # Append this run's priced slots to the price history store (see price_history.py)
+        return PriceHistory(root).append(self.df_priced, self.comp_columns, when)
+
+    def index_plans(self):
+        # Every priced plan, excluded ones too, as db_payload dicts plus validity days and
+        # status. Active rows go last so they win over an excluded row with the same plan_id.
+        df_all = self.final_frame(active_only=False)
+        days = self.df_priced.loc[df_all.index, 'Norm_Valid'].to_numpy()
+        plans = [dict(plan, validity_days=int(d), status=status)
+                 for plan, d, status in zip(self.db_payload(df_all), days, df_all['Status'].astype(str))]
+        return sorted(plans, key=lambda plan: plan['status'] == 'Active')
+
+    def export_index(self, out_dir="."):
+        # Binary plan_id index for zero-parse lookups (see price_index.py)
+        return write_index(self.index_plans(), os.path.join(out_dir, INDEX_FILE))
+
+    def export_shards(self, out_dir="."):
+        return write_shards(self.db_payload(), out_dir)
+
+    def upload(self, db_url, table='data_plans', rows=None, deactivate=()):
+        # Upsert the active plans and delete every other one, or just upsert `rows` and delete
+        # the plan_ids in `deactivate` (a delta). Returns (rows upserted, plans deleted).
+        from plan_loader import connect_loader
+        loader = connect_loader(db_url, table)
+        if rows is None:
+            return loader.upsert(iter_plans(self.payload_frame()), prune=True)
+        return loader.upsert(rows, deactivate)
+
+    def export_delta(self, snapshot, out_dir="."):
+        # Write only what changed since `snapshot` as plans_delta.json
+        previous_payload = self.db_payload(self.final_frame(snapshot)) if snapshot is not None else []
+        delta = plan_delta(previous_payload, self.db_payload())
+        path = os.path.join(out_dir, DELTA_FILE)
+        plans = {key: [{k: json_safe(v) for k, v in plan.items()} for plan in delta[key]]
+                 for key in ['inserted', 'updated']}
+        with open(path, 'w') as f:
+            json.dump(dict(delta, **plans), f, indent=2, allow_nan=False)
+        return path, delta
+
+    @_stage('parallel', rows_out=_priced_rows)
+    def run_parallel(self, cost=None, default=None, comp1=None, comp2=None, competitors=None,
+                     workers=None, partition='network', suppliers=None):
+        # Same result as run(), with the inputs split into independent partitions that are
+        # normalized, aggregated, merged and priced on a process pool.
+        #   partition='network': one task per network (raw rows are split, workers normalize)
+        #   partition='slot':    normalize here, then hash slot keys into `workers` partitions
+        if self.chunksize:
+            raise ValueError("run_parallel() loads whole catalogs, it can't be combined with chunksize")
+        workers = workers or os.cpu_count()
+        self.load(cost, default, comp1, comp2, competitors, suppliers)
+        frames = [self.df_cost, self.df_def] + [self.df_comps[name][0] for name in self.df_comps]
+
+        if partition == 'network':
+            networks = sorted(set().union(*(frame['Network'].astype(str) for frame in frames)))
+            n_parts = len(networks)
+            part_of = lambda df: df['Network'].astype(str).map({net: i for i, net in enumerate(networks)}).to_numpy()
+        elif partition == 'slot':
+            # Validation statistics need every row of a network, so they're done before the split
+            self.normalize().validate()
+            frames = [self.df_cost, self.df_def] + [self.df_comps[name][0] for name in self.df_comps]
+            n_parts = workers
+            # Nearest-size matching looks across sizes, so only hash on what it can't cross
+            keys = ['Network', 'Norm_Valid'] if self.size_tolerance else SLOT_KEYS
+            part_of = lambda df: _slot_hash(df, keys) % n_parts
+        else:
+            raise ValueError(f"unknown partition {partition!r}, expected 'network' or 'slot'")
+
+        parts = [_split(frame, part_of(frame), n_parts) for frame in frames]
+        settings = {'undercut': self.undercut, 'competitors': self.competitors, 'size_tolerance': self.size_tolerance,
+                    'rules': self.rules, 'anomaly_z': self.anomaly_z}
+        tasks = []
+        for i in range(n_parts):
+            comps = {name: [parts[2 + j][i]] for j, name in enumerate(self.df_comps)}
+            tasks.append((settings, parts[0][i], parts[1][i], comps, partition == 'slot'))
+
+        with ProcessPoolExecutor(max_workers=min(workers, n_parts) or 1) as pool:
+            results = list(pool.map(_price_partition, *zip(*tasks)))
+
+        # Put the slots back in the order a single-process run produces
+        priced, failover, anomalies = zip(*results)
+        if partition == 'network':
+            self.anomalies = [frame for frames in anomalies for frame in frames]
+        self.df_failover = pd.concat(failover, ignore_index=True).sort_values(
+            SLOT_KEYS + ['Failover_Rank'], kind='stable', ignore_index=True)
+        df = pd.concat(priced, ignore_index=True).sort_values(SLOT_KEYS, kind='stable', ignore_index=True)
+        self.df_master = df.drop(columns=SNAPSHOT_OUTPUTS)
+        self.df_priced = df
+        self._record_outcomes()
+        return df
+
+    def run(self, cost=None, default=None, comp1=None, comp2=None, competitors=None, suppliers=None):
+        self.load(cost, default, comp1, comp2, competitors, suppliers).normalize().validate().aggregate().merge()
+        return self.price()
 
 # ==========================================
-# 6. EXPORT FOR SUPABASE/FRONTEND
+# 5. COMMAND LINE
 # ==========================================
 
-def map_network_to_id(network_name):
-    name = network_name.upper()
-    if 'MTN' in name: return 1
-    if 'GLO' in name: return 2
-    if 'AIRTEL' in name: return 3
-    if 'MOBILE' in name: return 4
-    if 'SMILE' in name: return 5
-    return 0
+def write_report(report, args):
+    if args.report:
+        print(f"📊 Run report saved to: {report.write_json(args.report)}")
+    if args.prometheus:
+        print(f"📊 Prometheus metrics saved to: {report.write_prometheus(args.prometheus)}")
 
-# ... (Keep everything up to the loop in Section 6)
-
-# Prepare list for JSON/CSV export
-db_payload = []
-
-for index, row in df_final.iterrows():
-    plan = {
-        "network_id": map_network_to_id(row['Network']),
-        "plan_id": str(row['Plan_ID']),
-        "network_name": row['Network'],
-        "plan_type": "ALL", 
-        "plan_name": f"{row['Size']}GB - {row['Type_Validity']}",
-        "amount": int(row['Final_Price']),
-        "cost_price": float(row['Cost_Price']),
-        "validity": str(row['Type_Validity'])
-    }
-    db_payload.append(plan)
 
-# --- NEW: SAVE AS CSV FOR SUPABASE ---
-df_db = pd.DataFrame(db_payload)
-csv_db_file = "plans_for_supabase.csv"
-df_db.to_csv(csv_db_file, index=False)
+def record_history(engine, args):
+    if args.history:
+        rows = engine.record_history(args.history)
+        print(f"🗃️ Appended {rows} rows to the price history in: {args.history}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reprice data plans against competitor catalogs.")
+    parser.add_argument('--cost', help="API provider cost CSV (default: embedded sample)")
+    parser.add_argument('--supplier', action='append', default=[], metavar='NAME=CSV',
+                        help="Cost CSV of another supplier to buy from (repeatable, cheapest per slot wins)")
+    parser.add_argument('--default', help="API provider default selling CSV")
+    parser.add_argument('--comp1', help="Competitor 1 (ClubKonnect) CSV")
+    parser.add_argument('--comp2', help="Competitor 2 (AimToGet) CSV")
+    parser.add_argument('--competitor', action='append', default=[], metavar='NAME=CSV',
+                        help="CSV for a registered competitor source (repeatable)")
+    parser.add_argument('--feeds', help='JSON list of {"name", "url"[, "adapter", ...]} competitor feeds to fetch '
+                                        'before pricing (see price_collector.py)')
+    parser.add_argument('--undercut', type=float, default=UNDERCUT_AMOUNT, help="How much to beat the competitor by (₦)")
+    parser.add_argument('--rules', help="JSON list of pricing rules (per-slot undercut and margin floor)")
+    parser.add_argument('--validate', nargs='?', type=float, const=ANOMALY_Z, metavar='Z',
+                        help=f"Flag catalog anomalies into {ANOMALY_FILE} and quarantine flagged competitor rows "
+                             f"(robust z threshold, default {ANOMALY_Z})")
+    parser.add_argument('--size-tolerance', type=float,
+                        help="Match competitor sizes within this relative gap, e.g. 0.05 for 5%%")
+    parser.add_argument('--chunksize', type=int, help="Stream competitor CSVs in chunks of this many rows")
+    parser.add_argument('--workers', type=int, help="Reprice on a process pool with this many workers")
+    parser.add_argument('--partition', choices=['network', 'slot'], default='network',
+                        help="How to split the work with --workers")
+    parser.add_argument('--out-dir', default=".", help="Directory to write the output files to")
+    parser.add_argument('--cache', nargs='?', const=CACHE_DIR, metavar='DIR',
+                        help=f"Reuse parsed and normalized catalogs from this cache (default dir: {CACHE_DIR}/)")
+    parser.add_argument('--cache-mb', type=int, default=CACHE_BYTES >> 20, help="Size limit of the --cache directory")
+    parser.add_argument('--ndjson', action='store_true', help=f"Also write the payload as {NDJSON_DB_FILE}")
+    parser.add_argument('--shards', action='store_true',
+                        help=f"Also write per-network minified/compressed shards and a manifest to {SHARD_DIR}/")
+    parser.add_argument('--index', action='store_true', help=f"Also write the binary plan_id index {INDEX_FILE}")
+    parser.add_argument('--db-url', help="Upsert the plans into this database (postgresql://... or sqlite:///path)")
+    parser.add_argument('--db-table', default='data_plans', help="Table to upsert into with --db-url")
+    parser.add_argument('--report', help="Write a JSON run report (stage timings, row counts, slot outcomes)")
+    parser.add_argument('--prometheus', help="Write the run report as a Prometheus textfile")
+    parser.add_argument('--memory', action='store_true', help="Track peak memory per stage (slower)")
+    parser.add_argument('--profile', action='append', default=[], metavar='STAGE',
+                        help="cProfile this stage into profiles/STAGE.prof (repeatable)")
+    parser.add_argument('--snapshot', help=f"Reprice incrementally against this snapshot and write {DELTA_FILE}")
+    parser.add_argument('--history', nargs='?', const=HISTORY_DIR, metavar='DIR',
+                        help=f"Append this run's prices to the history store (default dir: {HISTORY_DIR}/)")
+    parser.add_argument('--scenarios', help=f"Evaluate the what-if policies in this JSON file into {SCENARIO_FILE}")
+    parser.add_argument('--delta-only', action='store_true', help="With --snapshot, skip the full CSV/JSON exports")
+    args = parser.parse_args(argv)
+    if args.cache and (args.workers or args.validate is not None):
+        parser.error("--cache keeps reduced catalogs, it can't be combined with --workers or --validate")
+
+    feeds = None
+    if args.feeds:
+        # Feeds that declare an adapter become competitor sources before the engine is built
+        from price_collector import load_feeds
+        try:
+            feeds = register_feeds(load_feeds(args.feeds))
+        except ValueError as error:
+            parser.error(f"--feeds: {error}")
+
+    report = RunReport(memory=args.memory, profile=args.profile)
+    engine = PricingEngine(undercut=args.undercut, chunksize=args.chunksize, size_tolerance=args.size_tolerance,
+                           report=report, rules=load_rules(args.rules) if args.rules else None, anomaly_z=args.validate)
+    competitors = dict(item.split('=', 1) for item in args.competitor)
+    unknown = sorted(set(competitors) - set(engine.competitors))
+    if unknown:
+        parser.error(f"--competitor: unknown source(s) {unknown}, registered: {sorted(engine.competitors)}")
+    suppliers = dict(item.split('=', 1) for item in args.supplier)
+    if feeds:
+        from price_collector import collect
+        collected, failures = collect(feeds)
+        for failure in failures.values():
+            print(f"⚠️ Feed {failure}")
+        # A feed left out is priced without, never from the embedded sample
+        for name in {feed.name for feed in feeds} - set(collected):
+            engine.competitors[name] = engine.competitors[name]._replace(raw_data=None)
+        competitors.update(collected)
+    if args.workers:
+        engine.run_parallel(args.cost, args.default, args.comp1, args.comp2, competitors,
+                            workers=args.workers, partition=args.partition, suppliers=suppliers)
+    elif args.cache:
+        cache = FrameCache(args.cache, args.cache_mb << 20)
+        engine.load_cached(cache, args.cost, args.default, args.comp1, args.comp2, competitors,
+                           suppliers).aggregate().merge()
+        print(f"🗂️ Frame cache: {cache.hits} hits, {cache.misses} misses")
+    else:
+        engine.load(args.cost, args.default, args.comp1, args.comp2, competitors,
+                    suppliers).normalize().validate().aggregate().merge()
+
+    if args.scenarios:
+        scenario_path = os.path.join(args.out_dir, SCENARIO_FILE)
+        engine.what_if(load_scenarios(args.scenarios)).to_csv(scenario_path)
+        print(f"🧪 What-if results saved to: {scenario_path}")
+
+    if args.snapshot:
+        snapshot = load_snapshot(args.snapshot)
+        _, changed = engine.reprice(snapshot)
+        delta_path, delta = engine.export_delta(snapshot, args.out_dir)
+        save_snapshot(engine.df_priced, args.snapshot, engine.undercut, engine.comp_columns, engine.rules)
+        print(f"🔁 Repriced {changed.sum()} of {len(changed)} slots")
+        record_history(engine, args)
+        print(f"📄 Delta saved to: {delta_path} "
+              f"({len(delta['inserted'])} inserted, {len(delta['updated'])} updated, {len(delta['deactivated'])} deactivated)")
+        if args.db_url:
+            count, removed = engine.upload(args.db_url, args.db_table, delta['inserted'] + delta['updated'],
+                                           delta['deactivated'])
+            print(f"🗄️ Upserted {count} changed plans into {args.db_table}, removed {removed} dropped plans")
+        if args.delta_only:
+            write_report(report, args)
+            return 0
+    elif not args.workers:
+        engine.price()
+    if not args.snapshot:
+        record_history(engine, args)
+    paths = engine.export(args.out_dir, ndjson=args.ndjson)
+    if args.shards:
+        manifest_path, manifest = engine.export_shards(args.out_dir)
+        print(f"📦 {len(manifest)} network shards, manifest saved to: {manifest_path}")
+    if args.index:
+        print(f"📇 Binary price index saved to: {engine.export_index(args.out_dir)}")
+
+    # PRINT SUMMARY TO TERMINAL
+    print("-" * 30)
+    print(f"✅ Success!")
+    print(f"📄 CSV saved to: {paths['csv']}")
+    print(f"📄 General JSON saved to: {paths['json']}")
+    if engine.report.counters.get('unpriced'):
+        print(f"⚠️ {engine.report.counters['unpriced']} plans have no cost, default or competitor price: "
+              f"left out as Unpriced")
+    print("-" * 30)
+
+    # Optional: Print first 2 JSON objects to terminal for verification
+    json_preview = engine.final_frame().head(2).to_json(orient='records', indent=4)
+    print("JSON Preview:")
+    print(json_preview)
+
+    print(f"\n✅ [Done] Supabase CSV generated: '{paths['csv_db']}'")
+    if args.db_url and not args.snapshot:
+        count, removed = engine.upload(args.db_url, args.db_table)
+        print(f"🗄️ Upserted {count} plans into {args.db_table}, removed {removed} that are no longer sold")
+    elif not args.db_url:
+        print(f"👉 Please upload '{paths['csv_db']}' to your Supabase table.")
+    write_report(report, args)
+    return 0
 
-# Output JSON to file (Keep this as backup)
-json_db_file = "plans_for_db.json"
-with open(json_db_file, 'w') as f:
-    json.dump(db_payload, f, indent=2)
 
-print(f"\n✅ [Done] Supabase CSV generated: '{csv_db_file}'")
-print(f"👉 Please upload '{csv_db_file}' to your Supabase table.")
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+import asyncio
+import hashlib
+import json
+import os
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# ==========================================
+# Async competitor price collector
+# ==========================================
+# Fetches every competitor feed concurrently (capped per host), with timeouts,
+# retries and ETag / If-Modified-Since revalidation against an on-disk cache,
+# so an unchanged page costs one 304 round trip. The result maps each feed
+# name to its CSV text, ready for PricingEngine.load(competitors=...).
+#
+# One feed failing doesn't stop the sweep: a feed that can't be fetched is served
+# from its last cached body (stale), or left out when there is none, and either
+# way it is listed in `failures`.
+#
+#   feeds = [CompetitorFeed('ClubKonnect', 'https://example.com/prices.csv')]
+#   collected, failures = collect(feeds)
+#   engine.run(competitors=collected)
+#
+# A feed for a reseller that isn't a registered competitor source says which
+# parser reads it, and phyton.register_feeds() registers it before the engine is
+# built:
+#
+#   {"name": "SmeDataHub", "url": "https://...", "adapter": "structured",
+#    "column": "SmeDataHub_Price", "size_col": "Size", "validity_col": "Duration", "price_col": "Amount"}
+#
+# Adapters are the two in phyton.py (see COMPETITOR SOURCES), each with its
+# column arguments; leave any out to use the parser's defaults.
+
+# `parse` optionally turns the response body (bytes) into CSV text or a DataFrame.
+# `adapter` is None for a registered source, else {'kind': ..., 'column': ..., '<x>_col': ...}.
+CompetitorFeed = namedtuple('CompetitorFeed', ['name', 'url', 'parse', 'adapter'], defaults=[None, None])
+
+# Adapter kind -> the column arguments its parser takes
+ADAPTERS = {'free_text': ['text_col', 'price_col'], 'structured': ['size_col', 'validity_col', 'price_col']}
+
+CACHE_DIR = ".collector_cache"
+USER_AGENT = "naijaconnects-pricing/1.0"
+
+
+class FetchError(Exception):
+    pass
+
+
+class PriceCollector:
+    def __init__(self, cache_dir=CACHE_DIR, per_host=4, timeout=10.0, retries=3, backoff=0.5, max_threads=32):
+        self.cache_dir = cache_dir
+        self.per_host = per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_threads = max_threads
+        self.stats = {'fetched': 0, 'not_modified': 0, 'retries': 0, 'stale': 0, 'failed': 0}
+        # Feed name -> what went wrong in the last sweep
+        self.failures = {}
+        self._host_limits = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # -- cache: one body file + one metadata file per URL --
+    def _cache_paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key + '.body'), os.path.join(self.cache_dir, key + '.json')
+
+    def _cached(self, url):
+        body_path, meta_path = self._cache_paths(url)
+        if not (os.path.exists(body_path) and os.path.exists(meta_path)):
+            return None, {}
+        with open(meta_path) as f:
+            meta = json.load(f)
+        with open(body_path, 'rb') as f:
+            return f.read(), meta
+
+    def _store(self, url, body, headers):
+        body_path, meta_path = self._cache_paths(url)
+        meta = {'etag': headers.get('ETag'), 'last_modified': headers.get('Last-Modified')}
+        with open(body_path, 'wb') as f:
+            f.write(body)
+        with open(meta_path, 'w') as f:
+            json.dump(meta, f)
+
+    # -- blocking request, run on the thread pool --
+    def _request(self, url, meta):
+        headers = {'User-Agent': USER_AGENT}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, response.read(), response.headers
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return 304, b'', e.headers
+            raise
+
+    async def _download(self, feed, executor, meta):
+        # (status, body, headers), retrying timeouts and server errors
+        host = urllib.parse.urlsplit(feed.url).netloc
+        limit = self._host_limits.setdefault(host, asyncio.Semaphore(self.per_host))
+        loop = asyncio.get_running_loop()
+
+        async with limit:
+            for attempt in range(self.retries + 1):
+                try:
+                    return await asyncio.wait_for(
+                        loop.run_in_executor(executor, self._request, feed.url, meta), self.timeout)
+                except (urllib.error.URLError, OSError, asyncio.TimeoutError) as e:
+                    # Client errors won't get better by retrying
+                    if isinstance(e, urllib.error.HTTPError) and e.code < 500 and e.code != 429:
+                        raise FetchError(f"{feed.name}: HTTP {e.code} from {feed.url}") from e
+                    if attempt == self.retries:
+                        raise FetchError(f"{feed.name}: giving up on {feed.url} after {attempt + 1} tries") from e
+                    self.stats['retries'] += 1
+                    await asyncio.sleep(self.backoff * 2 ** attempt)
+
+    async def fetch(self, feed, executor):
+        cached_body, meta = self._cached(feed.url)
+        try:
+            status, body, headers = await self._download(feed, executor, meta if cached_body is not None else {})
+        except FetchError as error:
+            if cached_body is None:
+                raise
+            # Last known prices beat no prices; the failure is still reported
+            self.failures[feed.name] = f"{error}, using the cached copy"
+            self.stats['stale'] += 1
+            status = None
+
+        if status is None:
+            body = cached_body
+        elif status == 304:
+            self.stats['not_modified'] += 1
+            body = cached_body
+        else:
+            self.stats['fetched'] += 1
+            self._store(feed.url, body, headers)
+
+        if feed.parse is not None:
+            return feed.parse(body)
+        return body.decode('utf-8')
+
+    async def collect(self, feeds):
+        # Semaphores belong to the event loop they were made on, so each sweep gets its own
+        self._host_limits = {}
+        self.failures = {}
+        with ThreadPoolExecutor(max_workers=self.max_threads) as executor:
+            results = await asyncio.gather(*(self.fetch(feed, executor) for feed in feeds), return_exceptions=True)
+        collected = {}
+        for feed, result in zip(feeds, results):
+            if isinstance(result, Exception):
+                # Down, or its body doesn't parse: price without this feed
+                self.failures[feed.name] = str(result) if isinstance(result, FetchError) else f"{feed.name}: {result!r}"
+                self.stats['failed'] += 1
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                collected[feed.name] = result
+        return collected
+
+
+def collect(feeds, **options):
+    """Fetch all feeds and return ({name: csv_text}, {name: failure}) for the feeds that
+    could be read and the ones that failed (served stale or left out). Options go to PriceCollector."""
+    collector = PriceCollector(**options)
+    collected = asyncio.run(collector.collect(feeds))
+    return collected, collector.failures
+
+
+def feed_adapter(item):
+    # The adapter spec of one feeds-file entry, None when it doesn't declare one
+    kind = item.get('adapter')
+    if kind is None:
+        return None
+    if kind not in ADAPTERS:
+        raise ValueError(f"feed {item['name']!r}: unknown adapter {kind!r}, expected one of {sorted(ADAPTERS)}")
+    extra = set(item) - {'name', 'url', 'adapter', 'column'} - set(ADAPTERS[kind])
+    if extra:
+        raise ValueError(f"feed {item['name']!r}: {sorted(extra)} don't go with a {kind} adapter, "
+                         f"expected {ADAPTERS[kind]}")
+    columns = {key: item[key] for key in ADAPTERS[kind] if key in item}
+    return {'kind': kind, 'column': item.get('column', f"{item['name']}_Price"), **columns}
+
+
+def load_feeds(path):
+    # feeds file: [{"name": "ClubKonnect", "url": "https://..."}, {"name": ..., "adapter": ...}, ...]
+    with open(path) as f:
+        return [CompetitorFeed(item['name'], item['url'], adapter=feed_adapter(item)) for item in json.load(f)]
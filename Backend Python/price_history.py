@@ -0,0 +1,233 @@
+import argparse
+import os
+import time
+import urllib.parse
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from pricing_constants import KOBO
+
+# ==========================================
+# Append-only price history
+# ==========================================
+# Every run appends its priced slots (our price, supplier cost, default and
+# competitor prices) as a new immutable part, partitioned by UTC date and network:
+#
+#   history/date=2026-10-17/network=MTN/part-1760688000123456789-42.rows.npy
+#   history/date=2026-10-17/network=MTN/part-1760688000123456789-42.idx.npy
+#
+# rows.npy is one structured array (ts, slot, plan_id, active, cost, default,
+# final, lowest_competitor, one field per competitor) sorted by slot; idx.npy is
+# the per-slot index (slot, start, stop) into it. A query only lists the
+# date/network partitions it asks for, binary-searches each part's index and
+# reads its slice of rows through a memory map.
+#
+#   history = PriceHistory("history")
+#   history.slot_history('MTN', 10.0, 30, days=90)['lowest_competitor'].min()
+#
+# Money is stored as int64 kobo (NA = HISTORY_NA) and returned as naira floats.
+# plan_id is the payload's text of the ID (supplier IDs needn't be numbers) in a
+# fixed-width bytes field, b'' when missing, and comes back as str / NaN.
+# Appending the first run of a day compacts every earlier day that still has more
+# than one part per network (the day before, and any a skipped run left behind), so
+# years of hourly runs still mean one part per day to read.
+
+HISTORY_DIR = "history"
+HISTORY_NA = np.iinfo(np.int64).min
+
+# Engine column -> history field
+MONEY_COLUMNS = {'Clean_Price': 'cost', 'Def_Price': 'default', 'Final Selling Price': 'final',
+                 'Lowest Competitor': 'lowest_competitor'}
+INDEX_DTYPE = np.dtype([('slot', np.int64), ('start', np.int64), ('stop', np.int64)])
+PLAIN_FIELDS = ['ts', 'slot', 'plan_id', 'active']
+
+
+def slot_key(size_gb, validity_days):
+    # Slot within a network as one int64: size in milli-GB and validity in days.
+    # Norm_Size is rounded to 3 decimals, so this is exact.
+    size = np.rint(np.asarray(size_gb, dtype=float) * 1000).astype(np.int64)
+    return size * 65536 + np.clip(np.asarray(validity_days, dtype=np.int64), 0, 65535)
+
+
+def _kobo(series):
+    return pd.array(series, dtype='Int64').to_numpy(dtype=np.int64, na_value=HISTORY_NA)
+
+
+def _plan_ids(series):
+    # IDs as the payload writes them (see payload_frame), UTF-8 in a fixed-width field
+    text = series.astype(str)
+    return np.array([b'' if pd.isna(v) else v.encode('utf-8') for v in text], dtype=bytes)
+
+
+def _utc_day(ts):
+    return datetime.fromtimestamp(int(ts), timezone.utc).strftime('%Y-%m-%d')
+
+
+def _save(path, array):
+    # Write under a dot name, then rename: readers never see half a file
+    tmp = os.path.join(os.path.dirname(path), '.' + os.path.basename(path))
+    with open(tmp, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp, path)
+
+
+def _stack(pieces):
+    # Structured slices (fields may differ between parts) -> one dict of columns
+    names = list(dict.fromkeys(name for piece in pieces for name in piece.dtype.names))
+    columns = {}
+    for name in names:
+        values = [piece[name] if name in piece.dtype.names else np.full(len(piece), HISTORY_NA, dtype=np.int64)
+                  for piece in pieces]
+        if name == 'plan_id':
+            # Parts written before plan_id was text hold it as int64
+            values = [v.astype(str).astype(bytes) if v.dtype.kind == 'i' else v for v in values]
+        columns[name] = np.concatenate(values)
+    return columns
+
+
+class PriceHistory:
+    def __init__(self, root=HISTORY_DIR, auto_compact=True):
+        self.root = root
+        self.auto_compact = auto_compact
+
+    def _network_dir(self, day, network):
+        return os.path.join(self.root, f"date={day}", f"network={urllib.parse.quote(str(network), safe='')}")
+
+    def _parts(self, day, network):
+        # Part paths without the .idx.npy / .rows.npy suffix. A part exists once its
+        # index does, and the index is written after the rows.
+        path = self._network_dir(day, network)
+        if not os.path.isdir(path):
+            return []
+        return [os.path.join(path, name[:-len('.idx.npy')]) for name in sorted(os.listdir(path))
+                if name.startswith('part-') and name.endswith('.idx.npy')]
+
+    def _days(self, start, end):
+        # Only the date partitions inside [start, end]
+        if not os.path.isdir(self.root):
+            return []
+        first, last = _utc_day(start), _utc_day(end)
+        days = [name[len('date='):] for name in os.listdir(self.root) if name.startswith('date=')]
+        return sorted(day for day in days if first <= day <= last)
+
+    # -- writing --
+    def _write_part(self, network_dir, columns):
+        # Sort by slot (then time) and build the per-slot index
+        order = np.lexsort((columns['ts'], columns['slot']))
+        rows = np.empty(len(order), dtype=[(name, values.dtype) for name, values in columns.items()])
+        for name, values in columns.items():
+            rows[name] = values[order]
+        slots, starts = np.unique(rows['slot'], return_index=True)
+        index = np.empty(len(slots), dtype=INDEX_DTYPE)
+        index['slot'], index['start'], index['stop'] = slots, starts, np.append(starts[1:], len(rows))
+
+        os.makedirs(network_dir, exist_ok=True)
+        part = os.path.join(network_dir, f"part-{time.time_ns()}-{os.getpid()}")
+        _save(part + '.rows.npy', rows)
+        _save(part + '.idx.npy', index)
+        return part
+
+    def append(self, df_priced, comp_columns=(), when=None):
+        """Append one run's priced slots. Returns the number of rows written."""
+        ts = int(time.time() if when is None else pd.Timestamp(when).timestamp())
+        day = _utc_day(ts)
+        if self.auto_compact and not os.path.isdir(os.path.join(self.root, f"date={day}")):
+            # Days that are already one part per network are skipped without reading them
+            for earlier in self._days(0, ts - 86400):
+                self.compact(earlier)
+        networks = df_priced['Network'].astype(str).to_numpy()
+        columns = {
+            'ts': np.full(len(df_priced), ts, dtype=np.int64),
+            'slot': slot_key(df_priced['Norm_Size'], df_priced['Norm_Valid']),
+            'plan_id': _plan_ids(df_priced['ID']),
+            'active': (df_priced['Status'].astype(str) == 'Active').to_numpy(),
+        }
+        for col, name in MONEY_COLUMNS.items():
+            columns[name] = _kobo(df_priced[col])
+        for col in comp_columns:
+            columns[col] = _kobo(df_priced[col])
+        for network in np.unique(networks):
+            rows = networks == network
+            self._write_part(self._network_dir(day, network), {name: values[rows] for name, values in columns.items()})
+        return len(df_priced)
+
+    # -- reading --
+    def _read_slot(self, part, key):
+        # Binary search in the part's slot index, then read only that slice
+        index = np.load(part + '.idx.npy')
+        i = np.searchsorted(index['slot'], key)
+        if i == len(index) or index['slot'][i] != key:
+            return None
+        return np.array(np.load(part + '.rows.npy', mmap_mode='r')[index['start'][i]:index['stop'][i]])
+
+    def slot_history(self, network, size_gb, validity_days, start=None, end=None, days=None):
+        """Every recorded row of one slot between start and end (default: the last `days`
+        days, or everything). Money columns come back in naira, NaN where missing."""
+        end = pd.Timestamp.now(tz='UTC') if end is None else pd.Timestamp(end)
+        if start is None:
+            start = end - timedelta(days=days) if days is not None else pd.Timestamp(0, tz='UTC')
+        start, end = pd.Timestamp(start).timestamp(), end.timestamp()
+        key = slot_key(size_gb, validity_days)
+
+        pieces = []
+        for day in self._days(start, end):
+            for part in self._parts(day, network):
+                piece = self._read_slot(part, key)
+                if piece is not None:
+                    pieces.append(piece)
+        if not pieces:
+            return pd.DataFrame(columns=PLAIN_FIELDS + list(MONEY_COLUMNS.values()))
+        df = pd.DataFrame(_stack(pieces))
+        df = df[(df['ts'] >= start) & (df['ts'] <= end)].sort_values('ts', kind='stable', ignore_index=True)
+        plan_ids = np.char.decode(df['plan_id'].to_numpy(dtype=bytes), 'utf-8')
+        df['plan_id'] = pd.Series(plan_ids, index=df.index, dtype=object).replace('', np.nan)
+        for col in df.columns:
+            if col not in PLAIN_FIELDS:
+                values = df[col].to_numpy()
+                df[col] = np.where(values == HISTORY_NA, np.nan, values / KOBO)
+        df['ts'] = pd.to_datetime(df['ts'], unit='s', utc=True)
+        return df
+
+    # -- maintenance --
+    def compact(self, day):
+        """Merge all parts of one date partition into a single part per network."""
+        day_dir = os.path.join(self.root, f"date={day}")
+        merged = 0
+        for network_dir in sorted(os.listdir(day_dir)) if os.path.isdir(day_dir) else []:
+            network = urllib.parse.unquote(network_dir[len('network='):])
+            parts = self._parts(day, network)
+            if len(parts) < 2:
+                continue
+            columns = _stack([np.load(part + '.rows.npy') for part in parts])
+            # The merged part goes in before the old ones go, so a reader racing a
+            # compaction may briefly see rows twice but never loses any
+            self._write_part(self._network_dir(day, network), columns)
+            for part in parts:
+                os.remove(part + '.idx.npy')
+                os.remove(part + '.rows.npy')
+            merged += len(parts)
+        return merged
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query or compact the price history store.")
+    parser.add_argument('--root', default=HISTORY_DIR)
+    parser.add_argument('--compact', metavar='YYYY-MM-DD', help="Merge the parts of this date partition")
+    parser.add_argument('network', nargs='?')
+    parser.add_argument('size', nargs='?', type=float, help="Plan size in GB")
+    parser.add_argument('validity', nargs='?', type=int, help="Validity in days")
+    parser.add_argument('--days', type=int, default=90)
+    args = parser.parse_args(argv)
+
+    history = PriceHistory(args.root)
+    if args.compact:
+        print(f"🗜️ Merged {history.compact(args.compact)} parts")
+    if args.network:
+        df = history.slot_history(args.network, args.size, args.validity, days=args.days)
+        print(df.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import hashlib
+import math
+import mmap
+import os
+import struct
+
+from pricing_constants import KOBO, STATUS_LABELS
+
+# ==========================================
+# Memory-mappable binary price index
+# ==========================================
+# A fixed-layout file a consumer can mmap and query straight away, without
+# parsing the whole catalog first:
+#
+#   header    magic, version, record/key sizes, count, section offsets
+#   keys      (hash64(plan_id), record number) sorted by hash -> binary search
+#   records   fixed-size packed structs, one per plan_id
+#   pool      UTF-8 strings (plan ids, network / plan type / plan / validity names), deduplicated
+#
+#   with PriceIndex("plans.idx") as index:
+#       index.get("366")  # {'plan_id': '366', 'network_id': 1, 'amount': 4365, ...}
+#
+# Only the stdlib is needed to read it (mmap + struct), so a cold reader doesn't
+# pay for importing pandas or NumPy.
+#
+# A plan without a parseable price is indexed too: its amount / cost price is
+# MONEY_NA with the matching FLAGS bit set, and reads back as None.
+
+MAGIC = b'NCPRIDX\x01'
+VERSION = 2
+# magic, version, record size, key size, count, keys / records / pool offsets, pool size
+HEADER = struct.Struct('<8sIIII4xQQQQ')
+# hash of plan_id, record number
+KEY = struct.Struct('<QI4x')
+# amount (₦), cost price (kobo), pool offsets of plan_id / network_name / plan_type / plan_name /
+# validity, their lengths, network_id, validity days, status (index into STATUS_LABELS), flags
+RECORD = struct.Struct('<qqIIIIIHHHHHHHBB')
+MONEY_NA = -2 ** 63
+# flags: which money fields are missing
+AMOUNT_NA = 1
+COST_NA = 2
+
+
+def plan_hash(plan_id):
+    return int.from_bytes(hashlib.blake2b(str(plan_id).encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _money(value, scale=1):
+    # value * scale as an int, None when it's missing (None, NaN, pd.NA) or not a number
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) or math.isinf(number) else int(round(number * scale))
+
+
+def write_index(plans, path):
+    """Write plans (db_payload dicts plus 'validity_days' and 'status') to `path`.
+    Repeated plan_ids keep their last row."""
+    by_id = {}
+    for plan in plans:
+        by_id[str(plan['plan_id'])] = plan
+
+    pool = bytearray()
+    interned = {}
+
+    def intern(text):
+        data = str(text).encode('utf-8')
+        if data not in interned:
+            interned[data] = len(pool)
+            pool.extend(data)
+        return interned[data], len(data)
+
+    records = bytearray()
+    keys = []
+    for number, (plan_id, plan) in enumerate(by_id.items()):
+        strings = [intern(plan_id), intern(plan['network_name']), intern(plan['plan_type']), intern(plan['plan_name']),
+                   intern(plan['validity'])]
+        amount, cost_kobo = _money(plan['amount']), _money(plan['cost_price'], KOBO)
+        flags = (AMOUNT_NA if amount is None else 0) | (COST_NA if cost_kobo is None else 0)
+        records += RECORD.pack(MONEY_NA if amount is None else amount, MONEY_NA if cost_kobo is None else cost_kobo,
+                               *[offset for offset, _ in strings], *[length for _, length in strings],
+                               int(plan['network_id']), int(plan['validity_days']),
+                               STATUS_LABELS.index(plan['status']), flags)
+        keys.append((plan_hash(plan_id), number))
+    keys.sort()
+
+    keys_offset = HEADER.size
+    records_offset = keys_offset + KEY.size * len(keys)
+    pool_offset = records_offset + len(records)
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, KEY.size, len(keys),
+                            keys_offset, records_offset, pool_offset, len(pool)))
+        for key in keys:
+            f.write(KEY.pack(*key))
+        f.write(records)
+        f.write(pool)
+    os.replace(tmp, path)
+    return path
+
+
+class PriceIndex:
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, record_size, key_size, self.count,
+         self._keys, self._records, self._pool, _) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size or key_size != KEY.size:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} price index")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._map.close()
+
+    def __len__(self):
+        return self.count
+
+    def _string(self, offset, length):
+        return self._map[self._pool + offset:self._pool + offset + length].decode('utf-8')
+
+    def _record(self, number):
+        (amount, cost_kobo, id_off, net_off, type_off, name_off, valid_off, id_len, net_len, type_len, name_len,
+         valid_len, network_id, days, status, flags) = RECORD.unpack_from(self._map, self._records + number * RECORD.size)
+        return {
+            'network_id': network_id,
+            'plan_id': self._string(id_off, id_len),
+            'network_name': self._string(net_off, net_len),
+            'plan_type': self._string(type_off, type_len),
+            'plan_name': self._string(name_off, name_len),
+            'amount': None if flags & AMOUNT_NA else amount,
+            'cost_price': None if flags & COST_NA else cost_kobo / KOBO,
+            'validity': self._string(valid_off, valid_len),
+            'validity_days': days,
+            'status': STATUS_LABELS[status],
+        }
+
+    def get(self, plan_id, default=None):
+        # Binary search on the hash, then confirm the id (hashes can collide)
+        plan_id = str(plan_id)
+        target = plan_hash(plan_id)
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if KEY.unpack_from(self._map, self._keys + mid * KEY.size)[0] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        while lo < self.count:
+            key, number = KEY.unpack_from(self._map, self._keys + lo * KEY.size)
+            if key != target:
+                break
+            record = self._record(number)
+            if record['plan_id'] == plan_id:
+                return record
+            lo += 1
+        return default
+
+    def __contains__(self, plan_id):
+        return self.get(plan_id) is not None
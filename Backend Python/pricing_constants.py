@@ -0,0 +1,45 @@
+# ==========================================
+# Pricing constants shared by both engines
+# ==========================================
+# Settings, output columns and file names that phyton.py and the pandas-free
+# quote_engine.py must agree on for their files to match byte for byte. Plain
+# values with no imports, like sample_catalogs.py, so the light engine stays light.
+
+UNDERCUT_AMOUNT = 5  # How much to beat the competitor by (₦)
+KOBO = 100  # Money is whole kobo inside both engines
+
+# --- SUPPLIERS ---
+DEFAULT_SUPPLIER = "API Provider"
+# Alternates kept per slot in case the cheapest supplier fails
+FAILOVER_DEPTH = 3
+
+# --- OUTPUT ---
+# Unpriced: no cost, default or competitor price to go on, so it's never put on sale
+STATUS_LABELS = ["Active", "Excluded (Too High)", "Unpriced"]
+
+# (Changed to snake_case for better JSON/API compatibility)
+FINAL_COLUMNS = ['Network', 'Plan_ID', 'Size', 'Type_Validity', 'Cost_Price', 'Default_Price', 'Competitor_Price', 'Final_Price', 'Status']
+PAYLOAD_COLUMNS = ['network_id', 'plan_id', 'network_name', 'plan_type', 'plan_name', 'amount', 'cost_price', 'validity']
+FAILOVER_COLUMNS = ['Network', 'Norm_Size', 'Norm_Valid', 'Failover_Rank', 'Supplier', 'ID', 'Cost']
+
+CSV_FILE = "naija_prices_fixed.csv"
+JSON_FILE = "naija_prices_fixed.json"
+CSV_DB_FILE = "plans_for_supabase.csv"
+JSON_DB_FILE = "plans_for_db.json"
+NDJSON_DB_FILE = "plans_for_db.ndjson"
+
+DELTA_FILE = "plans_delta.json"
+SHARD_DIR = "plans"
+MANIFEST_FILE = "manifest.json"
+INDEX_FILE = "plans.idx"
+FAILOVER_FILE = "supplier_failover.csv"
+
+
+def map_network_to_id(network_name):
+    name = network_name.upper()
+    if 'MTN' in name: return 1
+    if 'GLO' in name: return 2
+    if 'AIRTEL' in name: return 3
+    if 'MOBILE' in name: return 4
+    if 'SMILE' in name: return 5
+    return 0
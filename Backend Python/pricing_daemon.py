@@ -0,0 +1,257 @@
+import argparse
+import json
+import os
+import threading
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from frame_cache import CACHE_DIR, FrameCache
+from phyton import ANOMALY_Z, COMPETITOR_SOURCES, UNDERCUT_AMOUNT, PricingEngine, json_safe, load_rules
+
+# ==========================================
+# Resident repricing daemon with a local quote API
+# ==========================================
+# Watches the cost / default / competitor CSVs, reprices when one of them changes
+# and swaps in a fresh in-memory index in one assignment, so a request sees either
+# the old prices or the new ones, never a mix. Lookups are dict hits on
+# pre-rendered JSON bytes.
+#
+#   GET /plans/<plan_id>                        one plan
+#   GET /slots/<network_id>/<size_gb>/<days>    every active plan in that slot, cheapest first
+#   GET /health                                 index version, plan count, last reprice
+#
+# Usage:
+#   python pricing_daemon.py --watch-dir drop/ --port 8787
+#   python pricing_daemon.py --cost cost.csv --default default.csv --comp1 ck.csv --comp2 atg.csv
+#
+# In a drop directory the inputs are cost.csv, default.csv, comp1.csv, comp2.csv
+# and <Competitor name>.csv for any other registered source.
+#
+# The embedded sample catalogs are never used here: without cost and default files
+# there is nothing to price and the index in service is kept as it is (empty at
+# start), and a competitor without a file is left out rather than quoted from the
+# sample. A plan with no price (no amount) is left out of the index too.
+
+# Inputs a reprice can't do without
+REQUIRED_INPUTS = ['cost', 'default']
+
+
+def _json(value):
+    return json.dumps(value, separators=(',', ':'), allow_nan=False).encode('utf-8')
+
+
+def slot_key(network_id, size_gb, validity_days):
+    return int(network_id), round(float(size_gb), 3), int(validity_days)
+
+
+class QuoteIndex:
+    """Immutable lookup tables for one pricing run."""
+
+    def __init__(self, plans, slots, version=0, priced_at=None):
+        self.plans = plans    # plan_id -> JSON bytes
+        self.slots = slots    # (network_id, size_gb, days) -> JSON bytes
+        self.version = version
+        self.priced_at = priced_at
+
+    @classmethod
+    def from_engine(cls, engine, version=0):
+        df_final = engine.final_frame()
+        payload = engine.db_payload(df_final)
+        # final_frame keeps df_priced's row labels, so the slot keys line up with the payload
+        keys = engine.df_priced.loc[df_final.index, ['Norm_Size', 'Norm_Valid']].to_numpy(dtype=float)
+        plans, plan_slots, slots = {}, {}, {}
+        for plan, (size, days) in zip(payload, keys):
+            # Missing values are null in the JSON; a plan nobody can price isn't quoted
+            plan = {key: json_safe(value) for key, value in plan.items()}
+            if plan['amount'] is None:
+                continue
+            # Repeated plan_ids keep their last row, same as the upload does
+            plans[plan['plan_id']] = plan
+            plan_slots[plan['plan_id']] = slot_key(plan['network_id'], size, days)
+        for plan_id, plan in plans.items():
+            slots.setdefault(plan_slots[plan_id], []).append(plan)
+        return cls({plan_id: _json(plan) for plan_id, plan in plans.items()},
+                   {key: _json(sorted(group, key=lambda p: p['amount'])) for key, group in slots.items()},
+                   version, time.time())
+
+    def health(self):
+        return _json({'version': self.version, 'plans': len(self.plans), 'slots': len(self.slots),
+                      'priced_at': self.priced_at})
+
+
+class PricingDaemon:
+    def __init__(self, inputs, undercut=UNDERCUT_AMOUNT, size_tolerance=None, interval=2.0, out_dir=None, rules=None,
+                 anomaly_z=None, cache=None):
+        # `inputs` maps cost / default / comp1 / comp2 / a competitor name to a CSV path
+        self.inputs = inputs
+        self.undercut = undercut
+        self.rules = rules
+        self.anomaly_z = anomaly_z
+        # A FrameCache: only the inputs that changed since they were last seen get parsed
+        self.cache = cache
+        self.size_tolerance = size_tolerance
+        self.interval = interval
+        self.out_dir = out_dir
+        self.index = QuoteIndex({}, {})
+        self.priced_signature = None
+        self._stop = threading.Event()
+
+    @classmethod
+    def from_drop_dir(cls, path, **options):
+        names = ['cost', 'default', 'comp1', 'comp2'] + [name for name in COMPETITOR_SOURCES]
+        return cls({name: os.path.join(path, name + '.csv') for name in names}, **options)
+
+    def signature(self):
+        # (mtime, size) per input; None for files that aren't there (the embedded sample is used)
+        sig = []
+        for name, path in sorted(self.inputs.items()):
+            try:
+                st = os.stat(path)
+                sig.append((name, st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                sig.append((name, None, None))
+        return tuple(sig)
+
+    def reprice(self, signature=None):
+        signature = signature or self.signature()
+        present = {name: path for name, path in self.inputs.items() if os.path.exists(path)}
+        missing = [name for name in REQUIRED_INPUTS if name not in present]
+        if missing:
+            raise FileNotFoundError(f"no {' or '.join(missing)} catalog to price from, keeping index v{self.index.version}")
+        competitors = {name: path for name, path in present.items() if name in COMPETITOR_SOURCES}
+        # Without their sample data, sources with no file are skipped by load()
+        sources = {name: source._replace(raw_data=None) for name, source in COMPETITOR_SOURCES.items()}
+        engine = PricingEngine(undercut=self.undercut, size_tolerance=self.size_tolerance, rules=self.rules,
+                               anomaly_z=self.anomaly_z, competitors=sources)
+        args = present.get('cost'), present.get('default'), present.get('comp1'), present.get('comp2'), competitors
+        if self.cache is not None:
+            engine.load_cached(self.cache, *args).aggregate().merge()
+            engine.price()
+        else:
+            engine.run(*args)
+        if self.out_dir:
+            engine.export(self.out_dir)
+        index = QuoteIndex.from_engine(engine, self.index.version + 1)
+        # The swap: handlers pick up self.index once per request
+        self.index = index
+        self.priced_signature = signature
+        print(f"🔁 Index v{index.version}: {len(index.plans)} plans, {len(index.slots)} slots")
+        return index
+
+    def watch(self):
+        # Poll the inputs; reprice once a change has held still for one interval
+        # (so a half-copied file isn't priced)
+        seen = self.signature()
+        while not self._stop.wait(self.interval):
+            current = self.signature()
+            if current != seen:
+                seen = current
+                continue
+            if current != self.priced_signature:
+                self.try_reprice(current)
+
+    def try_reprice(self, signature):
+        # Reprice, or keep serving the last good index (empty at start: 404s) until the
+        # inputs change again. Missing inputs are expected; anything else is reported in full.
+        try:
+            return self.reprice(signature)
+        except FileNotFoundError as error:
+            print(f"⚠️ {error}")
+        except Exception as error:
+            traceback.print_exc()
+            print(f"⚠️ Reprice failed ({type(error).__name__}: {error}), keeping index v{self.index.version}")
+        self.priced_signature = signature
+
+    def serve(self, host='127.0.0.1', port=8787):
+        self.try_reprice(self.signature())
+        server = ThreadingHTTPServer((host, port), make_handler(self))
+        server.daemon_threads = True
+        watcher = threading.Thread(target=self.watch, daemon=True)
+        watcher.start()
+        print(f"💹 Quote API on http://{host}:{server.server_address[1]}")
+        try:
+            server.serve_forever()
+        finally:
+            self._stop.set()
+            server.server_close()
+
+
+def make_handler(daemon):
+    class QuoteHandler(BaseHTTPRequestHandler):
+        # Keep-alive, so a checkout backend can reuse its connection, and TCP_NODELAY
+        # so the body isn't held back waiting for the ACK of the headers
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def _send(self, status, body):
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            index = daemon.index
+            parts = self.path.split('?', 1)[0].strip('/').split('/')
+            body = None
+            try:
+                if parts[0] == 'plans' and len(parts) == 2:
+                    body = index.plans.get(parts[1])
+                elif parts[0] == 'slots' and len(parts) == 4:
+                    body = index.slots.get(slot_key(*parts[1:]))
+                elif parts == ['health']:
+                    body = index.health()
+            except ValueError:
+                return self._send(400, _json({'error': 'bad slot key'}))
+            if body is None:
+                return self._send(404, _json({'error': 'not found'}))
+            self._send(200, body)
+
+        def log_message(self, format, *args):
+            pass  # one line per quote would cost more than the lookup
+
+    return QuoteHandler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reprice on input changes and serve quotes over HTTP.")
+    parser.add_argument('--watch-dir', help="Drop directory with cost.csv, default.csv, comp1.csv, comp2.csv ...")
+    parser.add_argument('--cost')
+    parser.add_argument('--default')
+    parser.add_argument('--comp1')
+    parser.add_argument('--comp2')
+    parser.add_argument('--competitor', action='append', default=[], metavar='NAME=CSV')
+    parser.add_argument('--undercut', type=float, default=UNDERCUT_AMOUNT)
+    parser.add_argument('--size-tolerance', type=float)
+    parser.add_argument('--rules', help="JSON list of pricing rules, see phyton.py")
+    parser.add_argument('--validate', nargs='?', type=float, const=ANOMALY_Z, metavar='Z',
+                        help="Quarantine anomalous competitor rows before pricing, see phyton.py")
+    parser.add_argument('--cache', nargs='?', const=CACHE_DIR, metavar='DIR',
+                        help=f"Keep parsed catalogs in this frame cache between reprices (default dir: {CACHE_DIR}/)")
+    parser.add_argument('--interval', type=float, default=2.0, help="Seconds between polls of the inputs")
+    parser.add_argument('--out-dir', help="Also write the usual export files after every reprice")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8787)
+    args = parser.parse_args(argv)
+    if args.cache and args.validate is not None:
+        parser.error("--cache keeps reduced catalogs, it can't be combined with --validate")
+
+    options = {'undercut': args.undercut, 'size_tolerance': args.size_tolerance, 'interval': args.interval,
+               'out_dir': args.out_dir, 'rules': load_rules(args.rules) if args.rules else None,
+               'anomaly_z': args.validate, 'cache': FrameCache(args.cache) if args.cache else None}
+    if args.watch_dir:
+        daemon = PricingDaemon.from_drop_dir(args.watch_dir, **options)
+    else:
+        inputs = {name: getattr(args, name) for name in ['cost', 'default', 'comp1', 'comp2'] if getattr(args, name)}
+        competitors = dict(item.split('=', 1) for item in args.competitor)
+        unknown = sorted(set(competitors) - set(COMPETITOR_SOURCES))
+        if unknown:
+            parser.error(f"--competitor: unknown source(s) {unknown}, registered: {sorted(COMPETITOR_SOURCES)}")
+        inputs.update(competitors)
+        daemon = PricingDaemon(inputs, **options)
+    daemon.serve(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,652 @@
+import argparse
+import csv
+import io
+import json
+import math
+import os
+import re
+import sys
+from array import array
+from collections import namedtuple
+
+from pricing_constants import (
+    UNDERCUT_AMOUNT, KOBO, DEFAULT_SUPPLIER, FAILOVER_DEPTH, STATUS_LABELS, FINAL_COLUMNS, PAYLOAD_COLUMNS,
+    FAILOVER_COLUMNS, CSV_FILE, JSON_FILE, CSV_DB_FILE, JSON_DB_FILE, NDJSON_DB_FILE, INDEX_FILE, FAILOVER_FILE,
+    map_network_to_id,
+)
+from sample_catalogs import raw_comp1_data, raw_comp2_data, raw_cost_data, raw_default_data
+
+# ==========================================
+# Pandas-free quote engine
+# ==========================================
+# The parse -> normalize -> slot-min -> price_kernel pipeline of
+# phyton.PricingEngine on plain Python: csv rows, one __slots__ record per plan
+# and dicts keyed by slot. Importing it takes ~20 ms where pandas and NumPy take
+# ~300 ms, which is most of a cron or serverless run when the catalogs are small or
+# all that's wanted is a quote. Past a few tens of thousands of rows the vectorized
+# engine wins again (300k rows: ~10 s here against ~4 s).
+#
+#   engine = QuoteEngine()
+#   engine.run(cost="cost.csv", comp1="ck.csv")
+#   engine.quote("415")    # {'network_id': 1, 'plan_id': '415', ..., 'amount': 562, ...}
+#   engine.export("out/")  # the files phyton.py writes, byte for byte
+#
+# Covered: the embedded samples or CSV inputs, several suppliers with failover,
+# every competitor in QUOTE_SOURCES, exact-size matching and one undercut for all
+# slots. Rules, validation, size tolerance, streaming, workers, the frame cache,
+# snapshots, history and uploads stay with the DataFrame engine: the command line
+# hands such runs to phyton.main, and final_frame() imports pandas only when called.
+#
+# Usage:
+#   python quote_engine.py --cost cost.csv --comp1 ck.csv --out-dir out/
+#   python quote_engine.py --quote 415
+#
+# tests/test_differential.py prices the samples and random catalogs with both engines
+# and compares every file they write.
+
+MAX_DAYS = 32767  # Norm_Valid is an int16 in the DataFrame engine
+
+# Fields pandas.read_csv reads as missing by default
+NA_VALUES = frozenset(['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+                       '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'])
+
+
+# --- READING ---
+def read_table(source, default_csv):
+    # (header, rows) of a CSV, from the same inputs read_source() takes: a path, a raw
+    # CSV string, a file-like buffer, a DataFrame or None (the embedded sample).
+    # Missing fields are None.
+    if source is None:
+        text = default_csv.strip()
+    elif hasattr(source, 'to_csv'):
+        text = source.to_csv(index=False)
+    elif isinstance(source, str) and '\n' in source:
+        text = source.strip()
+    elif hasattr(source, 'read'):
+        text = source.read()
+        text = text.decode('utf-8-sig') if isinstance(text, bytes) else text
+    else:
+        with open(source, newline='', encoding='utf-8-sig') as f:
+            text = f.read()
+    reader = csv.reader(io.StringIO(text, newline=''))
+    header = next(reader, [])
+    width = len(header)
+    rows = []
+    for row in reader:
+        if not row:
+            continue  # blank lines are skipped, like read_csv does
+        if len(row) < width:
+            row += [''] * (width - len(row))
+        rows.append([None if value in NA_VALUES else value for value in row])
+    return header, rows
+
+
+def column(table, name):
+    header, rows = table
+    i = header.index(name) if name in header else None
+    if i is None:
+        raise KeyError(name)
+    return [row[i] for row in rows]
+
+
+def _memo(parse):
+    # Catalogs repeat the same few labels, parse each distinct one once
+    cache = {}
+    def parsed(label):
+        if label not in cache:
+            cache[label] = parse(label)
+        return cache[label]
+    return parsed
+
+
+def _label_text(label):
+    # str() of what pandas holds for the field: a missing one is NaN
+    return 'nan' if label is None else label
+
+
+# --- NORMALIZATION ---
+# The same answers as the vectorized normalizers in phyton.py (not the per-row ones,
+# which raise on a size like "."), with sizes rounded to float32 and validity clipped
+# to int16 the way the DataFrame engine stores them.
+_NON_SIZE = re.compile(r'[^\d\.MGTB]')
+_NUMBER = re.compile(r'[\d\.]+')
+_DAYS = re.compile(r'(\d+)\s*DAY')
+_COMP1_SIZE = re.compile(r'([\d\.]+\s*(?:MB|GB|TB))', re.IGNORECASE)
+_PRICE_JUNK = re.compile(r'[",₦\s]')
+
+
+def float32(value):
+    return array('f', [value])[0]
+
+
+def size_gb(label):
+    text = _NON_SIZE.sub('', _label_text(label).upper())
+    found = _NUMBER.search(text)
+    try:
+        value = float(found.group()) if found else math.nan
+    except ValueError:
+        value = math.nan  # "." or "1.2.3"
+    if 'MB' in text:
+        value = value / 1024
+    elif 'TB' in text:
+        value = value * 1024
+    return 0.0 if math.isnan(value) else round(value, 3)
+
+
+def validity_days(label):
+    text = _label_text(label).upper()
+    if 'MONTH' in text or '30 DAY' in text:
+        days = 30
+    elif 'WEEK' in text or '7 DAY' in text:
+        days = 7
+    elif '1 DAY' in text or 'DAILY' in text or '24 HOUR' in text:
+        days = 1
+    else:
+        found = _DAYS.search(text)
+        days = int(found.group(1)) if found else 30  # Default fallback
+    return min(days, MAX_DAYS)
+
+
+def comp1_size_gb(label):
+    found = _COMP1_SIZE.search(_label_text(label))
+    return size_gb(found.group(1)) if found else 0.0
+
+
+def price_kobo(label):
+    # Naira label -> whole kobo, None when missing or unparseable
+    if label is None:
+        return None
+    try:
+        naira = float(_PRICE_JUNK.sub('', label))
+    except ValueError:
+        return None
+    if not math.isfinite(naira):
+        return None
+    return int(round(naira * KOBO))
+
+
+def slot_size(label, parse=size_gb):
+    return float32(parse(label))
+
+
+# What read_csv infers an ID column to be
+INT_PATTERN = r'[+-]?\d+'
+FLOAT_PATTERN = r'[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?'
+
+
+def id_kind(kinds):
+    # The kind of the ID column once the supplier catalogs are stacked: int and float
+    # catalogs give a float column, any str one leaves every catalog's values as they are
+    kinds = set(kinds)
+    return kinds.pop() if len(kinds) == 1 else 'float' if 'str' not in kinds else 'str'
+
+
+def typed_ids(values):
+    # (kind, values) of an ID column, typed the way read_csv infers it: int when every
+    # value is an integer, float when they're all numbers or missing, else the strings
+    # as they are (an empty catalog's column is an object one too)
+    if not values:
+        return 'str', []
+    present = [v for v in values if v is not None]
+    if len(present) == len(values) and all(re.fullmatch(INT_PATTERN, v) for v in present):
+        return 'int', [int(v) for v in values]
+    if all(re.fullmatch(FLOAT_PATTERN, v) for v in present):
+        return 'float', [math.nan if v is None else float(v) for v in values]
+    return 'str', [math.nan if v is None else v for v in values]
+
+
+# --- COMPETITOR SOURCES ---
+# Same names and output columns as phyton.COMPETITOR_SOURCES. `observe` turns a
+# catalog table into (Network, Norm_Size, Norm_Valid, kobo price) rows.
+QuoteSource = namedtuple('QuoteSource', ['name', 'column', 'observe', 'raw_data'])
+
+QUOTE_SOURCES = {}
+
+
+def register_quote_source(source):
+    QUOTE_SOURCES[source.name] = source
+    return source
+
+
+def _slot_sizes(parse):
+    return _memo(lambda label: slot_size(label, parse))
+
+
+def observe_free_text(table, text_col='Plan Name', price_col='Price'):
+    size, valid, price = _slot_sizes(comp1_size_gb), _memo(validity_days), _memo(price_kobo)
+    for network, text, label in zip(column(table, 'Network'), column(table, text_col), column(table, price_col)):
+        yield network, size(text), valid(text), price(label)
+
+
+def observe_structured(table, size_col='Plan Size', validity_col='Validity_Desc', price_col='Price'):
+    size, valid, price = _slot_sizes(size_gb), _memo(validity_days), _memo(price_kobo)
+    for network, size_label, valid_label, label in zip(column(table, 'Network'), column(table, size_col),
+                                                       column(table, validity_col), column(table, price_col)):
+        yield network, size(size_label), valid(valid_label), price(label)
+
+
+register_quote_source(QuoteSource('ClubKonnect', 'Comp1_Price', observe_free_text, raw_comp1_data))
+register_quote_source(QuoteSource('AimToGet', 'Comp2_Price', observe_structured, raw_comp2_data))
+
+
+# --- RECORDS ---
+class Offer:
+    """One row of a cost catalog."""
+    __slots__ = ('slot', 'plan_id', 'size_label', 'validity_label', 'price', 'supplier')
+
+    def __init__(self, slot, plan_id, size_label, validity_label, price, supplier):
+        self.slot = slot
+        self.plan_id = plan_id
+        self.size_label = size_label
+        self.validity_label = validity_label
+        self.price = price
+        self.supplier = supplier
+
+    def cost_key(self):
+        return math.inf if self.price is None else self.price
+
+    def rank_key(self):
+        # Cheapest first, a missing price last, then by supplier listing order
+        return self.cost_key(), self.supplier
+
+
+class PricedPlan:
+    """One row of the slot table: a slot's cheapest plan against one default price."""
+    __slots__ = ('slot', 'offer', 'cost', 'default', 'comps', 'lowest', 'final', 'status')
+
+    def __init__(self, slot, offer, cost, default, comps):
+        self.slot = slot
+        self.offer = offer
+        self.cost = cost          # kobo, None = missing (like every money field)
+        self.default = default
+        self.comps = comps        # one price per competitor column
+        self.lowest = None
+        self.final = None
+        self.status = None
+
+    def sort_key(self):
+        # final_frame()'s order: Network, Norm_Valid, Clean_Price with a missing cost last
+        network, _, valid = self.slot
+        return network, valid, self.cost is None, self.cost or 0
+
+
+def naira(kobo):
+    return math.nan if kobo is None else kobo / KOBO
+
+
+def price_plan(plan, undercut_kobo):
+    # price_kernel() for one row, in integer kobo
+    comps = [p for p in plan.comps if p is not None]
+    cost, default = plan.cost, plan.default
+    # 1. Determine lowest competitor price
+    lowest = min(comps) if comps else None
+    # Undercut, else Default, else fallback margin (cost * 1.2, to the nearest kobo)
+    if lowest is not None:
+        final = lowest - undercut_kobo
+    elif default is not None:
+        final = default
+    else:
+        final = None if cost is None else (cost * 6 + 2) // 5
+    # 2. Profit Protection
+    if cost is not None and final < cost:
+        final = cost
+    # 3. Exclusion Flag (if even at cost we are higher than competitor)
+    plan.status = STATUS_LABELS[2 if final is None else lowest is not None and final > lowest]
+    plan.lowest = lowest
+    plan.final = final
+    return plan
+
+
+# ==========================================
+# QUOTE ENGINE
+# ==========================================
+
+class QuoteEngine:
+    """PricingEngine's stages and outputs without pandas.
+
+    load -> normalize -> aggregate -> merge -> price -> export
+    """
+
+    def __init__(self, undercut=UNDERCUT_AMOUNT, competitors=None):
+        self.undercut = undercut
+        self.competitors = dict(competitors if competitors is not None else QUOTE_SOURCES)
+        self.comp_columns = [source.column for source in self.competitors.values()]
+        self.cost_tables = {}
+        self.default_table = None
+        self.comp_tables = {}
+        self.offers = []
+        self.defaults = {}
+        self.comp_min = {}
+        self.cheapest = {}
+        self.failover = []
+        self.plans = []
+        self.priced = None
+        self._quotes = None
+
+    # -- STAGE 1: LOAD --
+    def load(self, cost=None, default=None, comp1=None, comp2=None, competitors=None, suppliers=None):
+        # Same inputs as PricingEngine.load()
+        unknown = sorted(set(competitors or {}) - set(self.competitors))
+        if unknown:
+            raise ValueError(f"unknown competitor source(s) {unknown}, registered: {sorted(self.competitors)}")
+        inputs = {'ClubKonnect': comp1, 'AimToGet': comp2}
+        inputs.update(competitors or {})
+        suppliers = dict(suppliers or {})
+        if cost is not None or not suppliers:
+            suppliers = {DEFAULT_SUPPLIER: cost, **suppliers}
+        self.cost_tables = {name: read_table(source, raw_cost_data) for name, source in suppliers.items()}
+        self.default_table = read_table(default, raw_default_data)
+        self.comp_tables = {}
+        for name, source in self.competitors.items():
+            if inputs.get(name) is None and source.raw_data is None:
+                continue
+            self.comp_tables[name] = read_table(inputs.get(name), source.raw_data)
+        return self
+
+    # -- STAGE 2: NORMALIZE --
+    def normalize(self):
+        size, valid, price = _memo(slot_size), _memo(validity_days), _memo(price_kobo)
+        self.offers = []
+        ids = [typed_ids(column(table, 'ID')) for table in self.cost_tables.values()]
+        if id_kind(kind for kind, _ in ids) == 'float':
+            ids = [('float', [float(v) for v in values]) for _, values in ids]
+        for supplier, (table, (_, plan_ids)) in enumerate(zip(self.cost_tables.values(), ids)):
+            for network, plan_id, size_label, valid_label, label in zip(
+                    column(table, 'Network'), plan_ids, column(table, 'Plan Size'), column(table, 'Validity_Type'),
+                    column(table, 'Price')):
+                slot = (network, size(size_label), valid(valid_label))
+                self.offers.append(Offer(slot, plan_id, size_label, valid_label, price(label), supplier))
+
+        # Default prices per slot, in catalog order (a slot listed twice prices twice)
+        self.defaults = {}
+        table = self.default_table
+        for network, size_label, valid_label, label in zip(column(table, 'Network'), column(table, 'Plan Size'),
+                                                           column(table, 'Validity_Type'), column(table, 'Price')):
+            if network is not None:
+                self.defaults.setdefault((network, size(size_label), valid(valid_label)), []).append(price(label))
+
+        # Lowest price per slot per competitor
+        names = list(self.competitors)
+        self.comp_min = {}
+        for name, table in self.comp_tables.items():
+            i = names.index(name)
+            for network, size_gb_, days, kobo in self.competitors[name].observe(table):
+                if network is None or kobo is None:
+                    continue
+                prices = self.comp_min.setdefault((network, size_gb_, days), [None] * len(names))
+                if prices[i] is None or kobo < prices[i]:
+                    prices[i] = kobo
+        return self
+
+    # -- STAGE 3: AGGREGATE --
+    def aggregate(self, depth=FAILOVER_DEPTH):
+        # Each supplier's cheapest plan per slot (first listed on a tie), ranked by
+        # cost then supplier order: the first is the slot's plan, the next `depth` its failover
+        best = {}
+        for offer in self.offers:
+            if offer.slot[0] is None:
+                continue
+            key = offer.slot, offer.supplier
+            if key not in best or offer.cost_key() < best[key].cost_key():
+                best[key] = offer
+        by_slot = {}
+        for (slot, _), offer in best.items():
+            by_slot.setdefault(slot, []).append(offer)
+        self.cheapest, self.failover = {}, []
+        for slot in sorted(by_slot):
+            ranked = sorted(by_slot[slot], key=Offer.rank_key)
+            self.cheapest[slot] = ranked[0]
+            self.failover.extend((rank, offer) for rank, offer in enumerate(ranked[1:depth + 1], 1))
+        return self
+
+    # -- STAGE 4: MERGE --
+    def merge(self):
+        no_comps = [None] * len(self.competitors)
+        self.plans = []
+        for slot, offer in self.cheapest.items():
+            comps = tuple(self.comp_min.get(slot, no_comps))
+            for default in self.defaults.get(slot, [None]):
+                cost = offer.price
+                # Swap if Cost > Default, so the lower price is always the cost
+                if cost is not None and default is not None and cost > default:
+                    cost, default = default, cost
+                self.plans.append(PricedPlan(slot, offer, cost, default, comps))
+        return self
+
+    # -- STAGE 5: PRICE --
+    def price(self, undercut=None):
+        if undercut is None:
+            undercut = self.undercut
+        undercut_kobo = int(round(undercut * KOBO))
+        self.priced = [price_plan(plan, undercut_kobo) for plan in self.plans]
+        self._quotes = None
+        return self.priced
+
+    def run(self, cost=None, default=None, comp1=None, comp2=None, competitors=None, suppliers=None):
+        self.load(cost, default, comp1, comp2, competitors, suppliers).normalize().aggregate().merge()
+        return self.price()
+
+    # -- OUTPUTS --
+    def final_plans(self, active_only=True):
+        plans = sorted(self.priced, key=PricedPlan.sort_key)
+        return [plan for plan in plans if plan.status == 'Active'] if active_only else plans
+
+    def final_rows(self, active_only=True):
+        # The rows of PricingEngine.final_frame(), FINAL_COLUMNS order, money in naira
+        return [final_row(plan) for plan in self.final_plans(active_only)]
+
+    def final_frame(self, active_only=True):
+        # The full DataFrame path: pandas is imported here, not before
+        import pandas as pd
+        return pd.DataFrame(self.final_rows(active_only), columns=FINAL_COLUMNS)
+
+    def db_payload(self, plans=None):
+        return [payload_row(plan) for plan in (self.final_plans() if plans is None else plans)]
+
+    def index_plans(self):
+        # Same as PricingEngine.index_plans(): every priced plan, Active rows last
+        plans = self.final_plans(active_only=False)
+        indexed = [dict(row, validity_days=plan.slot[2], status=plan.status)
+                   for plan, row in zip(plans, self.db_payload(plans))]
+        return sorted(indexed, key=lambda plan: plan['status'] == 'Active')
+
+    def quote(self, plan_id, default=None):
+        # The payload of one plan; repeated plan_ids keep their last row, same as the upload does
+        if self._quotes is None:
+            self._quotes = {plan['plan_id']: plan for plan in self.db_payload()}
+        return self._quotes.get(str(plan_id), default)
+
+    def slot_quotes(self, network_id, size, days):
+        # Every active plan of a slot, cheapest first (GET /slots/... of pricing_daemon.py)
+        key = int(network_id), round(float(size), 3), int(days)
+        plans = self.final_plans()
+        return sorted((row for plan, row in zip(plans, self.db_payload(plans))
+                       if (row['network_id'], round(plan.slot[1], 3), plan.slot[2]) == key),
+                      key=lambda row: row['amount'])
+
+    def failover_rows(self):
+        suppliers = list(self.cost_tables)
+        return [[offer.slot[0], float32_text(offer.slot[1]), offer.slot[2], rank, suppliers[offer.supplier],
+                 offer.plan_id, naira(offer.price)] for rank, offer in self.failover]
+
+    # -- STAGE 6: EXPORT --
+    def export(self, out_dir=".", ndjson=False):
+        plans = self.final_plans()
+        paths = {
+            'csv': os.path.join(out_dir, CSV_FILE),
+            'json': os.path.join(out_dir, JSON_FILE),
+            'csv_db': os.path.join(out_dir, CSV_DB_FILE),
+            'json_db': os.path.join(out_dir, JSON_DB_FILE),
+        }
+        rows = [final_row(plan) for plan in plans]
+        write_csv(paths['csv'], FINAL_COLUMNS, rows)
+        with open(paths['json'], 'w') as f:
+            f.write(records_json(FINAL_COLUMNS, rows))
+
+        payload = self.db_payload(plans)
+        write_csv(paths['csv_db'], PAYLOAD_COLUMNS, [[plan[col] for col in PAYLOAD_COLUMNS] for plan in payload])
+        plans_json = [json_plan(plan) for plan in payload]
+        with open(paths['json_db'], 'w') as f:
+            json.dump(plans_json, f, indent=2, allow_nan=False)
+        if ndjson:
+            paths['ndjson_db'] = os.path.join(out_dir, NDJSON_DB_FILE)
+            with open(paths['ndjson_db'], 'w') as f:
+                f.writelines(json.dumps(plan, separators=(',', ':'), allow_nan=False) + '\n' for plan in plans_json)
+        if self.failover:
+            paths['failover'] = self.export_failover(out_dir)
+        return paths
+
+    def export_failover(self, out_dir="."):
+        path = os.path.join(out_dir, FAILOVER_FILE)
+        write_csv(path, FAILOVER_COLUMNS, self.failover_rows())
+        return path
+
+    def export_index(self, out_dir="."):
+        from price_index import write_index
+        return write_index(self.index_plans(), os.path.join(out_dir, INDEX_FILE))
+
+
+def final_row(plan):
+    offer = plan.offer
+    return [plan.slot[0], offer.plan_id, offer.size_label, offer.validity_label, naira(plan.cost),
+            naira(plan.default), naira(plan.lowest), naira(plan.final), plan.status]
+
+
+def _text(label):
+    # A label as the payload holds it: missing stays NaN
+    return math.nan if label is None else label
+
+
+def payload_row(plan):
+    offer = plan.offer
+    network = plan.slot[0]
+    plan_id = offer.plan_id
+    validity = _text(offer.validity_label)
+    missing_name = offer.size_label is None or offer.validity_label is None
+    return {
+        "network_id": map_network_to_id(network),
+        "plan_id": plan_id if isinstance(plan_id, str) else (math.nan if plan_id != plan_id else str(plan_id)),
+        "network_name": network,
+        "plan_type": "ALL",
+        "plan_name": math.nan if missing_name else offer.size_label + "GB - " + offer.validity_label,
+        # Whole naira, rounded up so a kobo remainder never drops the price below cost
+        "amount": None if plan.final is None else math.ceil(plan.final / KOBO),
+        "cost_price": naira(plan.cost),
+        "validity": validity,
+    }
+
+
+# --- WRITERS ---
+# Byte for byte what DataFrame.to_csv(index=False), DataFrame.to_json(orient='records',
+# indent=4) and json.dump(indent=2) write for the same values.
+
+def _csv_value(value):
+    # NaN and None are empty fields; floats are written with repr() by the csv module
+    if value is None or (isinstance(value, float) and value != value):
+        return ''
+    return value
+
+
+def write_csv(path, columns, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, lineterminator=os.linesep)
+        writer.writerow(columns)
+        writer.writerows([_csv_value(v) for v in row] for row in rows)
+    return path
+
+
+def float32_text(value):
+    # The shortest decimal that reads back as the same float32, the way to_csv writes Norm_Size
+    for digits in range(1, 10):
+        text = f"{value:.{digits}g}"
+        if float32(float(text)) == value:
+            return float(text)
+    return value
+
+
+def json_plan(plan):
+    # A payload plan for json.dump: NaN fields become null
+    return {key: None if isinstance(value, float) and math.isnan(value) else value for key, value in plan.items()}
+
+
+def json_value(value):
+    # pandas' ujson: '/' and non-ASCII escaped, floats to 10 decimals, NaN as null
+    if value is None or (isinstance(value, float) and not math.isfinite(value)):
+        return 'null'
+    if isinstance(value, str):
+        return json.dumps(value).replace('/', '\\/')
+    if isinstance(value, float):
+        text = f"{value:.10f}".rstrip('0')
+        return text + '0' if text.endswith('.') else text
+    return str(value)
+
+
+def records_json(columns, rows):
+    keys = [json_value(col) for col in columns]
+    body = ',\n'.join('    {\n' + ',\n'.join(f'        {key}:{json_value(v)}' for key, v in zip(keys, row)) + '\n    }'
+                      for row in rows)
+    return '[\n' + body + '\n]'
+
+
+# ==========================================
+# COMMAND LINE
+# ==========================================
+
+def print_summary(engine, paths):
+    # Same summary phyton.py prints
+    print("-" * 30)
+    print(f"✅ Success!")
+    print(f"📄 CSV saved to: {paths['csv']}")
+    print(f"📄 General JSON saved to: {paths['json']}")
+    print("-" * 30)
+    print("JSON Preview:")
+    print(records_json(FINAL_COLUMNS, engine.final_rows()[:2]))
+    print(f"\n✅ [Done] Supabase CSV generated: '{paths['csv_db']}'")
+    print(f"👉 Please upload '{paths['csv_db']}' to your Supabase table.")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    parser = argparse.ArgumentParser(
+        description="Reprice data plans without pandas. Options this engine doesn't cover "
+                    "(--rules, --validate, --workers ...) hand the run to phyton.py.")
+    parser.add_argument('--cost', help="API provider cost CSV (default: embedded sample)")
+    parser.add_argument('--supplier', action='append', default=[], metavar='NAME=CSV',
+                        help="Cost CSV of another supplier to buy from (repeatable, cheapest per slot wins)")
+    parser.add_argument('--default', help="API provider default selling CSV")
+    parser.add_argument('--comp1', help="Competitor 1 (ClubKonnect) CSV")
+    parser.add_argument('--comp2', help="Competitor 2 (AimToGet) CSV")
+    parser.add_argument('--competitor', action='append', default=[], metavar='NAME=CSV',
+                        help="CSV for a registered competitor source (repeatable)")
+    parser.add_argument('--undercut', type=float, default=UNDERCUT_AMOUNT, help="How much to beat the competitor by (₦)")
+    parser.add_argument('--out-dir', default=".", help="Directory to write the output files to")
+    parser.add_argument('--ndjson', action='store_true', help=f"Also write the payload as {NDJSON_DB_FILE}")
+    parser.add_argument('--index', action='store_true', help=f"Also write the binary plan_id index {INDEX_FILE}")
+    parser.add_argument('--quote', metavar='PLAN_ID', help="Print one plan's quote instead of writing files")
+    parser.add_argument('--slot', nargs=3, metavar=('NETWORK_ID', 'SIZE_GB', 'DAYS'),
+                        help="Print every active plan of one slot, cheapest first, instead of writing files")
+    args, rest = parser.parse_known_args(argv)
+    competitors = dict(item.split('=', 1) for item in args.competitor)
+    if rest or any(name not in QUOTE_SOURCES for name in competitors):
+        if args.quote or args.slot:
+            parser.error("--quote and --slot only go with the options listed above")
+        from phyton import main as full_main  # the DataFrame engine, pandas and all
+        return full_main(argv)
+
+    inputs = {'cost': args.cost, 'default': args.default, 'comp1': args.comp1, 'comp2': args.comp2,
+              'competitors': competitors, 'suppliers': dict(item.split('=', 1) for item in args.supplier)}
+    engine = QuoteEngine(args.undercut)
+    engine.run(**inputs)
+    if args.quote or args.slot:
+        found = engine.quote(args.quote) if args.quote else engine.slot_quotes(*args.slot)
+        print(json.dumps(found, indent=2))
+        return 0 if found else 1
+    paths = engine.export(args.out_dir, ndjson=args.ndjson)
+    if args.index:
+        print(f"📇 Binary price index saved to: {engine.export_index(args.out_dir)}")
+    print_summary(engine, paths)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+import cProfile
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# ==========================================
+# Run report: per-stage timing, memory and row counts
+# ==========================================
+# PricingEngine records every stage here. Timing and row counts are always on
+# (a couple of perf_counter calls per stage); peak memory needs memory=True
+# (tracemalloc) and cProfile runs only for the stages listed in `profile`.
+# A warm engine that calls price() over and over keeps the latest record per
+# stage plus a call count, so the report never grows.
+# Stages nest (run_parallel -> load ...): each open stage keeps the peak of the
+# stretches before its inner stages, and an inner stage's peak is folded into its
+# parent when it ends, so tracemalloc's one global peak can be reset per stage
+# without losing the outer stage's.
+
+
+class RunReport:
+    def __init__(self, memory=False, profile=(), profile_dir="profiles"):
+        self.memory = memory
+        self.profile = set(profile)
+        self.profile_dir = profile_dir
+        self.stages = {}
+        self.counters = {}
+        # Peak so far of each open stage, innermost last
+        self._peaks = []
+
+    @contextmanager
+    def stage(self, name):
+        record = {'seconds': None, 'peak_bytes': None, 'rows_in': None, 'rows_out': None}
+        profiler = cProfile.Profile() if name in self.profile else None
+        tracing = self.memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        elif self.memory:
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        if self.memory:
+            self._peaks.append(0)
+        if profiler:
+            profiler.enable()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            if profiler:
+                profiler.disable()
+                os.makedirs(self.profile_dir, exist_ok=True)
+                profiler.dump_stats(os.path.join(self.profile_dir, f"{name}.prof"))
+            if self.memory:
+                record['peak_bytes'] = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], record['peak_bytes'])
+            if tracing:
+                tracemalloc.stop()
+            record['calls'] = self.stages.get(name, {}).get('calls', 0) + 1
+            self.stages[name] = record
+
+    def count(self, name, value):
+        self.counters[name] = int(value)
+
+    def to_dict(self):
+        return {'stages': self.stages, 'counters': self.counters}
+
+    def write_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+    def prometheus_text(self):
+        lines = []
+        metrics = [
+            ('pricing_stage_seconds', 'seconds', "Wall time of the last run of each pricing stage"),
+            ('pricing_stage_peak_bytes', 'peak_bytes', "Peak traced memory of each pricing stage"),
+            ('pricing_stage_rows_in', 'rows_in', "Rows going into each pricing stage"),
+            ('pricing_stage_rows_out', 'rows_out', "Rows coming out of each pricing stage"),
+        ]
+        for metric, key, help_text in metrics:
+            samples = [(stage, record[key]) for stage, record in self.stages.items() if record[key] is not None]
+            if not samples:
+                continue
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+            lines += [f'{metric}{{stage="{stage}"}} {value}' for stage, value in samples]
+        if self.counters:
+            lines += ["# HELP pricing_slots Slots by pricing outcome in the last run", "# TYPE pricing_slots gauge"]
+            lines += [f'pricing_slots{{outcome="{name}"}} {value}' for name, value in self.counters.items()]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        # Write then rename, so the node_exporter textfile collector never reads half a file
+        tmp = path + ".tmp"
+        with open(tmp, 'w') as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp, path)
+        return path
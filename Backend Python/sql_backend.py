@@ -0,0 +1,459 @@
+import argparse
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from phyton import (DEFAULT_SUPPLIER, FAILOVER_DEPTH, KOBO, LABEL_DTYPES, SIZE_DTYPE, STATUS_DTYPE,
+                    UNDERCUT_AMOUNT, VALID_DTYPE, PricingEngine, competitor_inputs, load_rules, normalize_catalog)
+from quote_engine import FLOAT_PATTERN, INT_PATTERN, NA_VALUES, id_kind
+from sample_catalogs import raw_cost_data, raw_default_data
+
+try:
+    import duckdb  # optional, only this backend needs it
+except ImportError:
+    duckdb = None
+
+# ==========================================
+# Embedded columnar SQL backend (DuckDB)
+# ==========================================
+# The aggregate -> merge -> price stages of PricingEngine as SQL over the raw inputs:
+# each supplier's cheapest plan per slot and the failover ranks, the per-competitor
+# minimums, the default and competitor joins, the swap and the pricing kernel (in
+# integer kobo, like price_kernel). The catalogs are loaded into a DuckDB database
+# file in a scratch directory, so scans run on every core and anything that doesn't
+# fit in `memory_limit` spills to disk. Multi-GB competitor dumps (CSV, Parquet or
+# a glob of either) are repriced without ever being a DataFrame; only the slot
+# table comes back (so that has to fit in memory), as the same df_master / df_priced
+# the pandas path builds, so export(), snapshots, history and the index all work on
+# it unchanged. A glob is read in file name order, which is the tie-break order.
+#
+# Labels are parsed by the pandas normalizers themselves: SQL pulls the distinct
+# values of each label column (or group of columns parsed together, like a plan
+# name), normalize_catalog() and each competitor's own parser run on those, and the
+# answers are joined back as lookup tables. Catalogs repeat a few hundred labels
+# millions of times, so this is cheap, and sizes, validities and prices come out
+# exactly as the pandas path has them.
+#
+#   engine = PricingEngine()
+#   SqlBackend(memory_limit='2GB', temp_dir='/scratch').run(engine, cost='costs.parquet', comp1='ck_2025/*.csv')
+#   engine.export('out/')
+#
+# Not covered (ValueError): size tolerance, validation and chunksize. Rules are: the
+# slot table is built in SQL and priced by engine.price().
+#
+# Usage:
+#   python sql_backend.py --cost cost.csv --comp1 'dumps/ck_*.csv' --memory-limit 2GB --out-dir out/
+#
+# tests/test_differential.py prices the samples and random catalogs here and in pandas
+# and compares every file they write.
+
+PARQUET_SUFFIXES = ('.parquet', '.pq')
+# Columns of the cost and default catalogs the stages use
+COST_COLUMNS = ['Network', 'ID', 'Plan Size', 'Price', 'Validity_Type']
+DEFAULT_COLUMNS = ['Network', 'Plan Size', 'Price', 'Validity_Type']
+LABEL_COLUMNS = ['Plan Size', 'Price', 'Validity_Type']
+# (label columns, normalize_catalog outputs parsed from those columns alone)
+CATALOG_LOOKUPS = [(['Plan Size'], ['Norm_Size']), (['Validity_Type'], ['Norm_Valid']), (['Price'], ['Kobo'])]
+OBSERVATION_COLUMNS = ['Norm_Size', 'Norm_Valid', 'Comp_Price']
+
+
+def q(name):
+    # Quoted SQL identifier
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def sql_string(text):
+    return "'" + str(text).replace("'", "''") + "'"
+
+
+def _matches(left, right, columns):
+    # Join condition where missing labels match each other, like a pandas merge on NaN
+    return ' AND '.join(f"{left}.{q(col)} IS NOT DISTINCT FROM {right}.{q(col)}" for col in columns)
+
+
+def _label(col):
+    # A label column cast to its ENUM (see label_types)
+    return f"{q(col)}::{q('enum ' + col)} AS {q(col)}"
+
+
+def _categorical(series):
+    # A fetched label column as an (unordered) category, like read_csv's
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.as_unordered()
+    return series.astype('category')
+
+
+def _joins(alias, lookups):
+    # JOINs of a raw table to its lookup tables, as l0, l1, ...
+    return ' '.join(f"JOIN {table} l{k} ON {_matches(alias, f'l{k}', columns)}"
+                    for k, (table, columns, _) in enumerate(lookups))
+
+
+def _looked_up(lookups, rename=None):
+    # Select list of the looked up outputs
+    rename = rename or {}
+    return ', '.join(f"l{k}.{q(out)} AS {q(rename.get(out, out))}"
+                     for k, (_, _, outputs) in enumerate(lookups) for out in outputs)
+
+
+def parser_lookups(source, columns):
+    # How a competitor parser's outputs split over its columns: the built-in ones read
+    # the price from price_col alone and size / validity from the rest. Any other
+    # parser gets every column at once.
+    price_col = (getattr(source.normalize, 'keywords', None) or {}).get('price_col')
+    labels = [col for col in columns if col not in ('Network', price_col)]
+    if price_col in columns and labels:
+        return [(labels, ['Norm_Size', 'Norm_Valid']), ([price_col], ['Comp_Price'])]
+    return [(columns, OBSERVATION_COLUMNS)]
+
+
+def parser_columns(source):
+    # Catalog columns a competitor parser reads (the *_col arguments of the built-in ones),
+    # None when it doesn't say
+    keywords = getattr(source.normalize, 'keywords', None) or {}
+    columns = [value for key, value in keywords.items() if key.endswith('_col')]
+    return columns or None
+
+
+class SqlBackend:
+    def __init__(self, memory_limit=None, threads=None, temp_dir=None):
+        if duckdb is None:
+            raise ImportError("the SQL backend needs duckdb (pip install duckdb)")
+        # DuckDB settings: memory cap before spilling (e.g. '2GB'), worker threads (default:
+        # every core), and where the database file and spill files go (default: system temp)
+        self.memory_limit = memory_limit
+        self.threads = threads
+        self.temp_dir = temp_dir
+
+    def connect(self, work_dir):
+        config = {'threads': self.threads or os.cpu_count(), 'temp_directory': os.path.join(work_dir, 'spill'),
+                  'preserve_insertion_order': True}
+        if self.memory_limit:
+            config['memory_limit'] = self.memory_limit
+        return duckdb.connect(os.path.join(work_dir, 'reprice.duckdb'), config=config)
+
+    # -- INPUTS --
+    def scan(self, source, default_csv, work_dir, name):
+        # SQL table function reading an input: CSV / Parquet paths and globs are read where
+        # they are, anything else (raw CSV, a buffer, a DataFrame, None) is written out first
+        if isinstance(source, (str, os.PathLike)) and '\n' not in str(source):
+            path = os.fspath(source)
+        else:
+            if source is None:
+                text = default_csv.strip()
+            elif isinstance(source, pd.DataFrame):
+                text = source.to_csv(index=False)
+            elif isinstance(source, str):
+                text = source.strip()
+            else:
+                text = source.read()
+                text = text.decode('utf-8') if isinstance(text, bytes) else text
+            path = os.path.join(work_dir, f"{name}.csv")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        if path.lower().endswith(PARQUET_SUFFIXES):
+            return f"read_parquet({sql_string(path)})"
+        # Everything as text with read_csv's missing-value markers, like read_source() sees it
+        nulls = ', '.join(sql_string(value) for value in sorted(NA_VALUES))
+        return (f"read_csv({sql_string(path)}, header=true, all_varchar=true, delim=',', quote='\"', "
+                f"escape='\"', nullstr=[{nulls}], null_padding=true)")
+
+    def load_table(self, con, table, scans, columns):
+        # One table per catalog; `scans` are appended in order (a 'part' column numbers
+        # them) and rowid keeps the order rows were read in, the pandas tie-break
+        selected = ', '.join(f"CAST({q(col)} AS VARCHAR) AS {q(col)}" for col in columns)
+        con.execute(f"CREATE TABLE {table} (part INTEGER, " +
+                    ', '.join(f"{q(col)} VARCHAR" for col in columns) + ")")
+        for part, scan in enumerate(scans):
+            con.execute(f"INSERT INTO {table} SELECT {part}, {selected} FROM {scan}")
+
+    def lookups(self, con, name, tables, normalize, frame_columns, groups):
+        # For each (label columns, outputs) group: run the pandas normalizer over the distinct
+        # values of those columns in `tables` (the other columns of the frame it gets are
+        # missing) and store the outputs it gives as lookup table <name>_<k>
+        made = []
+        for k, (columns, outputs) in enumerate(groups):
+            listed = ', '.join(q(col) for col in columns)
+            labels = con.execute(' UNION '.join(f"SELECT DISTINCT {listed} FROM {table}" for table in tables)).df()
+            labels = pd.DataFrame({col: labels[col].astype(object).where(labels[col].notna(), None)
+                                   if col in labels else None for col in frame_columns}, index=labels.index)
+            normalized = normalize(labels.astype({col: LABEL_DTYPES.get(col, object) for col in frame_columns}))
+            # A parser may drop rows it can't read; those labels then match nothing
+            found = labels.loc[normalized.index, columns]
+            found = found.assign(**{out: normalized[out].array for out in outputs})
+            con.register('_labels', found)
+            con.execute(f"CREATE TABLE {name}_{k} AS SELECT * FROM _labels")
+            con.unregister('_labels')
+            made.append((f"{name}_{k}", columns, outputs))
+        return made
+
+    # -- STAGES --
+    def run(self, engine, cost=None, default=None, comp1=None, comp2=None, competitors=None, suppliers=None):
+        """Fill `engine` (a PricingEngine) from the inputs the way engine.run() would.
+        Returns the priced frame."""
+        if engine.size_tolerance or engine.anomaly_z is not None or engine.chunksize:
+            raise ValueError("the SQL backend matches exact sizes only, without validation or chunksize")
+        inputs = competitor_inputs(engine.competitors, comp1, comp2, competitors)
+        suppliers = dict(suppliers or {})
+        if cost is not None or not suppliers:
+            suppliers = {DEFAULT_SUPPLIER: cost, **suppliers}
+
+        with engine.report.stage('sql') as record, \
+                tempfile.TemporaryDirectory(prefix='reprice-', dir=self.temp_dir) as work_dir:
+            con = self.connect(work_dir)
+            try:
+                self.load_table(con, 'cost', [self.scan(source, raw_cost_data, work_dir, f"cost_{i}")
+                                              for i, source in enumerate(suppliers.values())], COST_COLUMNS)
+                self.load_table(con, 'def', [self.scan(default, raw_default_data, work_dir, 'default')],
+                                DEFAULT_COLUMNS)
+                record['rows_in'] = con.execute("SELECT (SELECT count(*) FROM cost) + (SELECT count(*) FROM def)"
+                                                ).fetchone()[0]
+                labels = self.lookups(con, 'catalog_labels', ['cost', 'def'],
+                                      lambda df: normalize_catalog(df, 'Kobo'), LABEL_COLUMNS, CATALOG_LOOKUPS)
+                comps = self.load_competitors(con, engine, inputs, work_dir)
+                # Row order is in rowid now and every later stage sorts explicitly, so let
+                # DuckDB stream and spill without keeping it
+                con.execute("SET preserve_insertion_order = false")
+                self.rank_offers(con, labels)
+                self.label_types(con)
+                ids = self.id_kinds(con, len(suppliers))
+                engine.df_failover = self.failover(con, list(suppliers), ids)
+                df = self.price(con, engine, labels, comps, list(suppliers), ids)
+            finally:
+                con.close()
+            record['rows_out'] = len(df)
+
+        engine.df_cost = engine.df_def = None
+        engine.df_comps = {}
+        price_columns = ['Final Selling Price', 'Status', 'Lowest Competitor']
+        engine.df_master = df.drop(columns=price_columns)
+        if engine.rules:
+            # Per-slot policies are compiled from the slot labels in pandas (see PRICING RULES)
+            return engine.price()
+        engine.df_priced = df
+        engine._record_outcomes()
+        return df
+
+    def load_competitors(self, con, engine, inputs, work_dir):
+        # One observations query per competitor with input (or raw_data), in engine.competitors order
+        queries = []
+        for i, (name, source) in enumerate(engine.competitors.items()):
+            if inputs.get(name) is None and source.raw_data is None:
+                continue
+            scan = self.scan(inputs.get(name), source.raw_data, work_dir, f"comp_{i}")
+            columns = parser_columns(source)
+            if columns is None:
+                columns = [col for col in con.execute(f"SELECT * FROM {scan} LIMIT 0").df().columns if col != 'Network']
+            columns = ['Network'] + [col for col in columns if col != 'Network']
+            self.load_table(con, f"comp_{i}", [scan], columns)
+            labels = self.lookups(con, f"comp_labels_{i}", [f"comp_{i}"], source.normalize, columns,
+                                  parser_lookups(source, columns))
+            queries.append(f"SELECT {i} AS competitor, {_looked_up(labels)}, c.\"Network\" "
+                           f"FROM comp_{i} c {_joins('c', labels)}")
+        if not queries:
+            queries = ["SELECT NULL::INTEGER, NULL::FLOAT, NULL::SMALLINT, NULL::BIGINT, NULL::VARCHAR WHERE false"]
+        con.execute(f"CREATE TABLE observations AS {' UNION ALL '.join(queries)}")
+        return [(i, source.column) for i, source in enumerate(engine.competitors.values())]
+
+    def rank_offers(self, con, labels):
+        # Each supplier's cheapest plan per slot (first listed on a tie), then the
+        # suppliers ranked per slot by cost and listing order: rank 0 is the plan we buy
+        con.execute(f"""
+            CREATE TABLE offers AS
+            WITH rows AS (
+                SELECT c.rowid AS row_no, c.part AS supplier, c."Network", c."ID", c."Plan Size", c."Price",
+                       c."Validity_Type", {_looked_up(labels, {'Kobo': 'Clean_Price'})}
+                FROM cost c {_joins('c', labels)}
+                WHERE c."Network" IS NOT NULL
+            ),
+            best AS (
+                SELECT * FROM rows
+                QUALIFY row_number() OVER (PARTITION BY "Network", Norm_Size, Norm_Valid, supplier
+                                           ORDER BY Clean_Price NULLS LAST, row_no) = 1
+            )
+            SELECT *, row_number() OVER (PARTITION BY "Network", Norm_Size, Norm_Valid
+                                         ORDER BY Clean_Price NULLS LAST, supplier) - 1 AS Failover_Rank
+            FROM best
+        """)
+
+    def label_types(self, con):
+        # An ENUM per label column over the values the offers use. Selected as one, a column
+        # comes back as a categorical rather than a Python str per row.
+        # (An ENUM can't be empty; with no offers the type is plain VARCHAR.)
+        empty = con.execute("SELECT count(*) = 0 FROM offers").fetchone()[0]
+        for col in ['Network'] + LABEL_COLUMNS:
+            values = f"(SELECT DISTINCT {q(col)} FROM offers WHERE {q(col)} IS NOT NULL ORDER BY 1)"
+            con.execute(f"CREATE TYPE {q('enum ' + col)} AS {'VARCHAR' if empty else 'ENUM ' + values}")
+
+    def failover(self, con, suppliers, ids, depth=FAILOVER_DEPTH):
+        df = con.execute(f"""
+            SELECT {_label('Network')}, Norm_Size, Norm_Valid, Failover_Rank, supplier, {self.id_column(ids[0])}, Clean_Price
+            FROM offers WHERE Failover_Rank BETWEEN 1 AND {int(depth)}
+            ORDER BY "Network", Norm_Size, Norm_Valid, Failover_Rank
+        """).df()
+        return pd.DataFrame({
+            'Network': _categorical(df['Network']),
+            'Norm_Size': df['Norm_Size'].to_numpy(dtype=SIZE_DTYPE),
+            'Norm_Valid': df['Norm_Valid'].to_numpy(dtype=VALID_DTYPE),
+            'Failover_Rank': df['Failover_Rank'].to_numpy(dtype=np.int8),
+            'Supplier': pd.Categorical.from_codes(df['supplier'].to_numpy(dtype=np.int64), categories=suppliers),
+            'ID': self.plan_ids(df, *ids),
+            'Clean_Price': pd.array(df['Clean_Price'], dtype='Int64'),
+        })
+
+    def id_kinds(self, con, count):
+        # Kind of each supplier's ID column and of the stacked one, the way read_csv and
+        # concat type them (see typed_ids); an empty catalog has an object column
+        stats = con.execute(f"""
+            SELECT part, count(*) = count("ID") AND bool_and(regexp_full_match("ID", {sql_string(INT_PATTERN)})),
+                   coalesce(bool_and(regexp_full_match("ID", {sql_string(FLOAT_PATTERN)})), true)
+            FROM cost GROUP BY part
+        """).fetchall()
+        found = {part: 'int' if is_int else 'float' if is_float else 'str' for part, is_int, is_float in stats}
+        kinds = [found.get(part, 'str') for part in range(count)]
+        return id_kind(kinds), kinds
+
+    @staticmethod
+    def id_column(kind):
+        # Numeric IDs are parsed in SQL, anything else comes back as text
+        return {'int': 'CAST("ID" AS BIGINT) AS "ID"', 'float': 'CAST("ID" AS DOUBLE) AS "ID"'}.get(kind, '"ID"')
+
+    @staticmethod
+    def plan_ids(df, kind, kinds):
+        if kind != 'str':
+            return df['ID'].to_numpy(dtype=np.int64 if kind == 'int' else float)
+        # Stacked with a text catalog: each value keeps the type its own catalog gave it
+        ids = df['ID'].astype(object).where(df['ID'].notna(), None)
+        values = [np.nan if v is None else int(v) if kinds[part] == 'int' else float(v) if kinds[part] == 'float' else v
+                  for v, part in zip(ids, df['supplier'])]
+        return pd.array(values, dtype=object if len(set(kinds)) > 1 else 'str')
+
+    def price(self, con, engine, labels, comps, suppliers, ids):
+        # Merge defaults and competitors onto the cheapest plans, swap, and price in kobo
+        undercut = int(round(engine.undercut * KOBO))
+        comp_mins = ',\n'.join(f"min(Comp_Price) FILTER (WHERE competitor = {i}) AS {q(column)}"
+                               for i, column in comps)
+        comp_cols = [column for _, column in comps]
+        lowest = f"least({', '.join(q(c) for c in comp_cols)})" if comp_cols else "NULL::BIGINT"
+        any_comp = ' OR '.join(f"{q(c)} IS NOT NULL" for c in comp_cols) or 'false'
+        selected_comps = ''.join(f", k.{q(c)}" for c in comp_cols)
+        # Floor division that rounds toward -inf like NumPy (DuckDB's // truncates)
+        fallback = "(Clean_Price * 6 + 2 - ((Clean_Price * 6 + 2) % 5 + 5) % 5) // 5"
+        df = con.execute(f"""
+            WITH defaults AS (
+                SELECT d.rowid AS def_row, d."Network", {_looked_up(labels, {'Kobo': 'Def_Price'})}
+                FROM def d {_joins('d', labels)}
+                WHERE d."Network" IS NOT NULL
+            ),
+            competitors AS (
+                SELECT "Network", Norm_Size, Norm_Valid{',' if comp_mins else ''}
+                       {comp_mins}
+                FROM observations
+                WHERE "Network" IS NOT NULL AND Comp_Price IS NOT NULL
+                GROUP BY "Network", Norm_Size, Norm_Valid
+            ),
+            merged AS (
+                SELECT o.*, d.def_row,
+                       -- Apply the swap logic: the lower price is always the cost
+                       CASE WHEN o.Clean_Price > d.Def_Price THEN d.Def_Price ELSE o.Clean_Price END AS Low,
+                       CASE WHEN o.Clean_Price > d.Def_Price THEN o.Clean_Price ELSE d.Def_Price END AS High
+                       {selected_comps}
+                FROM offers o
+                LEFT JOIN defaults d
+                  ON d."Network" = o."Network" AND d.Norm_Size = o.Norm_Size AND d.Norm_Valid = o.Norm_Valid
+                LEFT JOIN competitors k
+                  ON k."Network" = o."Network" AND k.Norm_Size = o.Norm_Size AND k.Norm_Valid = o.Norm_Valid
+                WHERE o.Failover_Rank = 0
+            ),
+            kernel AS (
+                SELECT * EXCLUDE (Clean_Price), Low AS Clean_Price, High AS Def_Price, {lowest} AS Lowest
+                FROM merged
+            ),
+            undercut AS (
+                SELECT *,
+                       CASE WHEN Lowest IS NOT NULL THEN Lowest - {undercut}
+                            WHEN Def_Price IS NOT NULL THEN Def_Price
+                            ELSE {fallback} END AS Base
+                FROM kernel
+            ),
+            protected AS (
+                SELECT *, CASE WHEN Clean_Price IS NOT NULL AND Base < Clean_Price THEN Clean_Price ELSE Base END AS Final
+                FROM undercut
+            )
+            SELECT {', '.join(_label(col) for col in ['Network', 'Plan Size', 'Price', 'Validity_Type'])},
+                   Norm_Size, Norm_Valid, {self.id_column(ids[0])}, Clean_Price,
+                   supplier, Def_Price{''.join(f', {q(c)}' for c in comp_cols)},
+                   CASE WHEN {any_comp} THEN 0.0 END AS Match_Distance,
+                   Final, CASE WHEN Final IS NULL THEN 2 WHEN Lowest IS NOT NULL AND Final > Lowest THEN 1 ELSE 0 END AS Status,
+                   Lowest
+            FROM protected
+            ORDER BY "Network", Norm_Size, Norm_Valid, def_row NULLS LAST
+        """).df()
+
+        # Back to the dtypes the pandas path uses (see COMPACT DTYPES)
+        out = pd.DataFrame({
+            'Network': _categorical(df['Network']),
+            'Norm_Size': df['Norm_Size'].to_numpy(dtype=SIZE_DTYPE),
+            'Norm_Valid': df['Norm_Valid'].to_numpy(dtype=VALID_DTYPE),
+            'ID': self.plan_ids(df, *ids),
+        })
+        for col in ['Plan Size', 'Price', 'Validity_Type']:
+            out[col] = _categorical(df[col])
+        out['Supplier'] = pd.Categorical.from_codes(df['supplier'].to_numpy(dtype=np.int64), categories=suppliers)
+        out['Clean_Price'] = pd.array(df['Clean_Price'], dtype='Int64')
+        out['Def_Price'] = pd.array(df['Def_Price'], dtype='Int64')
+        for col in comp_cols:
+            out[col] = pd.array(df[col], dtype='Int64')
+        out['Match_Distance'] = df['Match_Distance'].to_numpy(dtype=float)
+        out['Final Selling Price'] = pd.array(df['Final'], dtype='Int64')
+        out['Status'] = pd.Categorical.from_codes(df['Status'].to_numpy(dtype=np.int8), dtype=STATUS_DTYPE)
+        out['Lowest Competitor'] = pd.array(df['Lowest'], dtype='Int64')
+        return out
+
+
+# ==========================================
+# COMMAND LINE
+# ==========================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reprice data plans with the DuckDB backend.")
+    parser.add_argument('--cost', help="API provider cost CSV / Parquet / glob (default: embedded sample)")
+    parser.add_argument('--supplier', action='append', default=[], metavar='NAME=PATH',
+                        help="Cost catalog of another supplier to buy from (repeatable, cheapest per slot wins)")
+    parser.add_argument('--default', help="API provider default selling CSV / Parquet")
+    parser.add_argument('--comp1', help="Competitor 1 (ClubKonnect) CSV / Parquet / glob")
+    parser.add_argument('--comp2', help="Competitor 2 (AimToGet) CSV / Parquet / glob")
+    parser.add_argument('--competitor', action='append', default=[], metavar='NAME=PATH',
+                        help="Input for a registered competitor source (repeatable)")
+    parser.add_argument('--undercut', type=float, default=UNDERCUT_AMOUNT, help="How much to beat the competitor by (₦)")
+    parser.add_argument('--rules', help="JSON list of pricing rules (per-slot undercut and margin floor)")
+    parser.add_argument('--memory-limit', help="DuckDB memory cap before it spills to disk, e.g. 2GB")
+    parser.add_argument('--threads', type=int, help="DuckDB worker threads (default: every core)")
+    parser.add_argument('--temp-dir', help="Where the scratch database and spill files go (default: system temp)")
+    parser.add_argument('--out-dir', default=".", help="Directory to write the output files to")
+    parser.add_argument('--ndjson', action='store_true', help="Also write the payload as NDJSON")
+    parser.add_argument('--index', action='store_true', help="Also write the binary plan_id index")
+    args = parser.parse_args(argv)
+
+    options = {'memory_limit': args.memory_limit, 'threads': args.threads, 'temp_dir': args.temp_dir}
+    rules = load_rules(args.rules) if args.rules else None
+    inputs = {'cost': args.cost, 'default': args.default, 'comp1': args.comp1, 'comp2': args.comp2,
+              'competitors': dict(item.split('=', 1) for item in args.competitor),
+              'suppliers': dict(item.split('=', 1) for item in args.supplier)}
+    engine = PricingEngine(undercut=args.undercut, rules=rules)
+    SqlBackend(**options).run(engine, **inputs)
+    paths = engine.export(args.out_dir, ndjson=args.ndjson)
+    if args.index:
+        print(f"📇 Binary price index saved to: {engine.export_index(args.out_dir)}")
+    print(f"✅ Priced {len(engine.df_priced)} slots in DuckDB, {engine.report.counters.get('active')} active")
+    print(f"📄 CSV saved to: {paths['csv']}")
+    print(f"📄 General JSON saved to: {paths['json']}")
+    print(f"📄 Supabase CSV saved to: {paths['csv_db']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# Synthetic catalogs in the same formats as the embedded raw_*_data
+# ==========================================
+# cost:    Network,ID,Plan Size,Price,Validity_Type
+# default: Network,Plan Size,Price,Validity_Type
+# comp1:   Network,Plan Name,Price                  (ClubKonnect free text)
+# comp2:   Network,Plan Size,Price,Validity_Desc    (AimToGet)
+#
+# Usage: python synthetic_catalog.py --rows 1000000 --out-dir /tmp/catalog
+
+NETWORKS = ['MTN', 'GLO', 'AIRTEL', '9MOBILE']
+NAIRA_PER_GB = {'MTN': 480, 'GLO': 420, 'AIRTEL': 500, '9MOBILE': 450}
+
+# Sizes in GB, written the way suppliers write them (mixed MB / GB / TB labels)
+SIZES = [0.107, 0.225, 0.488, 0.732, 1.0, 1.024, 1.2, 1.5, 2.0, 2.5, 2.6, 2.7, 3.0, 3.072, 3.5, 5.0,
+         5.12, 6.0, 10.0, 11.0, 12.5, 14.5, 20.0, 25.0, 36.0, 75.0, 165.0, 250.0, 800.0, 1024.0]
+
+VALIDITY_TYPES = ['SME (30 DAYS)', 'CG (30 DAYS)', 'DATA SHARE (30 DAYS)', 'GIFTING (30 DAYS)', 'GIFT (7 DAYS)',
+                  'SME (7 DAYS)', 'AWOOF (1 DAY)', 'AWOOF DATA (2 DAYS)', 'GIFTING (3 DAYS)', 'Gifting (14 Days)',
+                  '30 DAYS VALIDITY', '2 DAYS VALIDITY', 'GIFTING YEARLY PLAN', 'Corporate Gifting (30 Days)']
+COMP1_TEMPLATES = ['{size} Daily Plan - 1 day (Awoof Data)', '{size} Weekly Plan - 7 days (Direct Data)',
+                   '{size} - 7 days (SME)', '{size} - 30 days (SME)', '{size}+2mins Monthly Plan - 30 days (Direct Data)',
+                   '{size} 2-Day Plan - 2 days (Awoof Data)', '{size} Daily Plan + 1.5mins. - 1 day (Awoof Data)']
+COMP2_VALIDITY = ['Monthly (CG)', 'Monthly (SME)', '7 Days (Special)', '1 Day (Smart)', 'Weekly', '2 Days',
+                  'Monthly (incl 2GB nite)', '14 Days (Gifting)']
+
+
+def size_label(gb, style):
+    if gb >= 1024 and style == 0:
+        return f"{gb / 1024:g}TB ({gb:g}GB)"
+    if gb < 1 and style != 2:
+        return f"{round(gb * 1024)} MB" if style == 0 else f"{round(gb * 1024)}MB"
+    return f"{gb:.1f} GB" if style == 0 else f"{gb:g}GB" if style == 1 else f"{gb:g} GB"
+
+
+def _labels(table, codes):
+    # Format each distinct value once, then broadcast
+    return np.asarray(table, dtype=object)[codes]
+
+
+def _price_labels(prices):
+    # "1,470" style for four digits and up, like the pasted catalogs
+    uniques, codes = np.unique(prices, return_inverse=True)
+    return _labels([f"{p:,}" for p in uniques], codes)
+
+
+def _draw(rng, rows, markup, noise):
+    network = rng.integers(0, len(NETWORKS), rows)
+    size = rng.integers(0, len(SIZES), rows)
+    rate = np.array([NAIRA_PER_GB[n] for n in NETWORKS])[network]
+    gb = np.array(SIZES)[size]
+    price = np.maximum(50, np.round(gb * rate * markup * rng.normal(1.0, noise, rows))).astype(np.int64)
+    return network, size, price
+
+
+def generate(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    networks = np.array(NETWORKS, dtype=object)
+    catalogs = {}
+
+    network, size, price = _draw(rng, rows, 1.0, 0.05)
+    # Same size written three ways ("500 MB" / "500MB" / "0.488 GB" ...), picked per row
+    size_labels = np.ravel([[size_label(gb, style) for gb in SIZES] for style in range(3)])
+    catalogs['cost'] = pd.DataFrame({
+        'Network': networks[network],
+        'ID': rng.integers(1, 10 * rows + 1000, rows),
+        'Plan Size': _labels(size_labels, rng.integers(0, 3, rows) * len(SIZES) + size),
+        'Price': _price_labels(price),
+        'Validity_Type': _labels(VALIDITY_TYPES, rng.integers(0, len(VALIDITY_TYPES), rows)),
+    })
+
+    network, size, price = _draw(rng, rows, 1.1, 0.05)
+    catalogs['default'] = pd.DataFrame({
+        'Network': networks[network],
+        'Plan Size': _labels(size_labels, rng.integers(0, 3, rows) * len(SIZES) + size),
+        'Price': _price_labels(price),
+        'Validity_Type': _labels(VALIDITY_TYPES, rng.integers(0, len(VALIDITY_TYPES), rows)),
+    })
+
+    network, size, price = _draw(rng, rows, 1.15, 0.15)
+    names = [[t.format(size=size_label(gb, 1)) for gb in SIZES] for t in COMP1_TEMPLATES]
+    template = rng.integers(0, len(COMP1_TEMPLATES), rows)
+    catalogs['comp1'] = pd.DataFrame({
+        'Network': networks[network],
+        'Plan Name': _labels(np.ravel(names), template * len(SIZES) + size),
+        'Price': _price_labels(price),
+    })
+
+    network, size, price = _draw(rng, rows, 1.15, 0.15)
+    catalogs['comp2'] = pd.DataFrame({
+        'Network': networks[network],
+        'Plan Size': _labels(size_labels, rng.integers(0, 3, rows) * len(SIZES) + size),
+        'Price': _price_labels(price),
+        'Validity_Desc': _labels(COMP2_VALIDITY, rng.integers(0, len(COMP2_VALIDITY), rows)),
+    })
+    return catalogs
+
+
+def write_catalogs(rows, out_dir, seed=0):
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {}
+    for name, df in generate(rows, seed).items():
+        paths[name] = os.path.join(out_dir, f"{name}.csv")
+        df.to_csv(paths[name], index=False)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write synthetic cost/default/competitor catalogs.")
+    parser.add_argument('--rows', type=int, default=100_000, help="Rows per catalog")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out-dir', default="synthetic")
+    args = parser.parse_args(argv)
+    for name, path in write_catalogs(args.rows, args.out_dir, args.seed).items():
+        print(f"📄 {name}: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The pricing modules are plain scripts next to this directory, not a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
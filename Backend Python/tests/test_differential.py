@@ -0,0 +1,145 @@
+import csv
+import io
+import os
+import random
+
+import pytest
+
+from phyton import PricingEngine, Rule
+from quote_engine import QuoteEngine
+from sample_catalogs import raw_cost_data
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# Differential checks: the pandas-free QuoteEngine and the DuckDB backend price the
+# same inputs as PricingEngine, and every file they write is compared byte for byte
+# (exports, NDJSON payload and the binary index). Inputs are the embedded samples,
+# a few hand-written edge cases and small random catalogs that hit ties, swaps,
+# missing fields and unparseable labels.
+
+FUZZ_RUNS = 150
+SQL_FUZZ_RUNS = 60
+
+FUZZ_NETWORKS = ['MTN', 'GLO', 'AIRTEL', '9MOBILE', 'Smile', 'mtn', 'NA', '']
+FUZZ_SIZES = ['500 MB', '1.0 GB', '1GB', '1.024 GB', '2.5GB', '1TB', '1024MB', '0 GB', '.', 'N/A', '', '7.5 GB']
+FUZZ_VALIDITY = ['SME (30 DAYS)', 'CG (30 DAYS)', 'GIFTING (7 Days)', 'Weekly', 'Monthly (CG)', '1 Day (Smart)',
+                 'AWOOF (2 DAYS)', 'Yearly', 'GIFTING (99999 DAYS)', 'null', '', 'Daily/Night']
+FUZZ_PRICES = ['350', '450', '1,200', '₦300', ' 350', '350.005', '410.5', '1e3', 'abc', '', 'NULL', '-5', 'inf']
+FUZZ_COMP1 = ['{size} - 30 days (SME)', '{size} Weekly Plan - 7 days (Direct Data)', '{size}+2mins - 1 day',
+              'Unlimited - 30 days', '{size} 2-Day Plan - 2 days (Awoof/Data)']
+
+COST_HEADER = 'Network,ID,Plan Size,Price,Validity_Type\n'
+EDGE_CASES = {
+    'samples': {},
+    # Priced N/A: no cost, but a default to sell at
+    'cost_na': {'cost': COST_HEADER + 'MTN,900,1.0 GB,N/A,SME (30 DAYS)\nMTN,415,1.0 GB,410,SME (7 DAYS)\n'},
+    # No cost, default or competitor price at all: Unpriced
+    'unpriced': {'cost': COST_HEADER + 'MTN,901,3.3 GB,N/A,SME (30 DAYS)\nMTN,415,1.0 GB,410,SME (7 DAYS)\n'},
+    'text_ids': {'cost': COST_HEADER + 'MTN,A-1,1.0 GB,410,SME (7 DAYS)\nMTN,,2.0 GB,950,SME (30 DAYS)\n'},
+    'suppliers': {'suppliers': {'Second': raw_cost_data.replace(',410,', ',400,')}},
+}
+
+
+def fuzz_inputs(seed, rows=60):
+    # Small random catalogs, PricingEngine.run() keyword arguments
+    rng = random.Random(seed)
+    pick = rng.choice
+
+    def csv_text(header, make):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(header)
+        for _ in range(rng.randint(0, rows)):
+            writer.writerow(make())
+        return buffer.getvalue()
+
+    def price():
+        return pick(FUZZ_PRICES)
+
+    ids = (lambda: pick([str(rng.randint(1, 40)), 'NA'])) if seed % 5 == 0 else (lambda: str(rng.randint(1, 40)))
+    cost = lambda: csv_text(['Network', 'ID', 'Plan Size', 'Price', 'Validity_Type'],
+                            lambda: [pick(FUZZ_NETWORKS), ids(), pick(FUZZ_SIZES), price(), pick(FUZZ_VALIDITY)])
+    inputs = {
+        'cost': cost(),
+        'default': csv_text(['Network', 'Plan Size', 'Price', 'Validity_Type'],
+                            lambda: [pick(FUZZ_NETWORKS), pick(FUZZ_SIZES), price(), pick(FUZZ_VALIDITY)]),
+        'comp1': csv_text(['Network', 'Plan Name', 'Price'],
+                          lambda: [pick(FUZZ_NETWORKS), pick(FUZZ_COMP1).format(size=pick(FUZZ_SIZES)), price()]),
+        'comp2': csv_text(['Network', 'Plan Size', 'Price', 'Validity_Desc'],
+                          lambda: [pick(FUZZ_NETWORKS), pick(FUZZ_SIZES), price(), pick(FUZZ_VALIDITY)]),
+    }
+    if seed % 3 == 0:
+        inputs['suppliers'] = {'Second': cost(), 'Third': cost()}
+    return inputs
+
+
+def written(engine, out_dir):
+    # {file name: bytes} of everything an engine exports
+    os.makedirs(out_dir)
+    engine.export(out_dir, ndjson=True)
+    engine.export_index(out_dir)
+    files = {}
+    for name in sorted(os.listdir(out_dir)):
+        with open(os.path.join(out_dir, name), 'rb') as f:
+            files[name] = f.read()
+    return files
+
+
+def assert_same_files(files, reference):
+    assert sorted(files) == sorted(reference)
+    differ = [name for name in reference if files[name] != reference[name]]
+    assert not differ, f"{differ} differ from the pandas engine's"
+
+
+def pandas_files(inputs, out_dir, **options):
+    engine = PricingEngine(**options)
+    engine.run(**inputs)
+    return written(engine, out_dir)
+
+
+def check_quote_engine(inputs, tmp_path):
+    light = QuoteEngine()
+    light.run(**inputs)
+    assert_same_files(written(light, tmp_path / 'light'), pandas_files(inputs, tmp_path / 'pandas'))
+
+
+def check_sql_backend(inputs, tmp_path, rules=None):
+    from sql_backend import SqlBackend
+    engine = PricingEngine(rules=rules)
+    SqlBackend().run(engine, **inputs)
+    assert_same_files(written(engine, tmp_path / 'sql'), pandas_files(inputs, tmp_path / 'pandas', rules=rules))
+
+
+needs_duckdb = pytest.mark.skipif(duckdb is None, reason="duckdb is not installed")
+
+
+@pytest.mark.parametrize('case', sorted(EDGE_CASES))
+def test_quote_engine_edge_cases(case, tmp_path):
+    check_quote_engine(EDGE_CASES[case], tmp_path)
+
+
+@pytest.mark.parametrize('seed', range(FUZZ_RUNS))
+def test_quote_engine_fuzz(seed, tmp_path):
+    check_quote_engine(fuzz_inputs(seed), tmp_path)
+
+
+@needs_duckdb
+@pytest.mark.parametrize('case', sorted(EDGE_CASES))
+def test_sql_backend_edge_cases(case, tmp_path):
+    check_sql_backend(EDGE_CASES[case], tmp_path)
+
+
+@needs_duckdb
+@pytest.mark.parametrize('seed', range(SQL_FUZZ_RUNS))
+def test_sql_backend_fuzz(seed, tmp_path):
+    check_sql_backend(fuzz_inputs(seed), tmp_path)
+
+
+@needs_duckdb
+def test_sql_backend_rules(tmp_path):
+    rules = [Rule('awoof', {'keywords': ['AWOOF']}, undercut_pct=0.02),
+             Rule('9mobile floor', {'network': '9MOBILE'}, min_margin_pct=0.03)]
+    check_sql_backend({}, tmp_path, rules)
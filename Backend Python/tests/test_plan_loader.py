@@ -0,0 +1,82 @@
+import sqlite3
+
+import pytest
+
+from phyton import PricingEngine
+from plan_loader import EmptyCatalogError, SQLitePlanLoader
+
+# Upserts and deletes against the SQLite stand-in, which has the same semantics as
+# the Postgres loader (one transaction per upsert, last row wins per plan_id).
+
+
+@pytest.fixture
+def payload():
+    engine = PricingEngine()
+    engine.run()
+    return engine.db_payload()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "plans.db")
+
+
+def table(path):
+    with sqlite3.connect(path) as conn:
+        return {row[0]: row[1:] for row in conn.execute("SELECT plan_id, amount, cost_price FROM data_plans")}
+
+
+def test_upsert_keeps_the_last_row_per_plan_id(payload, db_path):
+    loader = SQLitePlanLoader(db_path)
+    loader.upsert(payload)
+    last = {plan['plan_id']: plan for plan in payload}
+    assert table(db_path) == {plan_id: (plan['amount'], plan['cost_price']) for plan_id, plan in last.items()}
+
+
+def test_upsert_updates_changed_prices(payload, db_path):
+    loader = SQLitePlanLoader(db_path)
+    loader.upsert(payload)
+    changed = dict(payload[0], amount=payload[0]['amount'] + 50)
+    assert loader.upsert([changed]) == (1, 0)
+    assert table(db_path)[changed['plan_id']][0] == changed['amount']
+
+
+def test_prune_deletes_plans_that_dropped_out(payload, db_path):
+    loader = SQLitePlanLoader(db_path)
+    loader.upsert(payload)
+    dropped = payload[0]['plan_id']
+    kept = [plan for plan in payload if plan['plan_id'] != dropped]
+    _, removed = loader.upsert(kept, prune=True)
+    assert removed == 1
+    assert set(table(db_path)) == {plan['plan_id'] for plan in kept}
+
+
+def test_deactivate_deletes_only_the_given_plans(payload, db_path):
+    loader = SQLitePlanLoader(db_path)
+    loader.upsert(payload)
+    dropped = payload[0]['plan_id']
+    assert loader.upsert([], deactivate=[dropped]) == (0, 1)
+    assert set(table(db_path)) == {plan['plan_id'] for plan in payload} - {dropped}
+
+
+def test_prune_refuses_an_empty_catalog(payload, db_path):
+    loader = SQLitePlanLoader(db_path)
+    loader.upsert(payload)
+    before = table(db_path)
+    with pytest.raises(EmptyCatalogError):
+        loader.upsert(iter([]), prune=True)
+    assert table(db_path) == before
+    assert loader.upsert([], prune=True, wipe=True) == (0, len(before))
+    assert table(db_path) == {}
+
+
+def test_engine_upload_prunes_stale_rows(db_path):
+    loader = SQLitePlanLoader(db_path)
+    loader.upsert([{'network_id': 1, 'plan_id': 'stale', 'network_name': 'MTN', 'plan_type': 'ALL',
+                    'plan_name': '9.9 GBGB - OLD', 'amount': 1, 'cost_price': 1.0, 'validity': 'OLD'}])
+    engine = PricingEngine()
+    engine.run()
+    _, removed = engine.upload(f"sqlite:///{db_path}")
+    assert removed == 1
+    assert 'stale' not in table(db_path)
+    assert set(table(db_path)) == {plan['plan_id'] for plan in engine.db_payload()}